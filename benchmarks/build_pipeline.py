@@ -0,0 +1,196 @@
+"""
+Benchmark for the hot paths of the build pipeline, on a synthetic documentation project.
+
+Generates a project with `corpus.py` (see its options), then reports as JSON the best and mean
+time out of several runs of each stage: scanning the files, building the navigation, rendering
+the Markdown of all pages, passing all pages through the theme templates, building the search
+index, a full build, and a `mkdocs serve` rebuild after one page was edited.
+
+Usage: python benchmarks/build_pipeline.py [--pages N] [--repeat N] [--stage NAME] [...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import TYPE_CHECKING, Any, Callable
+
+import corpus
+
+from mkdocs import utils
+from mkdocs.commands import build
+from mkdocs.config import load_config
+from mkdocs.contrib.search.search_index import SearchIndex
+from mkdocs.structure.files import Files, get_files
+from mkdocs.structure.nav import Navigation, get_navigation
+from mkdocs.utils.cache import ContentCache
+
+if TYPE_CHECKING:
+    from mkdocs.config.defaults import MkDocsConfig
+
+
+def _load(config_file: str, site_dir: str) -> MkDocsConfig:
+    """Load the config and run the plugin events that `build` runs before reading the files."""
+    config = load_config(config_file=config_file, site_dir=site_dir)
+    config = config.plugins.on_config(config)
+    config.plugins.on_pre_build(config=config)
+    return config
+
+
+def _read_pages(config: MkDocsConfig) -> tuple[Files, Navigation]:
+    files = get_files(config)
+    nav = get_navigation(files, config)
+    for file in files.documentation_pages():
+        assert file.page is not None
+        file.page.read_source(config)
+    return files, nav
+
+
+def _render_pages(config: MkDocsConfig) -> tuple[Files, Navigation]:
+    files, nav = _read_pages(config)
+    for file in files.documentation_pages():
+        assert file.page is not None
+        file.page.render(config, files)
+    return files, nav
+
+
+def _stages(config_file: str, site_dir: str) -> dict[str, Callable[[], Callable[[], Any]]]:
+    """Return, by name, the functions that prepare a run of each stage and return it."""
+
+    def get_files_stage():
+        config = _load(config_file, site_dir)
+        return lambda: get_files(config)
+
+    def get_navigation_stage():
+        config = _load(config_file, site_dir)
+        files = get_files(config)
+        return lambda: get_navigation(files, config)
+
+    def render_stage():
+        config = _load(config_file, site_dir)
+        files, nav = _read_pages(config)
+        return lambda: [file.page.render(config, files) for file in files.documentation_pages()]
+
+    def build_page_stage():
+        config = _load(config_file, site_dir)
+        files, nav = _render_pages(config)
+        env = config.theme.get_env()
+        files.add_files_from_theme(env, config)
+        doc_files = files.documentation_pages()
+        return lambda: [
+            build._build_page(file.page, config, doc_files, nav, env, write_file=lambda *_: None)
+            for file in doc_files
+        ]
+
+    def search_index_stage():
+        config = _load(config_file, site_dir)
+        files, nav = _render_pages(config)
+
+        def run():
+            index = SearchIndex(**config.plugins['search'].config)
+            for file in files.documentation_pages():
+                index.add_entry_from_context(file.page)
+            return index.generate_search_index()
+
+        return run
+
+    def full_build_stage():
+        config = load_config(config_file=config_file, site_dir=site_dir)
+        return lambda: build.build(config)
+
+    def serve_rebuild_stage():
+        # As `mkdocs serve` does: build into memory, keep the caches, then reload the config
+        # and rebuild after a page changed.
+        site = utils.MemorySite(site_dir)
+        render_cache, build_cache = ContentCache(), ContentCache()
+
+        def rebuild():
+            config = load_config(config_file=config_file, site_dir=site_dir)
+            config.site_url = 'http://127.0.0.1:8000/'
+            build.build(
+                config,
+                serve_url=config.site_url,
+                dirty=True,
+                render_cache=render_cache,
+                build_cache=build_cache,
+            )
+
+        utils.write_to_memory(site)
+        try:
+            rebuild()
+        finally:
+            utils.write_to_memory(None)
+        page = os.path.join(os.path.dirname(config_file), 'docs', 'index.md')
+        with open(page, 'a', encoding='utf-8') as f:
+            f.write(f'\nEdited at {time.time()}.\n')
+        # Make sure the edit is newer than the outputs, even with coarse file timestamps.
+        os.utime(page, (time.time() + 1, time.time() + 1))
+
+        def run():
+            utils.write_to_memory(site)
+            try:
+                rebuild()
+            finally:
+                utils.write_to_memory(None)
+
+        return run
+
+    return {
+        'get_files': get_files_stage,
+        'get_navigation': get_navigation_stage,
+        'page_render': render_stage,
+        'build_page': build_page_stage,
+        'search_index': search_index_stage,
+        'full_build': full_build_stage,
+        'serve_rebuild': serve_rebuild_stage,
+    }
+
+
+def measure(prepare: Callable[[], Callable[[], Any]], repeat: int) -> dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        run = prepare()
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return {
+        'best_seconds': round(min(timings), 6),
+        'mean_seconds': round(sum(timings) / len(timings), 6),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    corpus.add_arguments(parser)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument(
+        '--stage',
+        action='append',
+        choices=list(_stages('', '')),
+        help="Only run this stage. Can be supplied multiple times.",
+    )
+    args = vars(parser.parse_args())
+    repeat, only = args.pop('repeat'), args.pop('stage')
+
+    with tempfile.TemporaryDirectory(prefix='mkdocs_bench_') as tdir:
+        config_file = corpus.generate_corpus(tdir, **args)
+        stages = _stages(config_file, os.path.join(tdir, 'site'))
+        results = {
+            name: measure(prepare, repeat)
+            for name, prepare in stages.items()
+            if not only or name in only
+        }
+
+    print(  # noqa: T201
+        json.dumps(
+            {'benchmark': 'build_pipeline', 'corpus': args, 'results': results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,174 @@
+"""
+Generator of synthetic documentation projects, for the benchmarks.
+
+The pages are spread over a tree of nested sections, which the `nav` of the generated
+`mkdocs.yml` mirrors. Each page has headings down to a given depth, some text, a code block,
+a table, links to other pages (some of them to anchors) and images from the assets.
+
+Usage: python benchmarks/corpus.py OUTPUT_DIR [--pages N] [--links-per-page N] [...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+
+import yaml
+
+_WORDS = (
+    'build config page site theme plugin nav markdown template render file link anchor '
+    'section heading table code image search index serve reload cache output input'
+).split()
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of `generate_corpus` to a benchmark's command line."""
+    parser.add_argument('--pages', type=int, default=500, help="Number of Markdown pages.")
+    parser.add_argument(
+        '--links-per-page', type=int, default=5, help="Links from each page to other pages."
+    )
+    parser.add_argument(
+        '--heading-depth', type=int, default=3, help="Deepest heading level in the pages (1-6)."
+    )
+    parser.add_argument('--nav-depth', type=int, default=3, help="Nesting levels of sections.")
+    parser.add_argument(
+        '--nav-branching', type=int, default=4, help="Subsections in each section."
+    )
+    parser.add_argument('--assets', type=int, default=100, help="Number of image files.")
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def generate_corpus(
+    project_dir: str,
+    *,
+    pages: int = 500,
+    links_per_page: int = 5,
+    heading_depth: int = 3,
+    nav_depth: int = 3,
+    nav_branching: int = 4,
+    assets: int = 100,
+    seed: int = 0,
+) -> str:
+    """Write a project with its `docs` into `project_dir` and return the path of its config."""
+    rng = random.Random(seed)
+    docs_dir = os.path.join(project_dir, 'docs')
+
+    # The leaf sections, as lists of directory names.
+    sections: list[list[str]] = [[]]
+    for _ in range(nav_depth):
+        sections = [[*s, f'section{i}'] for s in sections for i in range(nav_branching)]
+    src_uris = ['index.md'] + [
+        '/'.join(sections[i % len(sections)] + [f'page{i}.md']) for i in range(1, pages)
+    ]
+    headings = {src_uri: _headings(rng, heading_depth) for src_uri in src_uris}
+    asset_uris = [f'assets/img{i}.png' for i in range(assets)]
+
+    for src_uri in asset_uris:
+        noise = bytes(rng.getrandbits(8) for _ in range(256))
+        _write(docs_dir, src_uri, b'\x89PNG\r\n\x1a\n' + noise)
+    for src_uri in src_uris:
+        content = _page(rng, src_uri, headings, src_uris, asset_uris, links_per_page)
+        _write(docs_dir, src_uri, content.encode('utf-8'))
+
+    config = {
+        'site_name': 'Benchmark',
+        'nav': _nav(src_uris),
+        'plugins': ['search'],
+        'markdown_extensions': ['toc', 'tables', 'fenced_code', 'admonition'],
+    }
+    config_file = os.path.join(project_dir, 'mkdocs.yml')
+    with open(config_file, 'w', encoding='utf-8') as f:
+        yaml.safe_dump(config, f, sort_keys=False)
+    return config_file
+
+
+def _headings(rng: random.Random, depth: int) -> list[tuple[int, str]]:
+    """Return the page's (level, text) headings: a title, then two subsections per level."""
+    result = [(1, _sentence(rng, 3).title())]
+
+    def add(level: int) -> None:
+        if level > depth:
+            return
+        for _ in range(2):
+            result.append((level, _sentence(rng, 4).capitalize()))
+            add(level + 1)
+
+    add(2)
+    return result
+
+
+def _page(
+    rng: random.Random,
+    src_uri: str,
+    headings: dict[str, list[tuple[int, str]]],
+    src_uris: list[str],
+    asset_uris: list[str],
+    links: int,
+) -> str:
+    base = os.path.dirname(src_uri)
+    targets = rng.sample(src_uris, min(links, len(src_uris)))
+    lines = []
+    for i, (level, text) in enumerate(headings[src_uri]):
+        lines += ['#' * level + ' ' + text, '', _sentence(rng, 40) + '.', '']
+        if i == 1:
+            lines += ['```python', 'def example():', '    return 42', '```', '']
+            lines += ['| Name | Value |', '| ---- | ----- |']
+            lines += [f'| {rng.choice(_WORDS)} | {j} |' for j in range(5)] + ['']
+        if i == 2 and asset_uris:
+            lines += [f'![Image]({_relative(rng.choice(asset_uris), base)})', '']
+    for target in targets:
+        url = _relative(target, base)
+        if rng.random() < 0.5:
+            level, text = rng.choice(headings[target][1:] or headings[target])
+            url += '#' + '-'.join(text.lower().split())
+        lines.append(f'- See [{rng.choice(_WORDS)}]({url})')
+    return '\n'.join(lines) + '\n'
+
+
+def _nav(src_uris: list[str]) -> list:
+    """Return a nested `nav` that follows the directories of the pages."""
+    root: dict = {}
+    for src_uri in src_uris:
+        *dirs, _ = src_uri.split('/')
+        node = root
+        for name in dirs:
+            node = node.setdefault(name, {})
+        node.setdefault('', []).append(src_uri)
+
+    def convert(node: dict) -> list:
+        items: list = list(node.get('', []))
+        items += [{name.title(): convert(child)} for name, child in node.items() if name]
+        return items
+
+    return convert(root)
+
+
+def _relative(src_uri: str, base: str) -> str:
+    return os.path.relpath(src_uri, base or '.').replace(os.sep, '/')
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return ' '.join(rng.choice(_WORDS) for _ in range(words))
+
+
+def _write(docs_dir: str, src_uri: str, content: bytes) -> None:
+    path = os.path.join(docs_dir, *src_uri.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('output_dir')
+    add_arguments(parser)
+    args = vars(parser.parse_args())
+    output_dir = args.pop('output_dir')
+    config_file = generate_corpus(output_dir, **args)
+    print(json.dumps({'config_file': config_file, **args}, indent=2))  # noqa: T201
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark for scanning a large `docs_dir` with `mkdocs.structure.files.get_files`.
+
+Generates a synthetic tree of Markdown pages and assets, part of which is in directories
+excluded by `exclude_docs`, and reports the best time out of several runs as JSON.
+
+Usage: python benchmarks/get_files.py [--sections N] [--files-per-dir N] [--repeat N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.structure.files import get_files, set_exclusions
+
+
+def generate_tree(docs_dir: str, sections: int, files_per_dir: int) -> int:
+    """Create `sections` directories, each with pages, assets and an excluded `node_modules`."""
+    count = 0
+    for i in range(sections):
+        for subdir, ext in ('', '.md'), ('assets', '.png'), ('node_modules/pkg', '.js'):
+            path = os.path.join(docs_dir, f'section{i}', subdir)
+            os.makedirs(path, exist_ok=True)
+            for j in range(files_per_dir):
+                with open(os.path.join(path, f'file{j}{ext}'), 'w'):
+                    pass
+                count += 1
+    return count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sections', type=int, default=200)
+    parser.add_argument('--files-per-dir', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='mkdocs_bench_') as tdir:
+        docs_dir = os.path.join(tdir, 'docs')
+        count = generate_tree(docs_dir, args.sections, args.files_per_dir)
+
+        config = MkDocsConfig()
+        config.load_dict(
+            {
+                'site_name': 'Benchmark',
+                'docs_dir': docs_dir,
+                'site_dir': os.path.join(tdir, 'site'),
+                'exclude_docs': 'node_modules/\n*.tmp\n',
+                'plugins': [],
+            }
+        )
+        errors, warnings = config.validate()
+        assert not errors, errors
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            files = get_files(config)
+            set_exclusions(files, config)
+            timings.append(time.perf_counter() - start)
+
+    print(  # noqa: T201
+        json.dumps(
+            {
+                'benchmark': 'get_files',
+                'files': count,
+                'excluded': sum(f.inclusion.is_excluded() for f in files),
+                'best_seconds': min(timings),
+                'mean_seconds': sum(timings) / len(timings),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    main()
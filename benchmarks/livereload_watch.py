@@ -0,0 +1,98 @@
+"""
+Benchmark for the file watching of `mkdocs serve`, with native OS notifications and with polling.
+
+Generates a synthetic `docs_dir`, watches it the way `mkdocs serve` does, then reports as JSON
+the CPU time used by the watcher while nothing changes, and the latency from a file being
+written to a rebuild being requested.
+
+Usage: python benchmarks/livereload_watch.py [--sections N] [--files-per-dir N] [--idle SECONDS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from mkdocs.livereload import LiveReloadServer
+
+
+def generate_tree(docs_dir: str, sections: int, files_per_dir: int) -> int:
+    """Create `sections` directories of Markdown pages, each with a subdirectory of assets."""
+    count = 0
+    for i in range(sections):
+        for subdir, ext in ('', '.md'), ('img', '.png'):
+            path = os.path.join(docs_dir, f'section{i}', subdir)
+            os.makedirs(path, exist_ok=True)
+            for j in range(files_per_dir):
+                with open(os.path.join(path, f'file{j}{ext}'), 'w'):
+                    pass
+                count += 1
+    return count
+
+
+def measure(docs_dir: str, use_polling: bool, idle: float, changes: int) -> dict:
+    server = LiveReloadServer(
+        builder=lambda: None, host='localhost', port=0, root=docs_dir, use_polling=use_polling
+    )
+    server.watch(docs_dir)
+    server.observer.start()
+    try:
+        time.sleep(1)  # Let the initial scan settle.
+        start = time.process_time()
+        time.sleep(idle)
+        idle_cpu = (time.process_time() - start) / idle
+
+        latencies = []
+        for i in range(changes):
+            with server._rebuild_cond:
+                server._want_rebuild = False
+            start = time.perf_counter()
+            with open(os.path.join(docs_dir, f'section{i}', 'file0.md'), 'w') as f:
+                f.write(f'# Change {i}\n')
+            with server._rebuild_cond:
+                server._rebuild_cond.wait_for(lambda: server._want_rebuild, timeout=10)
+            latencies.append(time.perf_counter() - start)
+            time.sleep(0.1)
+    finally:
+        server.observer.stop()
+        server.observer.join()
+        server.server_close()
+
+    return {
+        'observer': type(server.observer).__name__,
+        'idle_cpu_fraction': round(idle_cpu, 4),
+        'median_latency_seconds': round(statistics.median(latencies), 4),
+        'max_latency_seconds': round(max(latencies), 4),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sections', type=int, default=100)
+    parser.add_argument('--files-per-dir', type=int, default=100)
+    parser.add_argument('--idle', type=float, default=5.0)
+    parser.add_argument('--changes', type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix='mkdocs_bench_') as tdir:
+        docs_dir = os.path.join(tdir, 'docs')
+        count = generate_tree(docs_dir, args.sections, args.files_per_dir)
+        results = [
+            measure(docs_dir, use_polling, args.idle, min(args.changes, args.sections))
+            for use_polling in (False, True)
+        ]
+
+    print(  # noqa: T201
+        json.dumps(
+            {'benchmark': 'livereload_watch', 'files': count, 'results': results},
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    main()
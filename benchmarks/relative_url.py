@@ -0,0 +1,127 @@
+"""
+Microbenchmark of `mkdocs.utils.get_relative_url`, with the calls that a real build makes.
+
+Builds a site, by default a synthetic project from `corpus.py` (see its options), and reports
+as JSON how often the cache of relative URLs was hit in the build and in a rebuild (as in
+`mkdocs serve`). It then replays all the calls of a build and reports the cost per call without
+the cache, starting with an empty cache, and with the cache already filled.
+
+Usage: python benchmarks/relative_url.py [--config-file PATH] [--no-directory-urls] [...]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Callable
+
+import corpus
+
+from mkdocs import utils
+from mkdocs.commands import build
+from mkdocs.config import load_config
+from mkdocs.utils import templates
+
+
+def _build(config_file: str, site_dir: str, use_directory_urls: bool | None) -> dict[str, float]:
+    """Build the site and return the use of the relative URL cache during the build."""
+    options = {} if use_directory_urls is None else {'use_directory_urls': use_directory_urls}
+    config = load_config(config_file=config_file, site_dir=site_dir, **options)
+    before = utils._join_relative_url.cache_info()
+    build.build(config)
+    after = utils._join_relative_url.cache_info()
+    hits, misses = after.hits - before.hits, after.misses - before.misses
+    return {
+        'calls': hits + misses,
+        'hit_rate': round(hits / max(hits + misses, 1), 4),
+    }
+
+
+def _record_calls(build_site: Callable[[], object]) -> list[tuple[str, str]]:
+    """Return the arguments of all the calls of `get_relative_url` while building the site."""
+    calls: list[tuple[str, str]] = []
+    original = utils.get_relative_url
+
+    def recording(url: str, other: str) -> str:
+        calls.append((url, other))
+        return original(url, other)
+
+    utils.get_relative_url = templates.get_relative_url = recording
+    try:
+        build_site()
+    finally:
+        utils.get_relative_url = templates.get_relative_url = original
+    return calls
+
+
+def _replay(calls: list[tuple[str, str]], *, cached: bool = True) -> float:
+    """Return the nanoseconds per call of `get_relative_url` with the recorded arguments."""
+    cache = utils._join_relative_url
+    if not cached:
+        utils._join_relative_url = cache.__wrapped__  # type: ignore[attr-defined]
+    try:
+        start = time.perf_counter()
+        for url, other in calls:
+            utils.get_relative_url(url, other)
+        end = time.perf_counter()
+    finally:
+        utils._join_relative_url = cache
+    return round((end - start) / max(len(calls), 1) * 1e9, 1)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        '--config-file', help="Build this existing site instead of a generated one."
+    )
+    parser.add_argument(
+        '--no-directory-urls',
+        dest='use_directory_urls',
+        action='store_false',
+        default=None,
+        help="Build with `use_directory_urls: false`.",
+    )
+    corpus.add_arguments(parser)
+    args = vars(parser.parse_args())
+    config_file, use_directory_urls = args.pop('config_file'), args.pop('use_directory_urls')
+
+    with tempfile.TemporaryDirectory(prefix='mkdocs_bench_') as tdir:
+        path = config_file or corpus.generate_corpus(tdir, **args)
+        site_dir = os.path.join(tdir, 'site')
+
+        utils._join_relative_url.cache_clear()
+        first_build = _build(path, site_dir, use_directory_urls)
+        rebuild = _build(path, site_dir, use_directory_urls)
+        calls = _record_calls(lambda: _build(path, site_dir, use_directory_urls))
+
+    utils._join_relative_url.cache_clear()
+    cold = _replay(calls)
+    entries = utils._join_relative_url.cache_info().currsize
+    warm = _replay(calls)
+    uncached = _replay(calls, cached=False)
+
+    print(  # noqa: T201
+        json.dumps(
+            {
+                'benchmark': 'relative_url',
+                'config_file': config_file,
+                'corpus': None if config_file else args,
+                'use_directory_urls': use_directory_urls,
+                'results': {
+                    'build': first_build,
+                    'rebuild': rebuild,
+                    'distinct_calls': len(set(calls)),
+                    'cache_entries': entries,
+                    'ns_per_call': {'uncached': uncached, 'cold_cache': cold, 'warm_cache': warm},
+                },
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import functools
+import json
 import logging
 import os
 import shutil
@@ -36,7 +38,7 @@ def _showwarning(message, category, filename, lineno, file=None, line=None):
         stack = [frame for frame in traceback.extract_stack() if frame.line][-4:-2]
         # Make sure the actual affected file's name is still present (the case of syntax warning):
         if not any(frame.filename == filename for frame in stack):
-            stack = stack[-1:] + [traceback.FrameSummary(filename, lineno, '')]
+            stack = [*stack[-1:], traceback.FrameSummary(filename, lineno, '')]
 
         tb = ''.join(traceback.format_list(stack))
     except Exception:
@@ -111,6 +113,10 @@ clean_help = "Remove old files from the site_dir before building (the default)."
 config_help = (
     "Provide a specific MkDocs config. This can be a file name, or '-' to read from stdin."
 )
+config_files_help = (
+    config_help + " Can be supplied multiple times, to build several sites concurrently, "
+    "reusing the pages already converted from Markdown with the same settings."
+)
 dev_addr_help = "IP address and port to serve documentation locally (default: localhost:8000)"
 serve_open_help = "Open the website in a Web browser after the initial build finishes."
 strict_help = "Enable strict mode. This will cause MkDocs to abort the build on any warnings."
@@ -144,7 +150,37 @@ watch_theme_help = (
     "Include the theme in list of files to watch for live reloading. "
     "Ignored when live reload is not used."
 )
+watch_polling_help = (
+    "Detect changes by polling the watched files instead of relying on notifications from the OS, "
+    "which some network and container file systems don't deliver."
+)
 shell_help = "Use the shell when invoking Git."
+sync_help = (
+    "Keep the existing site_dir, only rewrite the files whose content changed, "
+    "and remove the files that are no longer part of the site."
+)
+render_cache_help = (
+    "Reuse the HTML converted from Markdown by previous builds, "
+    "stored in '.cache/mkdocs/' next to the config file."
+)
+jobs_help = (
+    "Number of worker processes to read and render Markdown pages with. "
+    "0 means one per CPU. (default: 1)"
+)
+daemon_help = (
+    "Have the `mkdocs daemon` listening on this Unix socket perform the build, "
+    "instead of a new process."
+)
+profile_help = (
+    "Report the time spent in each phase of the build, in each plugin event of each plugin, "
+    "and on the slowest pages."
+)
+profile_json_help = "Also write the profile (see --profile) to this file, as JSON."
+profile_trace_help = (
+    "Also write each run of the build phases and of the plugin events to this file, "
+    "in the Chrome trace format (for chrome://tracing or ui.perfetto.dev)."
+)
+daemon_socket_help = "The Unix socket to listen on for build requests."
 watch_help = "A directory or file to watch for live reloading. Can be supplied multiple times."
 projects_file_help = (
     "URL or local path of the registry file that declares all known MkDocs-related projects."
@@ -216,8 +252,7 @@ def color_option(f):
 
 
 common_options = add_options(quiet_option, verbose_option)
-common_config_options = add_options(
-    click.option('-f', '--config-file', type=click.File('rb'), help=config_help),
+config_overrides_options = add_options(
     # Don't override config value if user did not specify --strict flag
     # Conveniently, load_config drops None values
     click.option('-s', '--strict/--no-strict', is_flag=True, default=None, help=strict_help),
@@ -231,6 +266,25 @@ common_config_options = add_options(
         help=use_directory_urls_help,
     ),
 )
+common_config_options = add_options(
+    click.option('-f', '--config-file', type=click.File('rb'), help=config_help),
+    config_overrides_options,
+)
+profile_options = add_options(
+    click.option('--profile', is_flag=True, envvar='MKDOCS_PROFILE', help=profile_help),
+    click.option(
+        '--profile-json',
+        type=click.Path(dir_okay=False, writable=True),
+        envvar='MKDOCS_PROFILE_JSON',
+        help=profile_json_help,
+    ),
+    click.option(
+        '--profile-trace',
+        type=click.Path(dir_okay=False, writable=True),
+        envvar='MKDOCS_PROFILE_TRACE',
+        help=profile_trace_help,
+    ),
+)
 
 PYTHON_VERSION = f"{sys.version_info.major}.{sys.version_info.minor}"
 
@@ -250,6 +304,26 @@ def cli():
     """MkDocs - Project documentation with Markdown."""
 
 
+def _make_profile(profile, profile_json, profile_trace):
+    from mkdocs.utils import profiling
+
+    if profile or profile_json or profile_trace:
+        return profiling.BuildProfile(trace=bool(profile_trace))
+    return None
+
+
+def _report_profile(build_profile, profile_json, profile_trace):
+    from mkdocs.utils import profiling
+
+    profiling.log.info(f"Build profile:\n{build_profile.format_table()}")
+    if profile_json:
+        with open(profile_json, 'w', encoding='utf-8') as f:
+            json.dump(build_profile.to_dict(), f, indent=2)
+    if profile_trace:
+        with open(profile_trace, 'w', encoding='utf-8') as f:
+            json.dump(build_profile.to_chrome_trace(), f)
+
+
 @cli.command(name="serve")
 @click.option('-a', '--dev-addr', help=dev_addr_help, metavar='<IP:PORT>')
 @click.option('-o', '--open', 'open_in_browser', help=serve_open_help, is_flag=True)
@@ -259,35 +333,171 @@ def cli():
 @click.option('--dirty', 'build_type', flag_value='dirty', help=serve_dirty_help)
 @click.option('-c', '--clean', 'build_type', flag_value='clean', help=serve_clean_help)
 @click.option('--watch-theme', help=watch_theme_help, is_flag=True)
+@click.option('--watch-polling', help=watch_polling_help, is_flag=True)
 @click.option(
     '-w', '--watch', help=watch_help, type=click.Path(exists=True), multiple=True, default=[]
 )
+@profile_options
 @common_config_options
 @common_options
-def serve_command(**kwargs):
+def serve_command(profile, profile_json, profile_trace, **kwargs):
     """Run the builtin development server."""
     from mkdocs.commands import serve
+    from mkdocs.utils import profiling
 
     _enable_warnings()
-    serve.serve(**kwargs)
+    # The profile covers all the builds, and is reported when the server stops.
+    build_profile = _make_profile(profile, profile_json, profile_trace)
+    with profiling.recording(build_profile):
+        serve.serve(**kwargs)
+    if build_profile is not None:
+        _report_profile(build_profile, profile_json, profile_trace)
+
+
+def jobs_option(f):
+    def callback(ctx, param, value):
+        return value or os.cpu_count() or 1
+
+    return click.option(
+        '-j',
+        '--jobs',
+        type=click.IntRange(min=0),
+        default=1,
+        help=jobs_help,
+        callback=callback,
+    )(f)
 
 
 @cli.command(name="build")
 @click.option('-c', '--clean/--dirty', is_flag=True, default=True, help=clean_help)
-@common_config_options
+@jobs_option
+@click.option('--render-cache', is_flag=True, help=render_cache_help)
+@click.option('--sync', is_flag=True, help=sync_help)
+@click.option('--daemon', 'daemon_socket', type=click.Path(dir_okay=False), help=daemon_help)
+@profile_options
+@click.option(
+    '-f',
+    '--config-file',
+    'config_files',
+    type=click.File('rb'),
+    multiple=True,
+    help=config_files_help,
+)
+@config_overrides_options
 @click.option('-d', '--site-dir', type=click.Path(), help=site_dir_help)
 @common_options
-def build_command(clean, **kwargs):
+def build_command(
+    clean,
+    jobs,
+    render_cache,
+    sync,
+    daemon_socket,
+    profile,
+    profile_json,
+    profile_trace,
+    config_files,
+    **kwargs,
+):
     """Build the MkDocs documentation."""
     from mkdocs.commands import build
+    from mkdocs.utils import profiling
+    from mkdocs.utils.cache import ContentCache
+
+    if sync and not clean:
+        raise click.UsageError("--sync can't be combined with --dirty.")
+    build_profile = _make_profile(profile, profile_json, profile_trace)
+    if daemon_socket:
+        if build_profile is not None:
+            raise click.UsageError("Profiling isn't supported with --daemon.")
+        from mkdocs.commands import daemon
+
+        for config_file in config_files or [None]:
+            daemon.build_via_daemon(
+                daemon_socket,
+                config_file=config_file,
+                clean=clean,
+                jobs=jobs,
+                render_cache=render_cache,
+                sync=sync,
+                **kwargs,
+            )
+        return
 
     _enable_warnings()
-    cfg = config.load_config(**kwargs)
-    cfg.plugins.on_startup(command='build', dirty=not clean)
-    try:
-        build.build(cfg, dirty=not clean)
-    finally:
-        cfg.plugins.on_shutdown()
+
+    def load_configs():
+        with profiling.phase('config'):
+            return [
+                config.load_config(config_file=config_file, **kwargs)
+                for config_file in config_files or [None]
+            ]
+
+    def build_in_turn(configs, site_jobs: int) -> None:
+        # The sites share the pages that they render identically.
+        cache = ContentCache() if len(configs) > 1 else None
+        if render_cache:
+            cache = build.get_render_cache(configs[0])
+        for i, cfg in enumerate(configs):
+            if i:
+                build.forget_logged_messages()
+            cfg.plugins.on_startup(command='build', dirty=not clean)
+            try:
+                build.build(cfg, dirty=not clean, jobs=site_jobs, render_cache=cache, sync=sync)
+            finally:
+                cfg.plugins.on_shutdown()
+
+    if len(config_files) > 1 and build_profile is None:
+        # The sites that convert Markdown the same way are built in turn in one process, which
+        # renders each page once for all of them. These groups are built concurrently, sharing
+        # the CPUs that `--jobs` allows between them.
+        groups = _group_by_markdown_config(load_configs())
+        processes = min(len(groups), jobs if jobs > 1 else os.cpu_count() or 1)
+        build.build_sites(
+            [
+                functools.partial(build_in_turn, group, max(1, jobs // processes))
+                for group in groups
+            ],
+            processes=processes,
+        )
+        return
+
+    # Profiles cover a single process, so the sites are built in turn.
+    with profiling.recording(build_profile):
+        build_in_turn(load_configs(), jobs)
+
+    if build_profile is not None:
+        _report_profile(build_profile, profile_json, profile_trace)
+
+
+def _group_by_markdown_config(configs):
+    """Group the configs whose sites convert the same Markdown files the same way."""
+    from mkdocs.utils.cache import hash_key
+
+    groups = {}
+    for cfg in configs:
+        try:
+            key = hash_key(cfg.docs_dir, cfg['markdown_extensions'], cfg['mdx_configs'])
+        except TypeError:  # The config can't be compared to the others.
+            key = id(cfg)
+        groups.setdefault(key, []).append(cfg)
+    return list(groups.values())
+
+
+@cli.command(name="daemon")
+@click.option(
+    '--socket',
+    'socket_path',
+    type=click.Path(dir_okay=False),
+    required=True,
+    help=daemon_socket_help,
+)
+@common_options
+def daemon_command(socket_path):
+    """Run a build process that stays warm between `mkdocs build --daemon` requests."""
+    from mkdocs.commands import daemon
+
+    _enable_warnings()
+    daemon.daemon(socket_path)
 
 
 @cli.command(name="gh-deploy")
@@ -299,20 +509,42 @@ def build_command(clean, **kwargs):
 @click.option('--no-history', is_flag=True, help=no_history_help)
 @click.option('--ignore-version', is_flag=True, help=ignore_version_help)
 @click.option('--shell', is_flag=True, help=shell_help)
+@jobs_option
+@click.option('--render-cache', is_flag=True, help=render_cache_help)
+@click.option('--sync', is_flag=True, help=sync_help)
 @common_config_options
 @click.option('-d', '--site-dir', type=click.Path(), help=site_dir_help)
 @common_options
 def gh_deploy_command(
-    clean, message, remote_branch, remote_name, force, no_history, ignore_version, shell, **kwargs
+    clean,
+    message,
+    remote_branch,
+    remote_name,
+    force,
+    no_history,
+    ignore_version,
+    shell,
+    jobs,
+    render_cache,
+    sync,
+    **kwargs,
 ):
     """Deploy your documentation to GitHub Pages."""
     from mkdocs.commands import build, gh_deploy
 
+    if sync and not clean:
+        raise click.UsageError("--sync can't be combined with --dirty.")
     _enable_warnings()
     cfg = config.load_config(remote_branch=remote_branch, remote_name=remote_name, **kwargs)
     cfg.plugins.on_startup(command='gh-deploy', dirty=not clean)
     try:
-        build.build(cfg, dirty=not clean)
+        build.build(
+            cfg,
+            dirty=not clean,
+            jobs=jobs,
+            render_cache=build.get_render_cache(cfg) if render_cache else None,
+            sync=sync,
+        )
     finally:
         cfg.plugins.on_shutdown()
     gh_deploy.gh_deploy(
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import contextlib
+import datetime
+import functools
 import gzip
+import io
 import logging
+import multiprocessing
 import os
 import time
-from typing import TYPE_CHECKING, Sequence
+import types
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping, Sequence, TypeVar, cast
 from urllib.parse import urljoin, urlsplit
 
 import jinja2
@@ -17,12 +25,15 @@ from mkdocs.structure.files import File, Files, InclusionLevel, get_files, set_e
 from mkdocs.structure.nav import Navigation, get_navigation
 from mkdocs.structure.pages import Page
 from mkdocs.utils import DuplicateFilter  # noqa: F401 - legacy re-export
-from mkdocs.utils import templates
+from mkdocs.utils import profiling, templates
+from mkdocs.utils.cache import ContentCache, hash_key
 
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
 
 
+T = TypeVar('T')
+
 log = logging.getLogger(__name__)
 _get_context_called: bool = False
 
@@ -36,13 +47,22 @@ def get_context(
 ) -> templates.TemplateContext:
     """Return the template context for a given page or template."""
     global _get_context_called
-    if page is not None:
-        base_url = utils.get_relative_url('.', page.url)
+    # The navigation is created anew for each build, so what it keeps lasts for one build.
+    shared = nav._shared_context if isinstance(nav, Navigation) else None
+    if shared is None or shared.config is not config:
+        shared = templates.SharedContext(config)
+        if isinstance(nav, Navigation):
+            nav._shared_context = shared
 
-    extra_javascript = [
-        utils.normalize_url(str(script), page, base_url) for script in config.extra_javascript
-    ]
-    extra_css = [utils.normalize_url(path, page, base_url) for path in config.extra_css]
+    if page is not None:
+        base_url, extra_javascript, extra_css = shared.page_urls(page)
+        # Copies, as plugins may change them in the context of one page.
+        extra_javascript, extra_css = list(extra_javascript), list(extra_css)
+    else:
+        extra_javascript = [
+            utils.normalize_url(str(script), page, base_url) for script in config.extra_javascript
+        ]
+        extra_css = [utils.normalize_url(path, page, base_url) for path in config.extra_css]
 
     if isinstance(files, Files):
         files = files.documentation_pages()
@@ -56,9 +76,10 @@ def get_context(
         extra_css=extra_css,
         extra_javascript=extra_javascript,
         mkdocs_version=mkdocs.__version__,
-        build_date_utc=utils.get_build_datetime(),
+        build_date_utc=shared.build_date_utc,
         config=config,
         page=page,
+        nav_cache=shared.nav_cache,
     )
 
 
@@ -113,14 +134,15 @@ def _build_theme_template(
         if template_name == 'sitemap.xml':
             log.debug(f"Gzipping template: {template_name}")
             gz_filename = f'{output_path}.gz'
-            with open(gz_filename, 'wb') as f:
-                timestamp = utils.get_build_timestamp(
-                    pages=[f.page for f in files.documentation_pages() if f.page is not None]
-                )
-                with gzip.GzipFile(
-                    fileobj=f, filename=gz_filename, mode='wb', mtime=timestamp
-                ) as gz_buf:
-                    gz_buf.write(output.encode('utf-8'))
+            f = io.BytesIO()
+            timestamp = utils.get_build_timestamp(
+                pages=[f.page for f in files.documentation_pages() if f.page is not None]
+            )
+            with gzip.GzipFile(
+                fileobj=f, filename=gz_filename, mode='wb', mtime=timestamp
+            ) as gz_buf:
+                gz_buf.write(output.encode('utf-8'))
+            utils.write_file(f.getvalue(), gz_filename)
     else:
         log.info(f"Template skipped: '{template_name}' generated empty output.")
 
@@ -148,7 +170,14 @@ def _build_extra_template(template_name: str, files: Files, config: MkDocsConfig
         log.info(f"Template skipped: '{template_name}' generated empty output.")
 
 
-def _populate_page(page: Page, config: MkDocsConfig, files: Files, dirty: bool = False) -> None:
+def _populate_page(
+    page: Page,
+    config: MkDocsConfig,
+    files: Files,
+    dirty: bool = False,
+    *,
+    render_cache: ContentCache | None = None,
+) -> None:
     """Read page content from docs_dir and render Markdown."""
     config._current_page = page
     try:
@@ -168,7 +197,11 @@ def _populate_page(page: Page, config: MkDocsConfig, files: Files, dirty: bool =
             page.markdown, page=page, config=config, files=files
         )
 
-        page.render(config, files)
+        # Keep compatibility with `Page` subclasses whose `render` doesn't accept `cache`.
+        if render_cache is None:
+            page.render(config, files)
+        else:
+            page.render(config, files, cache=render_cache)
         assert page.content is not None
 
         # Run `page_content` plugin events.
@@ -186,6 +219,135 @@ def _populate_page(page: Page, config: MkDocsConfig, files: Files, dirty: bool =
         config._current_page = None
 
 
+# The events that `_populate_page` runs. They run in worker processes when `jobs` is used.
+_POPULATE_EVENTS = ('pre_page', 'page_read_source', 'page_markdown', 'page_content')
+# The events that `_build_page` runs. They run in worker processes when `jobs` is used.
+_BUILD_PAGE_EVENTS = ('page_context', 'post_page')
+
+# The state that forked worker processes inherit from the main process, as `_worker.state`.
+_worker = types.SimpleNamespace(state=None)
+
+
+def _init_worker() -> None:
+    # Messages are only collected in the worker and get logged by the main process.
+    logger = logging.getLogger('mkdocs')
+    for handler in logger.handlers[:]:
+        logger.removeHandler(handler)
+    logger.propagate = False
+
+
+def _run_in_worker(
+    func: Callable[..., T], *args
+) -> tuple[T | None, list, BaseException | None, float, profiling.BuildProfile | None]:
+    """
+    Call the function in a worker process, collecting its result, logged messages and error,
+    the time it took and, if a profile is being recorded, the profile of the plugin events.
+    """
+    logger = logging.getLogger('mkdocs')
+    handler = utils.CaptureHandler()
+    logger.addHandler(handler)
+    result = error = None
+    start = time.perf_counter()
+    try:
+        with profiling.recording_in_worker() as profile:
+            result = func(*args)
+    except Exception as e:
+        error = e
+    finally:
+        logger.removeHandler(handler)
+    return result, handler.records, error, time.perf_counter() - start, profile
+
+
+def _get_worker_context(jobs: int, config: MkDocsConfig, events: Sequence[str], stage: str):
+    """Return a multiprocessing context that shares the built state with workers, if possible."""
+    if jobs <= 1:
+        return None
+    if not config.plugins._parallel_safe(*events):
+        log.info(f"Some plugins aren't declared as `parallel_safe`, {stage} serially.")
+        return None
+    try:
+        return multiprocessing.get_context('fork')
+    except ValueError:
+        log.info(f"Parallel builds are not supported on this platform, {stage} serially.")
+        return None
+
+
+def _map_in_workers(
+    func: Callable[[str], T], src_uris: Sequence[str], state: tuple, jobs: int, mp_context
+) -> Iterator[T]:
+    """
+    Map the function over `src_uris` in forked worker processes which inherit `state`.
+
+    Results are yielded in order, as soon as they are available, and the messages that were
+    logged by each call are re-emitted before its result. Errors are re-raised in this process.
+    """
+    _worker.state = state
+    try:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=jobs, mp_context=mp_context, initializer=_init_worker
+        ) as executor:
+            chunksize = max(1, len(src_uris) // (jobs * 4))
+            results = executor.map(
+                functools.partial(_run_in_worker, func), src_uris, chunksize=chunksize
+            )
+            for src_uri, (result, records, error, wall, profile) in zip(src_uris, results):
+                utils.CaptureHandler.replay(records)
+                profiling.merge(profile)
+                if error is not None:
+                    raise error
+                profiling.add_page_time(src_uri, wall)
+                # Without an error, `result` is what `func` returned, even if that's None.
+                yield cast('T', result)
+    finally:
+        _worker.state = None
+
+
+def _populate_page_in_worker(src_uri: str) -> tuple[dict, dict] | None:
+    """Populate one page in a worker process and return its state and new render cache entries."""
+    assert _worker.state is not None
+    config, files, dirty, render_cache = _worker.state
+    page = files.src_uris[src_uri].page
+    assert page is not None
+    if dirty and not page.file.is_modified():
+        return None
+    _populate_page(page, config, files, dirty, render_cache=render_cache)
+    new_entries = render_cache.take_new_entries() if render_cache is not None else {}
+    return page._get_render_state(), new_entries
+
+
+def _populate_pages(
+    pages: Sequence[Page],
+    config: MkDocsConfig,
+    files: Files,
+    dirty: bool = False,
+    *,
+    jobs: int = 1,
+    render_cache: ContentCache | None = None,
+) -> None:
+    """Populate all the pages, distributing them across `jobs` worker processes if possible."""
+    jobs = min(jobs, len(pages))
+    mp_context = _get_worker_context(jobs, config, _POPULATE_EVENTS, "reading the pages")
+    if mp_context is None:
+        for page in pages:
+            log.debug(f"Reading: {page.file.src_uri}")
+            start = time.perf_counter()
+            _populate_page(page, config, files, dirty, render_cache=render_cache)
+            profiling.add_page_time(page.file.src_uri, time.perf_counter() - start)
+        return
+
+    src_uris = [page.file.src_uri for page in pages]
+    if render_cache is not None:
+        render_cache.take_new_entries()  # So that the workers only report their own.
+    state = (config, files, dirty, render_cache)
+    results = _map_in_workers(_populate_page_in_worker, src_uris, state, jobs, mp_context)
+    for page, result in zip(pages, results):
+        if result is not None:
+            page._set_render_state(result[0], files)
+            # Keep what the workers rendered, for later builds that share the cache.
+            if render_cache is not None:
+                render_cache.add_entries(result[1])
+
+
 def _build_page(
     page: Page,
     config: MkDocsConfig,
@@ -194,8 +356,17 @@ def _build_page(
     env: jinja2.Environment,
     dirty: bool = False,
     excluded: bool = False,
+    *,
+    write_file: Callable[[bytes, str], None] | None = None,
+    manifest: _BuildManifest | None = None,
 ) -> None:
-    """Pass a Page to theme template and write output to site_dir."""
+    """
+    Pass a Page to theme template and write output to site_dir.
+
+    The output is passed to `write_file` instead of `utils.write_file`, if given.
+    With a `manifest`, the page is only rendered if its output isn't up to date. The
+    `page_context` events still run for every page, so that plugins get to see all of them.
+    """
     config._current_page = page
     try:
         # When --dirty is used, only build the page if the file has been modified since the
@@ -203,18 +374,21 @@ def _build_page(
         if dirty and not page.file.is_modified():
             return
 
-        log.debug(f"Building page {page.file.src_uri}")
-
         # Activate page. Signals to theme that this is the current page.
         page.active = True
 
         context = get_context(nav, doc_files, config, page)
+        initial_context = dict(context)
 
         # Allow 'template:' override in md source files.
         template = env.get_template(page.meta.get('template', 'main.html'))
 
         # Run `page_context` plugin events.
         context = config.plugins.on_page_context(context, page=page, config=config, nav=nav)
+        if manifest is not None and manifest.is_up_to_date(page, context, initial_context):
+            return
+
+        log.debug(f"Building page {page.file.src_uri}")
 
         if excluded:
             page.content = (
@@ -231,7 +405,7 @@ def _build_page(
 
         # Write the output file.
         if output.strip():
-            utils.write_file(
+            (write_file or utils.write_file)(
                 output.encode('utf-8', errors='xmlcharrefreplace'), page.file.abs_dest_path
             )
         else:
@@ -250,9 +424,142 @@ def _build_page(
         config._current_page = None
 
 
-def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = False) -> None:
-    """Perform a full site build."""
+def _plugins_with_worker_results(config: MkDocsConfig) -> dict[str, Any]:
+    """
+    Return the plugins that collect something in the page events that has to get back from the
+    worker processes, such as the search index entries.
+
+    Such plugins implement `_take_worker_results()`, which returns what was collected since it was
+    last called, and `_merge_worker_results(results)`, which adds that in the main process.
+    """
+    return {
+        name: plugin
+        for name, plugin in config.plugins.items()
+        if hasattr(plugin, '_take_worker_results')
+    }
+
+
+def _build_page_in_worker(
+    src_uri: str,
+) -> tuple[list[tuple[bytes, str]], dict[str, Any], str | None]:
+    """
+    Build one page in a worker process and return the outputs instead of writing them, along
+    with what the plugins collected and the page's fingerprint for the main process.
+    """
+    assert _worker.state is not None
+    global _get_context_called
+    config, files, doc_files, nav, env, dirty, manifest = _worker.state
+    file = files.src_uris[src_uri]
+    assert file.page is not None
+    outputs: list[tuple[bytes, str]] = []
+    _get_context_called = False
+    _build_page(
+        file.page,
+        config,
+        doc_files,
+        nav,
+        env,
+        dirty,
+        excluded=file.inclusion.is_excluded(),
+        write_file=lambda content, path: outputs.append((content, path)),
+        manifest=manifest,
+    )
+    assert _get_context_called, 'Context not set as expected, config may be invalid'
+    plugin_results = {
+        name: plugin._take_worker_results()
+        for name, plugin in _plugins_with_worker_results(config).items()
+    }
+    page_key = manifest.pages.get(file.dest_uri) if manifest is not None else None
+    return outputs, plugin_results, page_key
+
+
+def _build_pages(
+    doc_files: Sequence[File],
+    config: MkDocsConfig,
+    files: Files,
+    nav: Navigation,
+    env: jinja2.Environment,
+    dirty: bool = False,
+    jobs: int = 1,
+    *,
+    manifest: _BuildManifest | None = None,
+) -> None:
+    """
+    Build all the pages, distributing the rendering across `jobs` worker processes if possible.
+
+    The outputs are written by this process while the workers keep rendering further pages.
+    With a `manifest`, only the pages whose outputs aren't up to date are rendered.
+    """
     global _get_context_called
+    jobs = min(jobs, len(doc_files))
+    mp_context = _get_worker_context(jobs, config, _BUILD_PAGE_EVENTS, "building the pages")
+    if mp_context is None:
+        for file in doc_files:
+            assert file.page is not None
+            _get_context_called = False
+            start = time.perf_counter()
+            _build_page(
+                file.page,
+                config,
+                doc_files,
+                nav,
+                env,
+                dirty,
+                excluded=file.inclusion.is_excluded(),
+                manifest=manifest,
+            )
+            profiling.add_page_time(file.src_uri, time.perf_counter() - start)
+            assert _get_context_called, 'Context not set as expected, config may be invalid'
+        return
+
+    src_uris = [file.src_uri for file in doc_files]
+    state = (config, files, doc_files, nav, env, dirty, manifest)
+    plugins = _plugins_with_worker_results(config)
+    # Don't let the workers report back what they inherit from this process.
+    for plugin in plugins.values():
+        plugin._take_worker_results()
+    results = _map_in_workers(_build_page_in_worker, src_uris, state, jobs, mp_context)
+    for file, (outputs, plugin_results, page_key) in zip(doc_files, results):
+        for content, output_path in outputs:
+            utils.write_file(content, output_path)
+        for name, plugin_result in plugin_results.items():
+            plugins[name]._merge_worker_results(plugin_result)
+        if manifest is not None and page_key is not None:
+            manifest.pages[file.dest_uri] = page_key
+
+
+def build(
+    config: MkDocsConfig,
+    *,
+    serve_url: str | None = None,
+    dirty: bool = False,
+    jobs: int = 1,
+    render_cache: ContentCache | None = None,
+    build_cache: ContentCache | None = None,
+    sync: bool = False,
+) -> None:
+    """
+    Perform a full site build.
+
+    With `jobs` greater than 1, the Markdown pages are read, rendered and passed through the theme
+    templates in that many worker processes, provided that all plugins handling the respective
+    page events are declared `parallel_safe`.
+
+    If `render_cache` is given, the results of converting Markdown to HTML are looked up
+    there and stored there (see `get_render_cache`).
+
+    With `dirty`, the site directory isn't cleaned and the build is incremental: all pages are
+    still read, but only the pages whose inputs changed since the previous dirty build are
+    passed through the theme templates and written, and the outputs that the previous build
+    produced but this one doesn't are removed.
+    What each build produced is kept in `build_cache`, and unless a `render_cache` is given, the
+    persistent render cache is used, so that only the changed pages get converted again. Both
+    are by default under `.cache/mkdocs/` next to the config file.
+
+    With `sync`, the site directory isn't cleaned either. All outputs are produced, but files
+    that already have the right content are not rewritten, and at the end the files that the
+    build didn't output are removed. Only the files that actually changed get a new mtime.
+    """
     logger = logging.getLogger('mkdocs')
 
     # Add CountHandler for strict mode
@@ -263,58 +570,78 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
 
     inclusion = InclusionLevel.is_in_serve if serve_url else InclusionLevel.is_included
 
+    output_paths: set[str] | None = None
     try:
         start = time.monotonic()
-
-        # Run `config` plugin events.
-        config = config.plugins.on_config(config)
-
-        # Run `pre_build` plugin events.
-        config.plugins.on_pre_build(config=config)
-
-        if not dirty:
-            log.info("Cleaning site directory")
-            utils.clean_directory(config.site_dir)
-        else:  # pragma: no cover
-            # Warn user about problems that may occur with --dirty option
-            log.warning(
-                "A 'dirty' build is being performed, this will likely lead to inaccurate navigation and other"
-                " links within your site. This option is designed for site development purposes only."
-            )
+        start_time = time.time()
+
+        with profiling.phase('prepare'):
+            # Run `config` plugin events.
+            config = config.plugins.on_config(config)
+
+            # Run `pre_build` plugin events.
+            config.plugins.on_pre_build(config=config)
+
+            manifest = None
+            if sync and not dirty:
+                log.info("Updating the changed files in the site directory")
+                output_paths = set()
+                utils.record_output_paths(output_paths)
+            elif not dirty:
+                log.info("Cleaning site directory")
+                utils.clean_directory(config.site_dir)
+            else:
+                log.info("Performing an incremental build")
+                manifest = _BuildManifest.load(config, build_cache)
+                if render_cache is None:
+                    render_cache = get_render_cache(config)
+            # Only a site directory that wasn't cleaned can have outputs with the right content.
+            utils.skip_unchanged_copies(sync or dirty)
 
         if not serve_url:  # pragma: no cover
             log.info(f"Building documentation to directory: {config.site_dir}")
-            if dirty and site_directory_contains_stale_files(config.site_dir):
+            if (
+                manifest is not None
+                and not manifest.outputs
+                and site_directory_contains_stale_files(config.site_dir)
+            ):
                 log.info("The directory contains stale files. Use --clean to remove them.")
 
         # First gather all data from all files/pages to ensure all data is consistent across all pages.
 
-        files = get_files(config)
-        env = config.theme.get_env()
-        files.add_files_from_theme(env, config)
+        with profiling.phase('get_files'):
+            files = get_files(config)
+            env = config.theme.get_env()
+            files.add_files_from_theme(env, config)
 
         assert len(set([file.src_dir for file in files])) == 2 + len(config['plugins']), 'Count of distinct directories does not match the expected count'
 
-        # Run `files` plugin events.
-        files = config.plugins.on_files(files, config=config)
-        # If plugins have added files but haven't set their inclusion level, calculate it again.
-        set_exclusions(files, config)
+        with profiling.phase('on_files'):
+            # Run `files` plugin events.
+            files = config.plugins.on_files(files, config=config)
+            # If plugins have added files but haven't set their inclusion level, calculate it again.
+            set_exclusions(files, config)
 
-        nav = get_navigation(files, config)
+        with profiling.phase('nav'):
+            nav = get_navigation(files, config)
 
-        # Run `nav` plugin events.
-        nav = config.plugins.on_nav(nav, config=config, files=files)
+            # Run `nav` plugin events.
+            nav = config.plugins.on_nav(nav, config=config, files=files)
 
         log.debug("Reading markdown pages.")
         excluded = []
+        pages = []
         for file in files.documentation_pages(inclusion=inclusion):
-            log.debug(f"Reading: {file.src_uri}")
             if file.page is None and file.inclusion.is_not_in_nav():
                 if serve_url and file.inclusion.is_excluded():
                     excluded.append(urljoin(serve_url, file.url))
                 Page(None, file, config)
             assert file.page is not None
-            _populate_page(file.page, config, files, dirty)
+            pages.append(file.page)
+        # Even in a dirty build all pages are read, as any of them may affect the others. The
+        # unchanged ones are not converted again, as their HTML comes from the render cache.
+        with profiling.phase('read_render'):
+            _populate_pages(pages, config, files, jobs=jobs, render_cache=render_cache)
         if excluded:
             log.info(
                 "The following pages are being built only for the preview "
@@ -329,31 +656,38 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
         # with lower precedence get written first so that files with higher precedence can overwrite them.
 
         log.debug("Copying static assets.")
-        files.copy_static_files(dirty=dirty, inclusion=inclusion)
+        with profiling.phase('static_copy'):
+            files.copy_static_files(dirty=dirty, inclusion=inclusion)
 
-        for template in config.theme.static_templates:
-            _build_theme_template(template, env, files, config, nav)
+        with profiling.phase('theme_templates'):
+            for template in config.theme.static_templates:
+                _build_theme_template(template, env, files, config, nav)
 
-        for template in config.extra_templates:
-            _build_extra_template(template, files, config, nav)
+            for template in config.extra_templates:
+                _build_extra_template(template, files, config, nav)
 
         log.debug("Building markdown pages.")
-        doc_files = files.documentation_pages(inclusion=inclusion)
-        for file in doc_files:
-            assert file.page is not None
-            _get_context_called = False
-            _build_page(
-                file.page, config, doc_files, nav, env, dirty, excluded=file.inclusion.is_excluded()
-            )
-            assert _get_context_called, 'Context not set as expected, config may be invalid'
-
-        log_level = config.validation.links.anchors
-        for file in doc_files:
-            assert file.page is not None
-            file.page.validate_anchor_links(files=files, log_level=log_level)
-
-        # Run `post_build` plugin events.
-        config.plugins.on_post_build(config=config)
+        with profiling.phase('page_templates'):
+            doc_files = files.documentation_pages(inclusion=inclusion)
+            if manifest is not None:
+                manifest.update(config, files, nav, doc_files, inclusion)
+            _build_pages(doc_files, config, files, nav, env, jobs=jobs, manifest=manifest)
+
+        with profiling.phase('anchor_validation'):
+            log_level = config.validation.links.anchors
+            for file in doc_files:
+                assert file.page is not None
+                file.page.validate_anchor_links(files=files, log_level=log_level)
+
+        with profiling.phase('post_build'):
+            # Run `post_build` plugin events.
+            config.plugins.on_post_build(config=config)
+
+            if manifest is not None:
+                manifest.save()
+            if output_paths is not None:
+                utils.record_output_paths(None)
+                utils.remove_stale_files(config.site_dir, keep=output_paths, before=start_time)
 
         if counts := warning_counter.get_counts():
             msg = ', '.join(f'{v} {k.lower()}s' for k, v in counts)
@@ -362,9 +696,9 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
         log.info(f'Documentation built in {time.monotonic() - start:.2f} seconds')
 
         assert all(file.inclusion != InclusionLevel.UNDEFINED for file in files), 'File used in build with UNDEFINED inclusion'
-        assert all([compfile for compfile in files.documentation_pages()].count(file) == 1 for file in files.documentation_pages()), 'Duplicate file found'
-        assert all(os.path.exists(file.abs_dest_path) for file in files if file.inclusion.is_included()), 'An included file was not rendered'
-        assert not any(env.get_template(template) for template in config.theme.static_templates) or os.path.exists(os.path.join(config.site_dir, '404.html')), 'Theme exists and 404 file was not copied from the theme'
+        assert len(set(files.documentation_pages())) == len(files.documentation_pages()), 'Duplicate file found'
+        assert all(utils.get_output_mtime(file.abs_dest_path) is not None for file in files if file.inclusion.is_included()), 'An included file was not rendered'
+        assert not any(env.get_template(template) for template in config.theme.static_templates) or utils.get_output_mtime(os.path.join(config.site_dir, '404.html')) is not None, 'Theme exists and 404 file was not copied from the theme'
 
     except Exception as e:
         # Run `build_error` plugin events.
@@ -376,6 +710,278 @@ def build(config: MkDocsConfig, *, serve_url: str | None = None, dirty: bool = F
 
     finally:
         logger.removeHandler(warning_counter)
+        utils.skip_unchanged_copies(False)
+        if output_paths is not None:
+            utils.record_output_paths(None)
+
+
+def forget_logged_messages() -> None:
+    """Let the next build in this process log again the messages that were deduplicated so far."""
+    for log_filter in log.filters:
+        if isinstance(log_filter, utils.DuplicateFilter):
+            log_filter.msgs.clear()
+
+
+def build_sites(builders: Sequence[Callable[[], None]], *, processes: int = 0) -> None:
+    """
+    Call each of `builders`, which build one or more sites each, concurrently in forked
+    processes, at most `processes` at a time (as many as there are CPUs by default).
+
+    The messages that each build logs are logged here, all together once it finishes, as if the
+    sites were built one after another. The first error that a build raised is re-raised after
+    all of them finish. Where forking isn't supported, the sites are built one by one.
+    """
+    try:
+        mp_context = multiprocessing.get_context('fork')
+    except ValueError:
+        log.info("Parallel builds are not supported on this platform, building the sites in turn.")
+        for i, builder in enumerate(builders):
+            if i:
+                forget_logged_messages()
+            builder()
+        return
+
+    def start(builder: Callable[[], None]):
+        receiver, sender = mp_context.Pipe(duplex=False)
+        process = mp_context.Process(target=_build_site_in_process, args=(builder, sender))
+        process.start()
+        sender.close()
+        return process, receiver
+
+    processes = max(1, processes or os.cpu_count() or 1)
+    running = collections.deque(start(builder) for builder in builders[:processes])
+    waiting = iter(builders[processes:])
+    first_error: BaseException | None = None
+    # The builds are waited for in order, so that their messages are too.
+    while running:
+        process, receiver = running.popleft()
+        try:
+            records, error = receiver.recv()
+        except EOFError:
+            records, error = [], None
+        receiver.close()
+        process.join()
+        if (builder := next(waiting, None)) is not None:
+            running.append(start(builder))
+        if error is None and process.exitcode:
+            error = BuildError(f"Building a site failed with exit code {process.exitcode}")
+        forget_logged_messages()
+        utils.CaptureHandler.replay(records)
+        if first_error is None:
+            first_error = error
+    if first_error is not None:
+        raise first_error
+
+
+def _build_site_in_process(builder: Callable[[], None], sender) -> None:
+    _init_worker()
+    _, records, error, _, _ = _run_in_worker(builder)
+    try:
+        sender.send((records, error))
+    except Exception:  # The error can't be pickled.
+        sender.send((records, BuildError(f"{type(error).__name__}: {error}")))
+    sender.close()
+
+
+def _get_cache_dir(config: MkDocsConfig, name: str) -> str:
+    config_dir = os.path.dirname(config.config_file_path or '') or os.getcwd()
+    return os.path.join(config_dir, '.cache', 'mkdocs', name)
+
+
+RENDER_CACHE_MAX_AGE = datetime.timedelta(days=30)
+"""How long the entries of the persistent render cache are kept after they were last used."""
+
+
+def get_render_cache_dir(config: MkDocsConfig) -> str:
+    """Return the directory of the persistent render cache, `.cache/mkdocs/` next to the config."""
+    return _get_cache_dir(config, 'render')
+
+
+def get_render_cache(config: MkDocsConfig) -> ContentCache:
+    """
+    Return the persistent render cache, stored under `.cache/mkdocs/` next to the config file.
+
+    The entries that no build used for `RENDER_CACHE_MAX_AGE` are removed.
+    """
+    cache = ContentCache(get_render_cache_dir(config))
+    cache.prune(RENDER_CACHE_MAX_AGE)
+    return cache
+
+
+class _BuildManifest:
+    """
+    What a dirty build produced in `site_dir`, for the next dirty build to compare against.
+
+    For each page, a fingerprint of everything that goes into its output is recorded: the
+    page's own content, metadata and URLs, what plugins added to its template context, the
+    navigation and the list of pages (which every page renders), the theme's template files,
+    hooks and the config. Fingerprints don't include the build date, so pages whose only change
+    would be the date are not rebuilt.
+
+    Values that can't be fingerprinted reliably, such as arbitrary objects, make the pages that
+    depend on them always get rebuilt.
+    """
+
+    def __init__(self, cache: ContentCache, key: str, site_dir: str) -> None:
+        self._cache = cache
+        self._key = key
+        self.site_dir = site_dir
+        self.outputs: list[str] = []
+        """The `dest_uri`s of all the outputs of the build."""
+        self.pages: dict[str, str] = {}
+        """Fingerprints of the page outputs, by `dest_uri`."""
+        self._previous_pages: dict[str, str] = {}
+        self._build_key: str | None = None
+
+    @classmethod
+    def load(cls, config: MkDocsConfig, cache: ContentCache | None = None) -> _BuildManifest:
+        if cache is None:
+            cache = ContentCache(_get_cache_dir(config, 'builds'))
+        site_dir = os.path.abspath(config.site_dir)
+        self = cls(cache, hash_key(site_dir), site_dir)
+        data = self._cache.get(self._key)
+        if isinstance(data, dict):
+            self.outputs = data.get('outputs', [])
+            self.pages = data.get('pages', {})
+        return self
+
+    def save(self) -> None:
+        self._cache.set(self._key, {'outputs': self.outputs, 'pages': self.pages})
+
+    def update(
+        self,
+        config: MkDocsConfig,
+        files: Files,
+        nav: Navigation,
+        doc_files: Sequence[File],
+        inclusion: Callable[[InclusionLevel], bool],
+    ) -> None:
+        """
+        Record the outputs of the current build, removing the ones that are now stale.
+
+        Which pages need to be rebuilt is then told by `is_up_to_date`.
+        """
+        outputs = {file.dest_uri for file in files if inclusion(file.inclusion)}
+        outputs.update(config.theme.static_templates, config.extra_templates)
+        if 'sitemap.xml' in outputs:
+            outputs.add('sitemap.xml.gz')
+        for dest_uri in set(self.outputs) - outputs:
+            path = os.path.join(self.site_dir, dest_uri)
+            if utils.remove_output(path):
+                log.debug(f"Removed stale output: {dest_uri}")
+                # Remove the directories that are left empty, up to `site_dir`.
+                parent = os.path.dirname(path)
+                while parent != self.site_dir and os.path.isdir(parent) and not os.listdir(parent):
+                    os.rmdir(parent)
+                    parent = os.path.dirname(parent)
+        self.outputs = sorted(outputs)
+
+        self._build_key = _get_build_key(config, nav, doc_files)
+        self._previous_pages, self.pages = self.pages, {}
+
+    def is_up_to_date(
+        self,
+        page: Page,
+        context: templates.TemplateContext,
+        initial_context: Mapping[str, Any],
+    ) -> bool:
+        """
+        Record the fingerprint of the page and return whether its output from the previous build
+        is still up to date.
+
+        `context` is the template context of the page after the `page_context` events, and
+        `initial_context` is what it was before them.
+        """
+        if self._build_key is None:
+            return False
+        try:
+            key = _get_page_key(page, self._build_key, context, initial_context)
+        except TypeError as e:
+            log.debug(
+                f"Rebuilding the page '{page.file.src_uri}', as it can't be fingerprinted: {e}"
+            )
+            return False
+        self.pages[page.file.dest_uri] = key
+        return (
+            self._previous_pages.get(page.file.dest_uri) == key
+            and utils.get_output_mtime(page.file.abs_dest_path) is not None
+        )
+
+
+def _get_build_key(config: MkDocsConfig, nav: Navigation, doc_files: Sequence[File]) -> str | None:
+    """
+    Return a fingerprint of the parts of the build that every page depends on, or None if some
+    value in the config can't be fingerprinted.
+    """
+    sources: list[str] = []
+    for theme_dir in config.theme.dirs:
+        for root, dirs, filenames in os.walk(theme_dir):
+            dirs.sort()
+            sources.extend(os.path.join(root, name) for name in sorted(filenames))
+    parts = {}
+    for key, value in config.items():
+        if key not in ('plugins', 'hooks', 'theme'):
+            parts[f"config '{key}'"] = value
+    for name, plugin in config.plugins.items():
+        if isinstance(plugin, types.ModuleType):  # A hook, only known by its source.
+            if plugin.__file__ is not None:
+                sources.append(plugin.__file__)
+            parts[f"hook '{name}'"] = plugin.__file__
+        else:
+            parts[f"plugin '{name}'"] = [type(plugin), dict(plugin.config)]
+    parts['theme'] = [config.theme.name, {**config.theme, 'locale': str(config.theme.locale)}]
+    for name, value in parts.items():
+        try:
+            hash_key(value)
+        except TypeError as e:
+            log.warning(
+                f"Rebuilding all pages, as the {name} can't be compared to the previous build: {e}"
+            )
+            return None
+    stats = []
+    for path in sources:
+        with contextlib.suppress(OSError):
+            st = os.stat(path)
+            stats.append((path, st.st_mtime_ns, st.st_size))
+    return hash_key(
+        mkdocs.__version__,
+        parts,
+        stats,
+        str(nav),
+        [(file.src_uri, file.url, file.page and file.page.title) for file in doc_files],
+    )
+
+
+# The entries of the template context of a page that are the same objects for every page, and are
+# covered by the build's fingerprint. The build date is left out on purpose.
+_SHARED_CONTEXT_KEYS = ('nav', 'pages', 'config', 'page', 'nav_cache', 'build_date_utc')
+
+
+def _get_page_key(
+    page: Page,
+    build_key: str,
+    context: templates.TemplateContext,
+    initial_context: Mapping[str, Any],
+) -> str:
+    """Return a fingerprint of everything that goes into the output of the page."""
+    context_items = {
+        key: value
+        for key, value in context.items()
+        if key not in _SHARED_CONTEXT_KEYS or value is not initial_context.get(key)
+    }
+    return hash_key(
+        build_key,
+        page.file.src_uri,
+        page.file.inclusion.value,
+        page.url,
+        page.title,
+        page.content,
+        str(page.toc),
+        page.meta,
+        page.edit_url,
+        page.canonical_url,
+        context_items,
+    )
 
 
 def site_directory_contains_stale_files(site_directory: str) -> bool:
@@ -0,0 +1,385 @@
+"""
+A long-lived process that performs builds on behalf of `mkdocs build --daemon`.
+
+Keeping the process alive saves importing MkDocs, its plugins and Markdown extensions for every
+build, and keeps the loaded config, the compiled theme templates and the Markdown render cache of
+each site warm.
+
+Requests are handled one at a time, as each build runs in the working directory and with the
+environment variables of its client, which are global to the process.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import copy
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import traceback
+import types
+from typing import IO, TYPE_CHECKING, Any, Iterator, Mapping, NamedTuple
+
+import click
+import yaml
+
+from mkdocs import config
+from mkdocs.commands import build
+from mkdocs.exceptions import Abort
+from mkdocs.utils.cache import ContentCache, hash_key
+
+if TYPE_CHECKING:
+    from mkdocs.config.defaults import MkDocsConfig
+
+log = logging.getLogger(__name__)
+
+MAX_KEPT_SITES = 16
+"""How many sites' configs and render caches the daemon keeps for later builds."""
+
+
+def daemon(socket_path: str) -> None:
+    """Perform the builds requested through the Unix socket at `socket_path`, until interrupted."""
+    if not hasattr(socket, 'AF_UNIX'):
+        raise Abort("The build daemon requires Unix domain sockets, which this system lacks.")
+    if os.path.exists(socket_path):
+        if _is_listening(socket_path):
+            raise Abort(f"A build daemon is already listening on '{socket_path}'.")
+        os.unlink(socket_path)  # Left over by a daemon that didn't exit cleanly.
+
+    server = _DaemonServer(socket_path)
+    log.info(f"Waiting for build requests on '{socket_path}'")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        log.info("Shutting down...")
+    finally:
+        server.server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(socket_path)
+
+
+def build_via_daemon(
+    socket_path: str,
+    *,
+    config_file: IO[bytes] | None = None,
+    clean: bool = True,
+    jobs: int = 1,
+    render_cache: bool = False,
+    sync: bool = False,
+    **config_options: Any,
+) -> None:
+    """
+    Have the daemon listening on `socket_path` perform a build, as `mkdocs build` would.
+
+    The build runs in the current directory and environment, and its log messages are emitted
+    here. An `Abort` is raised if the build fails.
+    """
+    request: dict[str, Any] = {
+        'config_file': None,
+        'config_content': None,
+        'config_options': config_options,
+        'clean': clean,
+        'jobs': jobs,
+        'render_cache': render_cache,
+        'sync': sync,
+        'log_level': logging.getLogger('mkdocs').getEffectiveLevel(),
+        'cwd': os.getcwd(),
+        'env': dict(os.environ),
+    }
+    if config_file is not None:
+        with config_file:
+            if os.path.isfile(getattr(config_file, 'name', '')):
+                request['config_file'] = os.path.abspath(config_file.name)
+            else:  # Such as stdin.
+                request['config_content'] = config_file.read().decode('utf-8')
+
+    with socket.socket(socket.AF_UNIX) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError as e:
+            raise Abort(f"Could not connect to the build daemon on '{socket_path}': {e}")
+        with sock.makefile('rwb') as f:
+            _send(f, request)
+            for line in f:
+                message = json.loads(line)
+                if 'log' in message:
+                    record = message['log']
+                    logging.getLogger(record['name']).log(record['level'], record['message'])
+                    continue
+                if message['error'] is not None:
+                    raise Abort(message['error'])
+                return
+    raise Abort("The build daemon closed the connection before the build finished.")
+
+
+def _is_listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def _send(stream: io.BufferedIOBase, message: dict[str, Any]) -> None:
+    stream.write(json.dumps(message).encode() + b'\n')
+    stream.flush()
+
+
+class _DaemonServer(socketserver.UnixStreamServer):
+    """
+    Handles the requests one at a time, which `_environment` relies on.
+
+    The socket is only accessible to the user running the daemon, as builds run arbitrary code
+    such as hooks.
+    """
+
+    def __init__(self, socket_path: str) -> None:
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, _RequestHandler)
+        finally:
+            os.umask(old_umask)
+        self.render_caches: dict[str | None, ContentCache] = {}
+        """The Markdown render caches used most recently, by directory (None for the in-memory one).
+
+        The cache keys cover the Markdown config, so the sites can share them safely."""
+        self.configs: dict[str, _KeptConfig] = {}
+        """The configs that later builds can reuse, by config file, the most recently used last."""
+
+    def run_build(self, request: dict[str, Any]) -> str | None:
+        """Perform the requested build, returning an error message if it failed."""
+        # Each build reports its warnings anew, as it would in its own process.
+        build.forget_logged_messages()
+        try:
+            cfg = self._load_config(request)
+            cfg.plugins.on_startup(command='build', dirty=not request['clean'])
+            try:
+                build.build(
+                    cfg,
+                    dirty=not request['clean'],
+                    jobs=request['jobs'],
+                    render_cache=self._get_render_cache(cfg, request['render_cache']),
+                    sync=request['sync'],
+                )
+            finally:
+                cfg.plugins.on_shutdown()
+        except click.ClickException as e:
+            return e.format_message()
+        except SystemExit as e:
+            return f"The build exited with code {e.code}"
+        except Exception:
+            return traceback.format_exc()
+        return None
+
+    def _load_config(self, request: dict[str, Any]) -> MkDocsConfig:
+        """
+        Load the config of the request, or reuse the one loaded for an earlier request, if none
+        of the files it was loaded from were modified since and the options, directory and
+        environment are the same. These files are the config file, the config files it inherits
+        from and the hooks.
+
+        A config is only kept if all its plugins declare `daemon_safe` or implement `on_startup`
+        or `on_shutdown`, as that is how plugins declare that they may be kept across builds, like
+        in `mkdocs serve`, and if all its values can be copied. Its values are restored from the copies before each
+        build, undoing what `on_config` events changed.
+        """
+        if request['config_content'] is not None:  # Such as from stdin.
+            config_file = io.BytesIO(request['config_content'].encode('utf-8'))
+            return config.load_config(config_file=config_file, **request['config_options'])
+
+        path = request['config_file'] or next(
+            (
+                os.path.abspath(name)
+                for name in ('mkdocs.yml', 'mkdocs.yaml')
+                if os.path.isfile(name)
+            ),
+            None,
+        )
+        if path is None:  # Let loading the config report the error.
+            return config.load_config(config_file=path, **request['config_options'])
+
+        cached = self.configs.pop(path, None)
+        if cached is not None:
+            if _get_config_key(cached.sources, request) == cached.key:
+                log.debug(f"Reusing the config '{path}'")
+                cached.config.update(copy.deepcopy(cached.values))
+                self.configs[path] = cached
+                return cached.config
+
+        cfg = config.load_config(config_file=path, **request['config_options'])
+        if not all(
+            getattr(plugin, 'daemon_safe', False)
+            or hasattr(plugin, 'on_startup')
+            or hasattr(plugin, 'on_shutdown')
+            for plugin in cfg.plugins.values()
+        ):
+            return cfg
+        try:
+            values = _copy_values(cfg)
+        except Exception as e:
+            log.debug(f"Not keeping the config '{path}', as its values can't be copied: {e}")
+            return cfg
+        sources = _get_config_sources(path, cfg)
+        key = _get_config_key(sources, request)
+        if key is not None:
+            self.configs[path] = _KeptConfig(sources, key, cfg, values)
+            _evict_oldest(self.configs)
+        return cfg
+
+    def _get_render_cache(self, cfg: MkDocsConfig, persistent: bool) -> ContentCache:
+        directory = build.get_render_cache_dir(cfg) if persistent else None
+        cache = self.render_caches.pop(directory, None)
+        if cache is None:
+            cache = build.get_render_cache(cfg) if persistent else ContentCache()
+        self.render_caches[directory] = cache
+        _evict_oldest(self.render_caches)
+        return cache
+
+
+class _KeptConfig(NamedTuple):
+    """A config that the daemon keeps for later builds."""
+
+    sources: list[str]
+    """The files that the config was loaded from."""
+    key: str
+    """The key of these files and of the request, see `_get_config_key`."""
+    config: MkDocsConfig
+    values: dict[str, Any]
+    """Copies of the config values, which are restored before each build."""
+
+
+def _evict_oldest(items: dict) -> None:
+    """Forget the least recently used of `items`, beyond `MAX_KEPT_SITES`."""
+    while len(items) > MAX_KEPT_SITES:
+        del items[next(iter(items))]
+
+
+def _copy_values(cfg: MkDocsConfig) -> dict[str, Any]:
+    """Return copies of the config values other than the plugins."""
+    return {
+        key: copy.deepcopy(value) for key, value in cfg.items() if key not in ('plugins', 'hooks')
+    }
+
+
+def _get_config_sources(path: str, cfg: MkDocsConfig) -> list[str]:
+    """Return the files that the config was loaded from: the config files and the hooks."""
+    sources = []
+    while path not in sources:
+        sources.append(path)
+        try:
+            with open(path, 'rb') as f:
+                # Composing doesn't need the constructors of the tags, such as `!ENV`.
+                node = yaml.compose(f, Loader=yaml.SafeLoader)
+        except (OSError, yaml.YAMLError):
+            break
+        inherit = None
+        if isinstance(node, yaml.MappingNode):
+            inherit = next(
+                (
+                    value.value
+                    for key, value in node.value
+                    if key.value == 'INHERIT' and isinstance(value, yaml.ScalarNode)
+                ),
+                None,
+            )
+        if inherit is None:
+            break
+        path = os.path.normpath(os.path.join(os.path.dirname(path), inherit))
+    for plugin in cfg.plugins.values():
+        if isinstance(plugin, types.ModuleType) and plugin.__file__ is not None:
+            sources.append(os.path.abspath(plugin.__file__))
+    return sources
+
+
+def _get_config_key(sources: list[str], request: dict[str, Any]) -> str | None:
+    """
+    Return the key of the config files and hooks as they are now and of the options, directory
+    and environment of the request, or None if there's no such key.
+    """
+    try:
+        stats = []
+        for path in sources:
+            st = os.stat(path)
+            stats.append((path, st.st_mtime_ns, st.st_size))
+        return hash_key(stats, request['config_options'], request['cwd'], request['env'])
+    except (OSError, TypeError):
+        return None
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: _DaemonServer
+
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        log.info(f"Building '{request['config_file'] or request['cwd']}'")
+
+        logger = logging.getLogger('mkdocs')
+        handler = _ClientLogHandler(self.wfile)
+        level = logger.level
+        logger.addHandler(handler)
+        logger.setLevel(request['log_level'])
+        try:
+            with _environment(request['cwd'], request['env']):
+                error = self.server.run_build(request)
+        finally:
+            logger.removeHandler(handler)
+            logger.setLevel(level)
+        try:
+            _send(self.wfile, {'error': error})
+        except OSError:
+            pass  # The client is gone.
+
+
+class _ClientLogHandler(logging.Handler):
+    """Sends the log records of the build, and only those, to the client that requested it."""
+
+    def __init__(self, stream: io.BufferedIOBase) -> None:
+        super().__init__()
+        self.stream = stream
+        self.thread = threading.get_ident()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.thread != self.thread:
+            return
+        message = {'name': record.name, 'level': record.levelno, 'message': self.format(record)}
+        try:
+            _send(self.stream, {'log': message})
+        except OSError:
+            pass  # The client is gone, but the build is left to finish.
+
+
+_environment_lock = threading.Lock()
+
+
+@contextlib.contextmanager
+def _environment(cwd: str, env: Mapping[str, str]) -> Iterator[None]:
+    """
+    Run in the working directory and with the environment variables of the client.
+
+    These are global to the process, so only one build can run in them at a time. Another
+    request that got here anyway waits for the build to finish.
+    """
+    with _environment_lock, _switched_environment(cwd, env):
+        yield
+
+
+@contextlib.contextmanager
+def _switched_environment(cwd: str, env: Mapping[str, str]) -> Iterator[None]:
+    old_cwd, old_env = os.getcwd(), dict(os.environ)
+    os.chdir(cwd)
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        yield
+    finally:
+        os.chdir(old_cwd)
+        os.environ.clear()
+        os.environ.update(old_env)
@@ -1,15 +1,18 @@
 from __future__ import annotations
 
 import logging
+import os
 import shutil
 import tempfile
 from os.path import isdir, isfile, join
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Collection
 from urllib.parse import urlsplit
 
+from mkdocs import utils
 from mkdocs.commands.build import build
 from mkdocs.config import load_config
-from mkdocs.livereload import LiveReloadServer, _serve_url
+from mkdocs.livereload import LiveReloadServer, _is_within, _serve_url
+from mkdocs.utils.cache import ContentCache
 
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
@@ -25,6 +28,7 @@ def serve(
     watch: list[str] = [],
     *,
     open_in_browser: bool = False,
+    watch_polling: bool = False,
     **kwargs,
 ) -> None:
     """
@@ -62,21 +66,71 @@ def serve(
     mount_path = urlsplit(config.site_url or '/').path
     config.site_url = serve_url = _serve_url(host, port, mount_path)
 
+    # The site is built into memory and served from there, unless a plugin might read the built
+    # files back from `site_dir` (see `BasePlugin.memory_safe`). Only files that plugins write by
+    # other means than `mkdocs.utils` end up in `site_dir` then.
+    site = utils.MemorySite(site_dir)
+    in_memory: bool | None = None
+
+    # Kept across rebuilds: the rendered Markdown of the pages and what the previous build wrote.
+    render_cache = ContentCache()
+    build_cache = ContentCache()
+
+    def select_output(config: MkDocsConfig) -> None:
+        nonlocal in_memory
+        memory_safe = config.plugins._memory_safe()
+        if memory_safe == in_memory:
+            return
+        if not memory_safe:
+            log.info("Some plugins aren't declared as `memory_safe`, building the site on disk.")
+        if in_memory is not None:
+            # Don't serve, or consider up to date, what the previous builds output elsewhere.
+            build_cache.clear()
+            site.clear()
+            utils.write_to_memory(None)
+            utils.clean_directory(site_dir)
+        in_memory = memory_safe
+        utils.write_to_memory(site if memory_safe else None)
+
     def builder(config: MkDocsConfig | None = None):
         log.info("Building documentation...")
         if config is None:
             config = get_config()
             config.site_url = serve_url
-
-        build(config, serve_url=None if is_clean else serve_url, dirty=is_dirty)
+        select_output(config)
+
+        if is_clean:
+            build(config)
+            return
+        if not _only_docs_changed(server.changed_paths, config):
+            # The config, the theme or something that plugins use changed, so don't rely on what
+            # the previous build did.
+            build_cache.clear()
+            if not is_dirty:
+                utils.clean_directory(site_dir)
+        build(
+            config,
+            serve_url=serve_url,
+            dirty=True,
+            render_cache=render_cache,
+            build_cache=build_cache,
+        )
 
     server = LiveReloadServer(
-        builder=builder, host=host, port=port, root=site_dir, mount_path=mount_path
+        builder=builder,
+        host=host,
+        port=port,
+        root=site_dir,
+        mount_path=mount_path,
+        use_polling=watch_polling,
+        site=site,
     )
 
     def error_handler(code) -> bytes | None:
         if code in (404, 500):
             error_page = join(site_dir, f'{code}.html')
+            if (content := site.read(error_page)) is not None:
+                return content
             if isfile(error_page):
                 assert isfile(error_page), f"{code}.html page was expected but not found in the site directory"
                 with open(error_page, 'rb') as f:
@@ -112,6 +166,14 @@ def serve(
         finally:
             server.shutdown()
     finally:
+        utils.write_to_memory(None)
         config.plugins.on_shutdown()
         if isdir(site_dir):
             shutil.rmtree(site_dir)
+
+
+def _only_docs_changed(changed_paths: Collection[str], config: MkDocsConfig) -> bool:
+    """Whether the rebuild was caused only by changes within `docs_dir`."""
+    return bool(changed_paths) and all(
+        _is_within(os.path.abspath(path), [config.docs_dir]) for path in changed_paths
+    )
@@ -855,7 +855,11 @@ class Theme(BaseConfigOption[theme.Theme]):
         if 'locale' in theme_config and not isinstance(theme_config['locale'], str):
             raise ValidationError("'locale' must be a string.")
 
-        return theme.Theme(**theme_config)
+        result = theme.Theme(**theme_config)
+        if self.config_file_path:
+            config_dir = os.path.dirname(self.config_file_path)
+            result._cache_dir = os.path.join(config_dir, '.cache', 'mkdocs', 'templates')
+        return result
 
 
 class Nav(OptionallyRequired):
@@ -62,6 +62,10 @@ class _PluginConfig(base.Config):
 class SearchPlugin(BasePlugin[_PluginConfig]):
     """Add a search feature to MkDocs."""
 
+    parallel_safe = True
+    memory_safe = True
+    daemon_safe = True
+
     def on_config(self, config: MkDocsConfig, **kwargs) -> MkDocsConfig:
         """Add plugin templates and scripts to config."""
         if config.theme.get('include_search_page'):
@@ -87,11 +91,23 @@ class SearchPlugin(BasePlugin[_PluginConfig]):
     def on_pre_build(self, config: MkDocsConfig, **kwargs) -> None:
         """Create search index instance for later use."""
         self.search_index = SearchIndex(**self.config)
+        self._taken_entries = 0
 
     def on_page_context(self, context: TemplateContext, page: Page, **kwargs) -> None:
         """Add page to search index."""
         self.search_index.add_entry_from_context(page)
 
+    def _take_worker_results(self) -> list[dict]:
+        """Return the index entries added since the last call, for a worker to send back."""
+        entries = self.search_index._entries[self._taken_entries :]
+        self._taken_entries = len(self.search_index._entries)
+        return entries
+
+    def _merge_worker_results(self, entries: list[dict]) -> None:
+        """Add the index entries that a worker process added for a page."""
+        self.search_index._entries.extend(entries)
+        self._taken_entries = len(self.search_index._entries)
+
     def on_post_build(self, config: MkDocsConfig, **kwargs) -> None:
         """Build search index."""
         output_base_path = os.path.join(config.site_dir, 'search')
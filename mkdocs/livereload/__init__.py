@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import email.utils
+import errno
 import functools
-import io
+import gzip
 import ipaddress
+import itertools
+import json
 import logging
 import mimetypes
 import os
@@ -10,6 +14,7 @@ import os.path
 import pathlib
 import posixpath
 import re
+import selectors
 import socket
 import socketserver
 import string
@@ -21,16 +26,37 @@ import urllib.parse
 import webbrowser
 import wsgiref.simple_server
 import wsgiref.util
-from typing import Any, BinaryIO, Callable, Iterable
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable
 
 import watchdog.events
+import watchdog.observers
+import watchdog.observers.api
 import watchdog.observers.polling
 
+from mkdocs import utils
+
+if TYPE_CHECKING:
+    from mkdocs.utils import MemorySite
+
 _SCRIPT_TEMPLATE_STR = """
-var livereload = function(epoch, requestId) {
-    var req, timeout;
+var livereload = function(epoch, requestId, page) {
+    var req, timeout, source;
+    // Only changes that affect this page make it reload.
+    var query = "?page=" + encodeURIComponent(page);
 
     var poll = function() {
+        if (window.EventSource) {
+            // The server pushes the epoch of each new version of the page.
+            if (!source) {
+                source = new EventSource("/livereload/events/" + epoch + "/" + requestId + query);
+                source.onmessage = function(event) {
+                    if (parseFloat(event.data) > epoch) {
+                        location.reload();
+                    }
+                };
+            }
+            return;
+        }
         req = new XMLHttpRequest();
         req.onloadend = function() {
             if (parseFloat(this.responseText) > epoch) {
@@ -39,18 +65,21 @@ var livereload = function(epoch, requestId) {
                 timeout = setTimeout(poll, this.status === 200 ? 0 : 3000);
             }
         };
-        req.open("GET", "/livereload/" + epoch + "/" + requestId);
+        req.open("GET", "/livereload/" + epoch + "/" + requestId + query);
         req.send();
     }
 
     var stop = function() {
+        if (source) {
+            source.close();
+        }
         if (req) {
             req.abort();
         }
         if (timeout) {
             clearTimeout(timeout);
         }
-        req = timeout = undefined;
+        req = timeout = source = undefined;
     };
 
     window.addEventListener("load", function() {
@@ -69,7 +98,7 @@ var livereload = function(epoch, requestId) {
 
     console.log('Enabled live reload');
 }
-livereload(${epoch}, ${request_id});
+livereload(${epoch}, ${request_id}, ${page});
 """
 _SCRIPT_TEMPLATE = string.Template(_SCRIPT_TEMPLATE_STR)
 
@@ -82,6 +111,42 @@ class _LoggerAdapter(logging.LoggerAdapter):
 log = _LoggerAdapter(logging.getLogger(__name__), {})
 
 
+_CHANGE_EVENT_TYPES = (
+    watchdog.events.EVENT_TYPE_CREATED,
+    watchdog.events.EVENT_TYPE_DELETED,
+    watchdog.events.EVENT_TYPE_MODIFIED,
+    watchdog.events.EVENT_TYPE_MOVED,
+)
+
+_EVENT_STREAM_HEADERS = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: text/event-stream\r\n"
+    b"Cache-Control: no-cache\r\n"
+    b"Connection: keep-alive\r\n"
+    b"\r\n"
+    b"retry: 3000\n\n"
+)
+
+# Content types that are served compressed if the browser accepts it and they aren't too small.
+_COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/xml",
+    "image/svg+xml",
+)
+_GZIP_MIN_SIZE = 1024
+# How many bytes of compressed files are kept, the least recently served ones are dropped first.
+_GZIP_CACHE_SIZE = 32 * 1024 * 1024
+
+# The files that only affect themselves when they change, not the other pages that are open:
+# pages, and data files (such as the search index or the sitemap) that scripts fetch when needed.
+_PAGE_LOCAL_SUFFIXES = (".html", ".htm", ".json", ".xml", ".xml.gz", ".txt")
+
+# Errors from native observers when the OS runs out of resources for them.
+_WATCH_LIMIT_ERRORS = (errno.ENOSPC, errno.EMFILE, errno.ENFILE, errno.ENOSYS)
+
+
 def _normalize_mount_path(mount_path: str) -> str:
     """Ensure the mount path starts and ends with a slash."""
     return ("/" + mount_path.lstrip("/")).rstrip("/") + "/"
@@ -91,6 +156,176 @@ def _serve_url(host: str, port: int, path: str) -> str:
     return f"http://{host}:{port}{_normalize_mount_path(path)}"
 
 
+def _is_within(path: str, dirs: Iterable[str]) -> bool:
+    return any(path == d or path.startswith(d.rstrip(os.sep) + os.sep) for d in dirs)
+
+
+class _Watch:
+    """A path that is being watched for changes, which get reported to `callback`."""
+
+    def __init__(
+        self,
+        path: str,
+        recursive: bool,
+        callback: Callable[[watchdog.events.FileSystemEvent], None],
+    ) -> None:
+        self.path = path
+        # A single file is watched through its directory, otherwise native observers would lose
+        # track of it as soon as an editor replaces the file rather than writing into it.
+        self.is_file = os.path.isfile(path)
+        self.watch_path = os.path.dirname(path) if self.is_file else path
+        self.recursive = recursive and not self.is_file
+        self.callback = callback
+        self.handler = watchdog.events.FileSystemEventHandler()
+        self.handler.on_any_event = self._on_event  # type: ignore[method-assign]
+        self.ref: watchdog.observers.api.ObservedWatch | None = None
+
+    def _on_event(self, event: watchdog.events.FileSystemEvent) -> None:
+        # Native observers also report files being opened and closed, such as by the build itself.
+        if event.event_type not in _CHANGE_EVENT_TYPES:
+            return
+        # A directory is "modified" whenever its entries change, which is reported on its own.
+        # Directories being moved or deleted affect all the files in them, though.
+        if event.is_directory and event.event_type == watchdog.events.EVENT_TYPE_MODIFIED:
+            return
+        if self.is_file and self.path not in (event.src_path, getattr(event, 'dest_path', None)):
+            return
+        self.callback(event)
+
+
+class _EventStream:
+    """
+    Pushes the new versions of their pages to the connected browsers.
+
+    The browsers' connections are handed over here once their request has been read, so they
+    all wait in a single thread rather than each one in a thread of the server. Whenever the
+    site changes, each browser whose page got a newer version (see `get_version`) is sent the
+    version as a server-sent event.
+    """
+
+    keepalive_interval = 30.0
+
+    def __init__(self, get_version: Callable[[str | None], int]) -> None:
+        self.get_version = get_version
+        """Returns the latest version (an epoch) of a page, given its path from the site root."""
+        self._lock = threading.Lock()  # Must be held when accessing the fields below.
+        self._new_clients: list[tuple[socket.socket, int, str | None]] = []
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        """The number of connected browsers."""
+        return len(self._clients()) if self._thread is not None else 0
+
+    def _start(self) -> None:
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._wakeup_send.setblocking(False)
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def add(self, sock: socket.socket, epoch: int, page: str | None) -> None:
+        """Start sending events to `sock`, a browser that shows `page` as of `epoch`."""
+        with self._lock:
+            if self._closed:
+                sock.close()
+                return
+            self._new_clients.append((sock, epoch, page))
+            if self._thread is None:
+                self._start()
+        self._wakeup()
+
+    def publish(self) -> None:
+        """Notify the browsers whose page has a new version."""
+        with self._lock:
+            if self._thread is None:
+                return
+        self._wakeup()
+
+    def close(self) -> None:
+        """Disconnect all browsers and stop the thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._thread is None:
+                return
+        self._wakeup()
+        self._thread.join()
+        self._selector.close()
+        self._wakeup_recv.close()
+        self._wakeup_send.close()
+
+    def _wakeup(self) -> None:
+        try:
+            self._wakeup_send.send(b"\0")
+        except OSError:
+            pass  # There is already a pending wakeup, or the stream is closed.
+
+    def _run(self) -> None:
+        while True:
+            events = self._selector.select(timeout=self.keepalive_interval)
+            with self._lock:
+                if self._closed:
+                    break
+                new_clients, self._new_clients = self._new_clients, []
+
+            for key, _ in events:
+                if key.fileobj is self._wakeup_recv:
+                    try:
+                        while self._wakeup_recv.recv(4096):
+                            pass
+                    except BlockingIOError:
+                        pass
+                else:
+                    # Browsers send nothing more, so this means that the connection was closed.
+                    self._drop(key.fileobj)  # type: ignore[arg-type]
+
+            for sock, epoch, page in new_clients:
+                sock.setblocking(False)
+                # The client's page and the version of it that the client has seen.
+                self._selector.register(sock, selectors.EVENT_READ, data=[page, epoch])
+                self._send(sock, _EVENT_STREAM_HEADERS)
+
+            for sock, client in self._clients().items():
+                page, epoch = client
+                version = self.get_version(page)
+                if version > epoch:
+                    client[1] = version
+                    self._send(sock, b"data: %d\n\n" % version)
+                elif not events:
+                    # Let the browser (and proxies) know that the connection is still alive.
+                    self._send(sock, b": keepalive\n\n")
+
+        for sock in self._clients():
+            self._drop(sock)
+
+    def _clients(self) -> dict[socket.socket, list]:
+        return {
+            key.fileobj: key.data  # type: ignore[misc]
+            for key in (self._selector.get_map() or {}).values()
+            if key.fileobj is not self._wakeup_recv
+        }
+
+    def _send(self, sock: socket.socket, data: bytes) -> None:
+        # The messages are tiny, so if one doesn't fit into the buffer, the browser is gone.
+        try:
+            if sock.send(data) == len(data):
+                return
+        except OSError:
+            pass
+        self._drop(sock)
+
+    def _drop(self, sock: socket.socket) -> None:
+        try:
+            self._selector.unregister(sock)
+        except (KeyError, ValueError):
+            pass
+        sock.close()
+
+
 class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGIServer):
     daemon_threads = True
     poll_response_timeout = 60
@@ -104,6 +339,8 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         mount_path: str = "/",
         polling_interval: float = 0.5,
         shutdown_delay: float = 0.25,
+        use_polling: bool = False,
+        site: MemorySite | None = None,
     ) -> None:
         self.builder = builder
         try:
@@ -112,6 +349,12 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         except Exception:
             pass
         self.root = os.path.abspath(root)
+        # Files found here are served from memory, the rest from `root`.
+        self.site = site
+        # The compressed files by path, the most recently served last. Guarded by _gzip_lock.
+        self._gzip_cache: dict[str, tuple[str, bytes]] = {}
+        self._gzip_cache_size = 0
+        self._gzip_lock = threading.Lock()
         self.mount_path = _normalize_mount_path(mount_path)
         self.url = _serve_url(host, port, mount_path)
         self.build_delay = 0.1
@@ -125,18 +368,39 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         self._wanted_epoch = _timestamp()  # The version of the site that started building.
         self._visible_epoch = self._wanted_epoch  # Latest fully built version of the site.
         self._epoch_cond = threading.Condition()  # Must be held when accessing _visible_epoch.
+        # The last epoch when something that may affect all pages changed, and the last epochs when
+        # individual pages changed after that. Guarded by _epoch_cond.
+        self._global_version = self._visible_epoch
+        self._page_versions: dict[str, int] = {}
+        self._event_stream = _EventStream(self._get_page_version)
 
         self._rebuilds_from_watch: int = 0
         self._want_rebuild: bool = False
+        self._changed_paths: set[str] = set()
         self._rebuilds: int = 0
         self._rebuild_cond = threading.Condition()  # Must be held when accessing _want_rebuild.
 
         self._shutdown = False
         self.serve_thread = threading.Thread(target=lambda: self.serve_forever(shutdown_delay))
-        self.observer = watchdog.observers.polling.PollingObserver(timeout=polling_interval)
+        self.polling_interval = polling_interval
+        # Native OS notifications (e.g. inotify on Linux) unless polling is requested. If those
+        # turn out to be unavailable, this gets replaced by a polling observer.
+        self.observer: watchdog.observers.api.BaseObserver
+        if use_polling:
+            self.observer = watchdog.observers.polling.PollingObserver(timeout=polling_interval)
+        else:
+            self.observer = watchdog.observers.Observer()
 
         self._watched_paths: dict[str, int] = {}
-        self._watch_refs: dict[str, Any] = {}
+        self._watches: dict[str, _Watch] = {}
+        self._symlink_watches: dict[str, _Watch] = {}  # Targets of symlinks in watched paths.
+        # The symlinks in the watched paths and in their targets, with their own targets.
+        self._symlinks: dict[str, str] = {}
+        # Where entries were added or removed since the last rebuild. Guarded by _rebuild_cond.
+        self._symlink_scans: set[str] = set()
+
+        self.changed_paths: frozenset[str] = frozenset()
+        """The paths whose changes caused the current rebuild, for the builder to consult."""
 
     def watch(self, path: str, func: None = None, *, recursive: bool = True) -> None:
         """Add the 'path' to watched paths, call the function and reload when any file changes under it."""
@@ -149,19 +413,10 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
             return
         self._watched_paths[path] = 1
 
-        def callback(event):
-            if event.is_directory:
-                return
-            log.debug(str(event))
-            with self._rebuild_cond:
-                self._want_rebuild = True
-                self._rebuilds_from_watch = self._rebuilds_from_watch + 1
-                self._rebuild_cond.notify_all()
-
-        handler = watchdog.events.FileSystemEventHandler()
-        handler.on_any_event = callback  # type: ignore[method-assign]
         log.debug(f"Watching '{path}'")
-        self._watch_refs[path] = self.observer.schedule(handler, path, recursive=recursive)
+        watch = self._watches[path] = _Watch(path, recursive, self._on_change)
+        self._schedule(watch)
+        self._refresh_symlink_watches([path])
 
     def unwatch(self, path: str) -> None:
         """Stop watching file changes for path. Raises if there was no corresponding `watch` call."""
@@ -170,14 +425,159 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         self._watched_paths[path] -= 1
         if self._watched_paths[path] <= 0:
             self._watched_paths.pop(path)
-            self.observer.unschedule(self._watch_refs.pop(path))
+            self._unschedule(self._watches.pop(path))
+            self._refresh_symlink_watches([path])
+
+    def _on_change(self, event: watchdog.events.FileSystemEvent) -> None:
+        log.debug(str(event))
+        with self._rebuild_cond:
+            self._want_rebuild = True
+            self._rebuilds_from_watch = self._rebuilds_from_watch + 1
+            self._changed_paths.add(os.fsdecode(event.src_path))
+            if getattr(event, 'dest_path', None):
+                self._changed_paths.add(os.fsdecode(event.dest_path))
+            if event.event_type != watchdog.events.EVENT_TYPE_MODIFIED:
+                self._symlink_scans.add(os.fsdecode(event.src_path))
+                if getattr(event, 'dest_path', None):
+                    self._symlink_scans.add(os.fsdecode(event.dest_path))
+            self._rebuild_cond.notify_all()
+
+    @property
+    def _polling(self) -> bool:
+        return isinstance(self.observer, watchdog.observers.polling.PollingObserver)
+
+    def _schedule(self, watch: _Watch) -> None:
+        try:
+            watch.ref = self.observer.schedule(
+                watch.handler, watch.watch_path, recursive=watch.recursive
+            )
+        except OSError as e:
+            if e.errno not in _WATCH_LIMIT_ERRORS:
+                raise
+            self._fall_back_to_polling(e)
+
+    def _unschedule(self, watch: _Watch) -> None:
+        if watch.ref is None:
+            return
+        # Several files in one directory share the watch of that directory.
+        others = itertools.chain(self._watches.values(), self._symlink_watches.values())
+        if any(other.ref == watch.ref for other in others):
+            self.observer.remove_handler_for_watch(watch.handler, watch.ref)
+        else:
+            self.observer.unschedule(watch.ref)
+        watch.ref = None
+
+    def _refresh_symlink_watches(self, paths: Iterable[str]) -> None:
+        """
+        Native observers don't follow symlinks, so also watch the places that they point to.
+
+        Only `paths` and what's under them are scanned for symlinks that were added or removed.
+        """
+        if self._polling:  # Polling follows symlinks by itself.
+            return
+        scanned: list[str] = []
+        for path in sorted(paths):
+            if _is_within(path, scanned):
+                continue
+            scanned.append(path)
+            for link in [link for link in self._symlinks if _is_within(link, [path])]:
+                del self._symlinks[link]
+            if self._is_scanned_for_symlinks(path):
+                self._scan_symlinks(path)
+
+        targets = self._get_symlink_targets()
+        for target in self._symlink_watches.keys() - targets:
+            self._unschedule(self._symlink_watches.pop(target))
+        for target in targets - self._symlink_watches.keys():
+            if not os.path.exists(target) or self._polling:
+                continue
+            watch = self._symlink_watches[target] = _Watch(target, True, self._on_change)
+            self._schedule(watch)
+
+    def _is_scanned_for_symlinks(self, path: str) -> bool:
+        """Whether `path` is in a watched path whose symlinks are followed, or in their targets."""
+        scopes = [w.path for w in self._watches.values() if w.recursive]
+        scopes.extend(self._symlinks.values())
+        return _is_within(path, scopes) or any(
+            w.is_file and w.path == path for w in self._watches.values()
+        )
+
+    def _scan_symlinks(self, path: str) -> None:
+        """Add the symlinks at and under `path` to `_symlinks`, and those in their targets."""
+        watched_dirs = {w.path for w in self._watches.values() if not w.is_file}
+        roots = [os.path.realpath(path) for path in watched_dirs]
+        known_targets = set(self._symlinks.values())
+        stack = [path]
+        while stack:
+            path = stack.pop()
+            if os.path.islink(path) and path not in watched_dirs:
+                target = self._symlinks[path] = os.path.realpath(path)
+                if os.path.isdir(target) and not _is_within(target, roots):
+                    if target not in known_targets:
+                        known_targets.add(target)
+                        stack.append(target)
+                continue
+            try:
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_symlink() or entry.is_dir():
+                            stack.append(entry.path)
+            except OSError:
+                pass
+
+    def _get_symlink_targets(self) -> set[str]:
+        """
+        Return the targets outside of the watched directories of the symlinks that are reachable
+        from the watched paths, and forget the other symlinks, such as those in targets that are
+        no longer linked to.
+        """
+        roots = [os.path.realpath(w.path) for w in self._watches.values() if not w.is_file]
+        scopes = [w.path for w in self._watches.values() if w.recursive]
+        files = {w.path for w in self._watches.values() if w.is_file}
+        links = [link for link in self._symlinks if link in files or _is_within(link, scopes)]
+        reachable = set(links)
+        targets: set[str] = set()
+        while links:
+            target = self._symlinks[links.pop()]
+            if target in targets or _is_within(target, roots):
+                continue
+            targets.add(target)
+            for link in self._symlinks:
+                if link not in reachable and _is_within(link, [target]):
+                    reachable.add(link)
+                    links.append(link)
+        self._symlinks = {link: self._symlinks[link] for link in reachable}
+        return targets
+
+    def _fall_back_to_polling(self, error: OSError, *, start: bool = False) -> None:
+        """Replace the native observer, e.g. when the OS limit of inotify watches is reached."""
+        if self._polling:
+            raise error
+        log.warning(
+            f"Native file change notifications are unavailable ({error}), falling back to polling."
+        )
+        old_observer = self.observer
+        self.observer = watchdog.observers.polling.PollingObserver(timeout=self.polling_interval)
+        self._symlink_watches.clear()
+        self._symlinks.clear()
+        for watch in self._watches.values():
+            watch.ref = None
+            self._schedule(watch)
+        if start or old_observer.is_alive():
+            old_observer.stop()
+            self.observer.start()
 
     def serve(self, *, open_in_browser=False):
         self.server_bind()
         self.server_activate()
 
         if self._watched_paths:
-            self.observer.start()
+            try:
+                self.observer.start()
+            except OSError as e:
+                if e.errno not in _WATCH_LIMIT_ERRORS:
+                    raise
+                self._fall_back_to_polling(e, start=True)
 
             paths_str = ", ".join(f"'{_try_relativize_path(path)}'" for path in self._watched_paths)
             log.info(f"Watching paths for changes: {paths_str}")
@@ -211,7 +611,15 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
                 self._wanted_epoch = _timestamp()
                 self._want_rebuild = False
                 self._rebuilds = self._rebuilds + 1
+                symlink_scans, self._symlink_scans = self._symlink_scans, set()
+                self.changed_paths = frozenset(self._changed_paths)
+                self._changed_paths.clear()
 
+            if symlink_scans:
+                self._refresh_symlink_watches(symlink_scans)
+
+            changed_outputs: set[str] = set()
+            utils.record_changed_outputs(changed_outputs)
             try:
                 self.builder()
             except Exception as e:
@@ -222,18 +630,26 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
                 log.error(
                     "An error happened during the rebuild. The server will appear stuck until build errors are resolved."
                 )
+                # The next rebuild has to take these changes into account too.
+                with self._rebuild_cond:
+                    self._changed_paths.update(self.changed_paths)
                 continue
+            finally:
+                utils.record_changed_outputs(None)
 
+            changed_files = self._get_changed_files(changed_outputs)
             with self._epoch_cond:
                 log.info("Reloading browsers")
+                self._update_page_versions(changed_files, self._wanted_epoch)
                 self._visible_epoch = self._wanted_epoch
                 self._epoch_cond.notify_all()
+            self._event_stream.publish()
 
-            assert self._want_rebuild == False, 'Want rebuild is still true after completing the build'
             assert self._rebuilds <= self._rebuilds_from_watch, 'More rebuilds than file changes'
 
     def shutdown(self, wait=False) -> None:
         self.observer.stop()
+        self._event_stream.close()
         with self._rebuild_cond:
             self._shutdown = True
             self._rebuild_cond.notify_all()
@@ -277,10 +693,11 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
         if path.startswith("/livereload/"):
             if m := re.fullmatch(r"/livereload/([0-9]+)/[0-9]+", path):
                 epoch = int(m[1])
+                page = _get_page_param(environ.get("QUERY_STRING", ""))
                 start_response("200 OK", [("Content-Type", "text/plain")])
 
                 def condition():
-                    return self._visible_epoch > epoch
+                    return self._get_page_version(page) > epoch
 
                 with self._epoch_cond:
                     if not condition():
@@ -288,7 +705,7 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
                         # If there's not, respond anyway after a minute.
                         self._log_poll_request(environ.get("HTTP_REFERER"), request_id=path)
                         self._epoch_cond.wait_for(condition, timeout=self.poll_response_timeout)
-                    return [b"%d" % self._visible_epoch]
+                    return [b"%d" % self._get_page_version(page)]
 
         if (path + "/").startswith(self.mount_path):
             rel_file_path = path[len(self.mount_path) :]
@@ -309,42 +726,150 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
             self._epoch_cond.wait_for(lambda: self._visible_epoch == self._wanted_epoch)
             epoch = self._visible_epoch
 
-        try:
-            file: BinaryIO = open(file_path, "rb")
-        except OSError:
-            if not path.endswith("/") and os.path.isfile(os.path.join(file_path, "index.html")):
-                start_response("302 Found", [("Location", urllib.parse.quote(path) + "/")])
-                return []
-            return None  # Not found
+        inject_js = bool(self._watched_paths) and file_path.endswith(".html")
+        content_type = self._guess_type(file_path)
+        file: BinaryIO | None = None
+        chunks = self.site.get_chunks(file_path) if self.site is not None else None
+        if chunks is not None:
+            assert self.site is not None
+            etag = self.site.get_hash(file_path) or ""
+            mtime = self.site.getmtime(file_path) or 0.0
+            content_length = sum(len(chunk) for chunk in chunks)
+        else:
+            try:
+                file = open(file_path, "rb")
+            except OSError:
+                index_path = os.path.join(file_path, "index.html")
+                if not path.endswith("/") and (
+                    os.path.isfile(index_path)
+                    or (self.site is not None and index_path in self.site)
+                ):
+                    start_response("302 Found", [("Location", urllib.parse.quote(path) + "/")])
+                    return []
+                return None  # Not found
+            stat = os.fstat(file.fileno())
+            etag = f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+            mtime = stat.st_mtime
+            content_length = stat.st_size
+
+        # Browsers have to check with the server every time, as the site can change at any moment.
+        headers = [("Cache-Control", "no-cache")]
+        if inject_js:
+            # The script carries the epoch, so the page stays the same only as long as the epoch.
+            etag += f"-{epoch:x}"
+        else:
+            headers.append(("Last-Modified", email.utils.formatdate(mtime, usegmt=True)))
+        use_gzip = False
+        if content_type.startswith(_COMPRESSIBLE_TYPES):
+            headers.append(("Vary", "Accept-Encoding"))
+            if content_length >= _GZIP_MIN_SIZE and _accepts_gzip(environ):
+                use_gzip = True
+                etag += "-gzip"
+        etag = f'"{etag}"'
+        headers.append(("ETag", etag))
+
+        if _is_not_modified(environ, etag, None if inject_js else mtime):
+            if file is not None:
+                file.close()
+            start_response("304 Not Modified", headers)
+            return []
 
-        if self._watched_paths and file_path.endswith(".html"):
+        if file is not None and (inject_js or use_gzip):
             with file:
                 content = file.read()
-            content = self._inject_js_into_html(content, epoch)
-            file = io.BytesIO(content)
-            content_length = len(content)
+            chunks = (content,)
+            if inject_js:
+                chunks = (self._inject_js_into_html(content, epoch, rel_file_path),)
+        elif chunks is not None and inject_js:
+            # The page is already split where the script goes, so it's served without copying.
+            chunks = (*chunks[:1], self._get_script_tag(epoch, rel_file_path), *chunks[1:])
+
+        if use_gzip:
+            assert chunks is not None
+            if inject_js:
+                chunks = (gzip.compress(b"".join(chunks), compresslevel=6),)
+            else:
+                chunks = (self._get_gzipped(file_path, etag, chunks),)
+            headers.append(("Content-Encoding", "gzip"))
+        if chunks is not None:
+            content_length = sum(len(chunk) for chunk in chunks)
+
+        headers += [("Content-Type", content_type), ("Content-Length", str(content_length))]
+        start_response("200 OK", headers)
+        if chunks is not None:
+            return chunks
+        assert file is not None
+        return wsgiref.util.FileWrapper(file)
+
+    def _get_gzipped(self, path: str, etag: str, chunks: Iterable[bytes]) -> bytes:
+        # Files that didn't change since they were last served are not compressed again.
+        with self._gzip_lock:
+            cached = self._gzip_cache.pop(path, None)
+            if cached is not None and cached[0] == etag:
+                self._gzip_cache[path] = cached
+                return cached[1]
+            if cached is not None:
+                self._gzip_cache_size -= len(cached[1])
+        content = gzip.compress(b"".join(chunks), compresslevel=6)
+        with self._gzip_lock:
+            if (cached := self._gzip_cache.pop(path, None)) is not None:
+                self._gzip_cache_size -= len(cached[1])
+            self._gzip_cache[path] = (etag, content)
+            self._gzip_cache_size += len(content)
+            while self._gzip_cache_size > _GZIP_CACHE_SIZE:
+                _, dropped = self._gzip_cache.pop(next(iter(self._gzip_cache)))
+                self._gzip_cache_size -= len(dropped)
+        return content
+
+    def _get_page_version(self, page: str | None) -> int:
+        """Return the last epoch in which `page` (a path from the site root) changed."""
+        with self._epoch_cond:
+            if page is None:  # A browser that doesn't tell its page reloads on any change.
+                return self._visible_epoch
+            return max(self._global_version, self._page_versions.get(page, 0))
+
+    def _get_changed_files(self, changed_outputs: Iterable[str]) -> set[str]:
+        """
+        Return the paths from the site's root of the files that the rebuild changed or removed,
+        given their absolute paths as recorded by `utils.record_changed_outputs`.
+
+        If the whole site was cleaned, its root is included as ".".
+        """
+        changed_files = set()
+        for path in changed_outputs:
+            if _is_within(path, [self.root]):
+                changed_files.add(os.path.relpath(path, self.root).replace(os.sep, "/"))
+        return changed_files
+
+    def _update_page_versions(self, changed_files: set[str], epoch: int) -> None:
+        if not all(
+            path.endswith(_PAGE_LOCAL_SUFFIXES) for path in changed_files
+        ):
+            self._global_version = epoch
+            self._page_versions.clear()
         else:
-            content_length = os.path.getsize(file_path)
+            for path in changed_files:
+                self._page_versions[path] = epoch
 
-        content_type = self._guess_type(file_path)
-        start_response(
-            "200 OK", [("Content-Type", content_type), ("Content-Length", str(content_length))]
-        )
-        return wsgiref.util.FileWrapper(file)
+    def _add_event_client(self, sock: socket.socket, epoch: int, referer: str | None, path: str):
+        self._log_poll_request(referer, request_id=path)
+        self._event_stream.add(sock, epoch, _get_page_param(urllib.parse.urlsplit(path).query))
 
-    def _inject_js_into_html(self, content, epoch):
+    def _inject_js_into_html(self, content, epoch, page):
         try:
             body_end = content.rindex(b"</body>")
         except ValueError:
             body_end = len(content)
+        script = self._get_script_tag(epoch, page)
+        return b"%b%b%b" % (content[:body_end], script, content[body_end:])
+
+    def _get_script_tag(self, epoch: int, page: str) -> bytes:
         # The page will reload if the livereload poller returns a newer epoch than what it knows.
         # The other timestamp becomes just a unique identifier for the initiating page.
-        script = _SCRIPT_TEMPLATE.substitute(epoch=epoch, request_id=_timestamp())
-        return b"%b<script>%b</script>%b" % (
-            content[:body_end],
-            script.encode(),
-            content[body_end:],
+        script = _SCRIPT_TEMPLATE.substitute(
+            epoch=epoch, request_id=_timestamp(), page=json.dumps(page).replace("<", "\\u003c")
         )
+        return b"<script>%b</script>" % script.encode()
 
     @classmethod
     @functools.lru_cache  # "Cache" to not repeat the same message for the same browser tab.
@@ -367,14 +892,57 @@ class LiveReloadServer(socketserver.ThreadingMixIn, wsgiref.simple_server.WSGISe
 
 
 class _Handler(wsgiref.simple_server.WSGIRequestHandler):
+    server: LiveReloadServer
+
+    def parse_request(self) -> bool:
+        if not super().parse_request():
+            return False
+        if m := re.fullmatch(r"/livereload/events/([0-9]+)/[0-9]+(\?.*)?", self.path):
+            # Hand the connection over to the event stream, this thread is done with it.
+            sock = socket.socket(fileno=self.connection.detach())
+            self.server._add_event_client(sock, int(m[1]), self.headers.get("Referer"), self.path)
+            self.close_connection = True
+            return False
+        return True
+
     def log_request(self, code="-", size="-"):
-        level = logging.DEBUG if str(code) == "200" else logging.WARNING
+        level = logging.DEBUG if str(code) in ("200", "304") else logging.WARNING
         log.log(level, f'"{self.requestline}" code {code}')
 
     def log_message(self, format, *args):
         log.debug(format, *args)
 
 
+def _accepts_gzip(environ: dict) -> bool:
+    for coding in environ.get("HTTP_ACCEPT_ENCODING", "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() in ("gzip", "*"):
+            m = re.fullmatch(r"\s*q=([0-9.]+)\s*", params)
+            try:
+                return m is None or float(m[1]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def _is_not_modified(environ: dict, etag: str, mtime: float | None) -> bool:
+    """Whether the browser's cached copy is still valid, according to its conditional headers."""
+    if (if_none_match := environ.get("HTTP_IF_NONE_MATCH")) is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return any(tag in ("*", etag, "W/" + etag) for tag in tags)
+    if mtime is not None and (if_modified_since := environ.get("HTTP_IF_MODIFIED_SINCE")):
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(mtime) <= since.timestamp()
+    return False
+
+
+def _get_page_param(query: str) -> str | None:
+    return urllib.parse.parse_qs(query).get("page", [None])[0]
+
+
 def _timestamp() -> int:
     return round(time.monotonic() * 1000)
 
@@ -16,6 +16,7 @@ if TYPE_CHECKING:
 
 from mkdocs import utils
 from mkdocs.config.base import Config, ConfigErrors, ConfigWarnings, LegacyConfig, PlainConfigSchema
+from mkdocs.utils import profiling
 
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
@@ -69,6 +70,35 @@ class BasePlugin(Generic[SomeConfig]):
     supports_multiple_instances: bool = False
     """Set to true in subclasses to declare support for adding the same plugin multiple times."""
 
+    parallel_safe: bool = False
+    """Set to true in subclasses to declare that the page events can run in worker processes.
+
+    With `mkdocs build --jobs`, page events run in a forked copy of the plugin, so any state
+    that they store outside of the page itself is lost. Only the page's `markdown`, `meta`,
+    `content`, `toc`, `title` and anchor data are sent back to the main process.
+    If any plugin handling page events doesn't declare this, pages are processed serially.
+
+    New in MkDocs 1.7.
+    """
+
+    memory_safe: bool = False
+    """Set to true in subclasses to declare that `on_post_build` doesn't read the site's files.
+
+    During `mkdocs serve`, the site is built into memory rather than into `config.site_dir` when
+    all plugins handling the `post_build` event declare this. Otherwise it is built to the disk.
+
+    New in MkDocs 1.7.
+    """
+
+    daemon_safe: bool = False
+    """Set to true in subclasses to declare that the plugin can be kept across daemon builds.
+
+    `mkdocs build --daemon` reuses a loaded config, with its plugins, for later builds of the
+    same site only if all plugins declare this or implement `on_startup` or `on_shutdown`.
+
+    New in MkDocs 1.7.
+    """
+
     def __class_getitem__(cls, config_class: type[Config]):
         """Eliminates the need to write `config_class = FooConfig` when subclassing BasePlugin[FooConfig]."""
         name = f'{cls.__name__}[{config_class.__name__}]'
@@ -233,6 +263,12 @@ class BasePlugin(Generic[SomeConfig]):
         The `post_build` event does not alter any variables. Use this event to call
         post-build scripts.
 
+        New in MkDocs 1.7: during `mkdocs serve`, if all plugins handling this event declare
+        `memory_safe`, the site is built into memory rather than into `config.site_dir`. The
+        files output with `mkdocs.utils.write_file` and `mkdocs.utils.copy_file` are kept there,
+        so they can't be read back from `site_dir`. Files written to `site_dir` by other means
+        are still served.
+
         Args:
             config: global configuration object
         """
@@ -532,6 +568,23 @@ class PluginCollection(dict, MutableMapping[str, BasePlugin]):
     def __getitem__(self, key: str) -> BasePlugin:
         return super().__getitem__(key)
 
+    def _parallel_safe(self, *event_names: str) -> bool:
+        """Whether all handlers of the given events come from plugins declaring `parallel_safe`."""
+        return self._all_declare('parallel_safe', *event_names)
+
+    def _memory_safe(self) -> bool:
+        """Whether all handlers of `post_build` come from plugins declaring `memory_safe`."""
+        return self._all_declare('memory_safe', 'post_build')
+
+    def _all_declare(self, attribute: str, *event_names: str) -> bool:
+        for name in event_names:
+            for method in self.events[name]:
+                plugin_name = self._event_origins.get(method)
+                plugin = self.get(plugin_name) if plugin_name is not None else None
+                if not getattr(plugin, attribute, False):
+                    return False
+        return True
+
     def __setitem__(self, key: str, value: BasePlugin) -> None:
         super().__setitem__(key, value)
         # Register all of the event methods defined for this Plugin.
@@ -557,12 +610,22 @@ class PluginCollection(dict, MutableMapping[str, BasePlugin]):
         All other keywords are variables for context, but would not generally
         be modified by the event method.
         """
+        if self.events[name] and profiling.is_recording():
+            with profiling.event(f'on_{name}'):
+                return self._run_event(name, item, kwargs, profile=True)
+        return self._run_event(name, item, kwargs)
+
+    def _run_event(self, name: str, item, kwargs: dict[str, Any], profile: bool = False):
         pass_item = item is not None
         for method in self.events[name]:
             self._current_plugin = self._event_origins.get(method, '<unknown>')
             if log.getEffectiveLevel() <= logging.DEBUG:
                 log.debug(f"Running `{name}` event from plugin '{self._current_plugin}'")
-            if pass_item:
+            if profile:
+                page = kwargs.get('page')
+                with profiling.plugin_event(self._current_plugin, f'on_{name}', page):
+                    result = method(item, **kwargs) if pass_item else method(**kwargs)
+            elif pass_item:
                 result = method(item, **kwargs)
             else:
                 result = method(**kwargs)
@@ -5,11 +5,22 @@ import fnmatch
 import logging
 import os
 import posixpath
+import re
 import shutil
 import warnings
-from functools import cached_property
 from pathlib import PurePath, PurePosixPath
-from typing import TYPE_CHECKING, Callable, Iterable, Iterator, Mapping, Sequence, overload
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    ClassVar,
+    Generic,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+    TypeVar,
+    overload,
+)
 from urllib.parse import quote as urlquote
 
 import pathspec
@@ -27,6 +38,85 @@ if TYPE_CHECKING:
 
 log = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# Matches paths that `PurePath(path).as_posix()` may change: empty, absolute, containing '.' or
+# empty parts, a trailing slash, or characters that are special on Windows.
+_needs_normalization = re.compile(r'(^|/)\.?(/|$)|[\\:]').search
+
+# The kinds of files that `Files` keeps track of. 'media_file' also covers 'javascript' and 'css'.
+_FILE_KINDS = ('documentation_page', 'static_page', 'media_file', 'javascript', 'css')
+
+
+def _get_file_kind(src_uri: str) -> str:
+    if utils.is_markdown_file(src_uri):
+        return 'documentation_page'
+    if src_uri.endswith(('.html', '.htm', '.xml', '.json')):
+        return 'static_page'
+    if src_uri.endswith(('.js', '.javascript', '.mjs')):
+        return 'javascript'
+    if src_uri.endswith('.css'):
+        return 'css'
+    return 'media_file'
+
+
+class _slot_cached_property:
+    """
+    Same as `functools.cached_property`, but keeps the value in the slot named like the property
+    with a leading underscore, so the instances don't need a `__dict__`.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.slot = owner.__dict__['_' + name]
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.func(instance)
+            self.slot.__set__(instance, value)
+            return value
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, value)
+
+    def __delete__(self, instance):
+        self.slot.__delete__(instance)
+
+
+class _slot_default(Generic[T]):
+    """
+    A slot that reads as `default` until it's assigned, the way a class attribute with a default
+    does for the instances that have a `__dict__`. The value is kept in the slot named like the
+    attribute with a trailing underscore. On the class itself the attribute is just `default`.
+    """
+
+    def __init__(self, default: T) -> None:
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.slot = owner.__dict__[name + '_']
+
+    def __get__(self, instance, owner=None) -> T:
+        if instance is None:
+            return self.default
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            return self.default
+
+    def __set__(self, instance, value: T) -> None:
+        self.slot.__set__(instance, value)
+
+    def __delete__(self, instance) -> None:
+        self.slot.__delete__(instance)
+
 
 class InclusionLevel(enum.Enum):
     EXCLUDED = -3
@@ -59,11 +149,60 @@ class InclusionLevel(enum.Enum):
         return self.value <= self.NOT_IN_NAV.value
 
 
+class _inclusion_slot(_slot_default[InclusionLevel]):
+    """Same as `_slot_default`, but counts the changes of files that are in a `Files` collection."""
+
+    def __set__(self, instance, value: InclusionLevel) -> None:
+        if self.__get__(instance) is not value:
+            super().__set__(instance, value)
+            if instance._collections:
+                File._inclusion_changes += 1
+
+
 class Files:
     """A collection of [File][mkdocs.structure.files.File] objects."""
 
     def __init__(self, files: Iterable[File]) -> None:
+        self._src_uris: dict[str, File] = {}
+        self._set_files(files)
+
+    def _set_files(self, files: Iterable[File]) -> None:
+        for file in self._src_uris.values():
+            file._collections -= 1
         self._src_uris = {f.src_uri: f for f in files}
+        for file in self._src_uris.values():
+            file._collections += 1
+        # The files of each kind, in the same order as `_src_uris`. They're classified once when
+        # they're added, so a file's `src_uri` shouldn't change while it's in the collection.
+        self._by_kind: dict[str, dict[str, File]] = {kind: {} for kind in _FILE_KINDS}
+        for file in self._src_uris.values():
+            self._add_to_kinds(file)
+        self._clear_views()
+        self._link_targets: dict[tuple[str, str], tuple[str, File | None]] = {}
+        """The `src_uri` that relative links resolve to, and the file that has it, by the
+        directory of the linking file and the link's path. See `_RelativePathTreeprocessor`."""
+
+    def _clear_views(self) -> None:
+        self._views: dict[Callable[[InclusionLevel], bool], tuple[File, ...]] = {}
+        """The results of `documentation_pages`, by the `inclusion` they were filtered with."""
+        self._views_inclusion_changes = File._inclusion_changes
+
+    def _add_to_kinds(self, file: File) -> None:
+        by_kind = self._by_kind
+        if file.is_documentation_page():
+            by_kind['documentation_page'][file.src_uri] = file
+        elif file.is_static_page():
+            by_kind['static_page'][file.src_uri] = file
+        else:
+            by_kind['media_file'][file.src_uri] = file
+            if file.is_javascript():
+                by_kind['javascript'][file.src_uri] = file
+            elif file.is_css():
+                by_kind['css'][file.src_uri] = file
+
+    def _remove_from_kinds(self, src_uri: str) -> None:
+        for files in self._by_kind.values():
+            files.pop(src_uri, None)
 
     def __iter__(self) -> Iterator[File]:
         """Iterate over the files within."""
@@ -92,7 +231,9 @@ class Files:
 
     def get_file_from_path(self, path: str) -> File | None:
         """Return a File instance with File.src_uri equal to path."""
-        return self._src_uris.get(PurePath(path).as_posix())
+        if _needs_normalization(path):
+            path = PurePath(path).as_posix()
+        return self._src_uris.get(path)
 
     def append(self, file: File) -> None:
         """Add file to the Files collection."""
@@ -100,15 +241,24 @@ class Files:
             warnings.warn(
                 "To replace an existing file, call `remove` before `append`.", DeprecationWarning
             )
-            del self._src_uris[file.src_uri]
+            self._src_uris.pop(file.src_uri)._collections -= 1
+            self._remove_from_kinds(file.src_uri)
         self._src_uris[file.src_uri] = file
+        file._collections += 1
+        self._add_to_kinds(file)
+        self._clear_views()
+        self._link_targets.clear()
 
     def remove(self, file: File) -> None:
         """Remove file from Files collection."""
         try:
-            del self._src_uris[file.src_uri]
+            removed = self._src_uris.pop(file.src_uri)
         except KeyError:
             raise ValueError(f'{file.src_uri!r} not in collection')
+        removed._collections -= 1
+        self._remove_from_kinds(file.src_uri)
+        self._clear_views()
+        self._link_targets.clear()
 
     def copy_static_files(
         self,
@@ -124,24 +274,35 @@ class Files:
     def documentation_pages(
         self, *, inclusion: Callable[[InclusionLevel], bool] = InclusionLevel.is_included
     ) -> Sequence[File]:
-        """Return iterable of all Markdown page file objects."""
-        return [file for file in self if file.is_documentation_page() and inclusion(file.inclusion)]
+        """
+        Return iterable of all Markdown page file objects.
+
+        The files are only filtered again once this collection or the inclusion of any of its
+        files changed. Each call still returns a new list, which the caller may modify.
+        """
+        if self._views_inclusion_changes != File._inclusion_changes or len(self._views) > 8:
+            self._clear_views()
+        view = self._views.get(inclusion)
+        if view is None:
+            files = self._by_kind['documentation_page'].values()
+            view = self._views[inclusion] = tuple(f for f in files if inclusion(f.inclusion))
+        return list(view)
 
     def static_pages(self) -> Sequence[File]:
         """Return iterable of all static page file objects."""
-        return [file for file in self if file.is_static_page()]
+        return list(self._by_kind['static_page'].values())
 
     def media_files(self) -> Sequence[File]:
         """Return iterable of all file objects which are not documentation or static pages."""
-        return [file for file in self if file.is_media_file()]
+        return list(self._by_kind['media_file'].values())
 
     def javascript_files(self) -> Sequence[File]:
         """Return iterable of all javascript file objects."""
-        return [file for file in self if file.is_javascript()]
+        return list(self._by_kind['javascript'].values())
 
     def css_files(self) -> Sequence[File]:
         """Return iterable of all CSS file objects."""
-        return [file for file in self if file.is_css()]
+        return list(self._by_kind['css'].values())
 
     def add_files_from_theme(self, env: jinja2.Environment, config: MkDocsConfig) -> None:
         """Retrieve static files from Jinja environment and add to collection."""
@@ -175,7 +336,7 @@ class Files:
     @_files.setter
     def _files(self, value: Iterable[File]):
         warnings.warn("Do not access Files._files.", DeprecationWarning)
-        self._src_uris = {f.src_uri: f for f in value}
+        self._set_files(value)
 
 
 class File:
@@ -212,8 +373,44 @@ class File:
     additional transformations to the path, based on `use_directory_urls`.
     """
 
-    src_uri: str
-    """The pure path (always '/'-separated) of the source file relative to the source directory."""
+    # There can be very many files, so they're kept compact. `__dict__` is still there (and only
+    # allocated when used) for the attributes that plugins may add.
+    __slots__ = (
+        '_src_uri',
+        '_kind',
+        'use_directory_urls',
+        'src_dir',
+        'dest_dir',
+        'inclusion_',
+        '_collections_',
+        'generated_by_',
+        '_content_',
+        'page_',
+        '_name',
+        '_dest_uri',
+        '_url',
+        '_abs_src_path',
+        '_abs_dest_path',
+        '__dict__',
+        '__weakref__',
+    )
+
+    _inclusion_changes: ClassVar[int] = 0
+    """Counts the changes of `inclusion` of files in any `Files`, so that `Files` can tell when the
+    documentation pages that it returned earlier may be out of date."""
+
+    _collections: _slot_default[int] = _slot_default(0)
+    """The number of `Files` collections that the file is in."""
+
+    @property
+    def src_uri(self) -> str:
+        """The pure path (always '/'-separated) of the source file relative to the source directory."""
+        return self._src_uri
+
+    @src_uri.setter
+    def src_uri(self, value: str):
+        self._src_uri = value
+        self._kind = _get_file_kind(value)
 
     use_directory_urls: bool
     """Whether directory URLs ('foo/') should be used or not ('foo.html').
@@ -232,15 +429,15 @@ class File:
     dest_dir: str
     """The OS path of the destination directory (top-level site_dir) that the file should be copied to."""
 
-    inclusion: InclusionLevel = InclusionLevel.UNDEFINED
+    inclusion: _slot_default[InclusionLevel] = _inclusion_slot(InclusionLevel.UNDEFINED)
     """Whether the file will be excluded from the built site."""
 
-    generated_by: str | None = None
+    generated_by: _slot_default[str | None] = _slot_default(None)
     """If not None, indicates that a plugin generated this file on the fly.
 
     The value is the plugin's entrypoint name and can be used to find the plugin by key in the PluginCollection."""
 
-    _content: str | bytes | None = None
+    _content: _slot_default[str | bytes | None] = _slot_default(None)
     """If set, the file's content will be read from here.
 
     This logic is handled by `content_bytes`/`content_string`, which should be used instead of
@@ -253,7 +450,10 @@ class File:
 
     @src_path.setter
     def src_path(self, value: str):
-        self.src_uri = PurePath(value).as_posix()
+        # Skip the conversion for paths that it wouldn't change, such as the ones from `get_files`.
+        if _needs_normalization(value):
+            value = PurePath(value).as_posix()
+        self.src_uri = value  # noqa: PLE0237, RUF100
 
     @property
     def dest_path(self) -> str:
@@ -264,7 +464,7 @@ class File:
     def dest_path(self, value: str):
         self.dest_uri = PurePath(value).as_posix()
 
-    page: Page | None = None
+    page: _slot_default[Page | None] = _slot_default(None)
 
     @overload
     @classmethod
@@ -368,7 +568,7 @@ class File:
         stem, ext = posixpath.splitext(filename)
         return 'index' if stem == 'README' else stem
 
-    name = cached_property(_get_stem)
+    name = _slot_cached_property(_get_stem)
     """Return the name of the file without its extension."""
 
     def _get_dest_path(self, use_directory_urls: bool | None = None) -> str:
@@ -386,7 +586,7 @@ class File:
                 return posixpath.join(parent, self.name, 'index.html')
         return self.src_uri
 
-    dest_uri = cached_property(_get_dest_path)
+    dest_uri = _slot_cached_property(_get_dest_path)
     """The pure path (always '/'-separated) of the destination file relative to the destination directory."""
 
     def _get_url(self, use_directory_urls: bool | None = None) -> str:
@@ -399,10 +599,10 @@ class File:
             url = (dirname or '.') + '/'
         return urlquote(url)
 
-    url = cached_property(_get_url)
+    url = _slot_cached_property(_get_url)
     """The URI of the destination file relative to the destination directory as a string."""
 
-    @cached_property
+    @_slot_cached_property
     def abs_src_path(self) -> str | None:
         """
         The absolute concrete path of the source file. Will use backslashes on Windows.
@@ -413,7 +613,7 @@ class File:
             return None
         return os.path.normpath(os.path.join(self.src_dir, self.src_uri))
 
-    @cached_property
+    @_slot_cached_property
     def abs_dest_path(self) -> str:
         """The absolute concrete path of the destination file. Will use backslashes on Windows."""
         return os.path.normpath(os.path.join(self.dest_dir, self.dest_uri))
@@ -477,7 +677,6 @@ class File:
             return
         log.debug(f"Copying media file: '{self.src_uri}'")
         output_path = self.abs_dest_path
-        os.makedirs(os.path.dirname(output_path), exist_ok=True)
         content = self._content
         if content is None:
             assert self.abs_src_path is not None
@@ -486,27 +685,26 @@ class File:
             except shutil.SameFileError:
                 pass  # Let plugins write directly into site_dir.
         elif isinstance(content, str):
-            with open(output_path, 'w', encoding='utf-8') as output_file:
-                output_file.write(content)
+            utils.write_file(content.encode('utf-8'), output_path)
         else:
-            with open(output_path, 'wb') as output_file:
-                output_file.write(content)
+            utils.write_file(content, output_path)
 
     def is_modified(self) -> bool:
         if self._content is not None:
             return True
         assert self.abs_src_path is not None
-        if os.path.isfile(self.abs_dest_path):
-            return os.path.getmtime(self.abs_dest_path) < os.path.getmtime(self.abs_src_path)
+        dest_mtime = utils.get_output_mtime(self.abs_dest_path)
+        if dest_mtime is not None:
+            return dest_mtime < os.path.getmtime(self.abs_src_path)
         return True
 
     def is_documentation_page(self) -> bool:
         """Return True if file is a Markdown page."""
-        return utils.is_markdown_file(self.src_uri)
+        return self._kind == 'documentation_page'
 
     def is_static_page(self) -> bool:
         """Return True if file is a static page (HTML, XML, JSON)."""
-        return self.src_uri.endswith(('.html', '.htm', '.xml', '.json'))
+        return self._kind == 'static_page'
 
     def is_media_file(self) -> bool:
         """Return True if file is not a documentation or static page."""
@@ -514,20 +712,24 @@ class File:
 
     def is_javascript(self) -> bool:
         """Return True if file is a JavaScript file."""
-        return self.src_uri.endswith(('.js', '.javascript', '.mjs'))
+        return self._kind == 'javascript'
 
     def is_css(self) -> bool:
         """Return True if file is a CSS file."""
-        return self.src_uri.endswith('.css')
+        return self._kind == 'css'
 
 
 _default_exclude = pathspec.gitignore.GitIgnoreSpec.from_lines(['.*', '/templates/'])
 
 
+def _get_exclude_spec(config: MkDocsConfig) -> pathspec.gitignore.GitIgnoreSpec:
+    exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('exclude_docs')
+    return _default_exclude + exclude if exclude else _default_exclude
+
+
 def set_exclusions(files: Iterable[File], config: MkDocsConfig) -> None:
     """Re-calculate which files are excluded, based on the patterns in the config."""
-    exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('exclude_docs')
-    exclude = _default_exclude + exclude if exclude else _default_exclude
+    exclude = _get_exclude_spec(config)
     drafts: pathspec.gitignore.GitIgnoreSpec | None = config.get('draft_docs')
     nav_exclude: pathspec.gitignore.GitIgnoreSpec | None = config.get('not_in_nav')
 
@@ -543,22 +745,64 @@ def set_exclusions(files: Iterable[File], config: MkDocsConfig) -> None:
                 file.inclusion = InclusionLevel.INCLUDED
 
 
+def _walk_docs_dir(
+    docs_dir: str, exclude: pathspec.gitignore.GitIgnoreSpec | None
+) -> Iterator[tuple[str, list[str], bool]]:
+    """
+    Walk `docs_dir` in the same order as `os.walk(docs_dir, followlinks=True)` with sorted dirs.
+
+    Yields the directory relative to `docs_dir` (empty or '/'-separated and ending with '/'),
+    the names of the files in it, and whether the directory matches `exclude` (so then every
+    file in it does, too) or is inside such a directory.
+    """
+    stack = [('', False)]
+    while stack:
+        relative_dir, excluded = stack.pop()
+        try:
+            with os.scandir(os.path.join(docs_dir, relative_dir)) as it:
+                entries = list(it)
+        except OSError:
+            continue  # Same as `os.walk`, skip directories that can't be listed.
+        dirnames: list[str] = []
+        filenames: list[str] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dirnames if is_dir else filenames).append(entry.name)
+        yield relative_dir, filenames, excluded
+
+        for dirname in sorted(dirnames, reverse=True):
+            path = f'{relative_dir}{dirname}/'
+            stack.append((path, excluded or (exclude is not None and exclude.match_file(path))))
+
+
 def get_files(config: MkDocsConfig) -> Files:
     """Walk the `docs_dir` and return a Files collection."""
     files: list[File] = []
     conflicting_files: list[tuple[File, File]] = []
-    for source_dir, dirnames, filenames in os.walk(config['docs_dir'], followlinks=True):
-        relative_dir = os.path.relpath(source_dir, config['docs_dir'])
-        dirnames.sort()
+    docs_dir = config['docs_dir']
+    site_dir = config['site_dir']
+    use_directory_urls = config['use_directory_urls']
+    # Files in an excluded directory can be marked excluded right away, without matching each of
+    # them. Not if there are negated patterns, because those could re-include some of the files.
+    exclude_spec = _get_exclude_spec(config)
+    exclude: pathspec.gitignore.GitIgnoreSpec | None = (
+        None if any(pattern.include is False for pattern in exclude_spec.patterns) else exclude_spec
+    )
+    for relative_dir, filenames, excluded in _walk_docs_dir(docs_dir, exclude):
         filenames.sort(key=_file_sort_key)
+        inclusion = InclusionLevel.EXCLUDED if excluded else InclusionLevel.UNDEFINED
 
         files_by_dest: dict[str, File] = {}
         for filename in filenames:
             file = File(
-                os.path.join(relative_dir, filename),
-                config['docs_dir'],
-                config['site_dir'],
-                config['use_directory_urls'],
+                relative_dir + filename,
+                docs_dir,
+                site_dir,
+                use_directory_urls,
+                inclusion=inclusion,
             )
             # Skip README.md if an index file also exists in dir (part 1)
             prev_file = files_by_dest.setdefault(file.dest_uri, file)
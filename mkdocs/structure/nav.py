@@ -13,6 +13,7 @@ from mkdocs.utils import nest_paths
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
     from mkdocs.structure.files import Files
+    from mkdocs.utils.templates import SharedContext
 
 
 log = logging.getLogger(__name__)
@@ -29,6 +30,8 @@ class Navigation:
                 self.homepage = page
                 break
 
+        self._shared_context: SharedContext | None = None
+
     homepage: Page | None
     """The [page][mkdocs.structure.pages.Page] object for the homepage of the site."""
 
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import contextlib
 import enum
+import functools
 import logging
 import posixpath
+import threading
 import warnings
-from typing import TYPE_CHECKING, Any, Callable, Iterator, MutableMapping, Sequence
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping, MutableMapping, Sequence
 from urllib.parse import unquote as urlunquote
 from urllib.parse import urljoin, urlsplit, urlunsplit
 
@@ -15,10 +18,12 @@ import markdown.postprocessors
 import markdown.treeprocessors
 from markdown.util import AMP_SUBSTITUTE
 
+import mkdocs
 from mkdocs import utils
 from mkdocs.structure import StructureItem
 from mkdocs.structure.toc import get_toc
 from mkdocs.utils import _removesuffix, get_build_date, get_markdown_title, meta, weak_property
+from mkdocs.utils.cache import get_module_version, hash_key
 from mkdocs.utils.rendering import get_heading_text
 
 if TYPE_CHECKING:
@@ -27,6 +32,7 @@ if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
     from mkdocs.structure.files import File, Files
     from mkdocs.structure.toc import TableOfContents
+    from mkdocs.utils.cache import ContentCache
 
 
 log = logging.getLogger(__name__)
@@ -267,35 +273,76 @@ class Page(StructureItem):
             title = title.capitalize()
         return title
 
-    def render(self, config: MkDocsConfig, files: Files) -> None:
-        """Convert the Markdown source file to HTML as per the config."""
+    def render(
+        self, config: MkDocsConfig, files: Files, *, cache: ContentCache | None = None
+    ) -> None:
+        """
+        Convert the Markdown source file to HTML as per the config.
+
+        If a `cache` is given, the result is looked up there first, and stored there otherwise.
+        A cached result is reused only if all the other files that the page's links resolved to
+        (or failed to resolve to) are still the same. Messages logged during the original
+        render are logged again.
+        """
 
         assert self.__read_source_complete, 'read_source() has not been called, required before render()'
 
         if self.markdown is None:
             raise RuntimeError("`markdown` field hasn't been set (via `read_source`)")
 
-        md = markdown.Markdown(
-            extensions=config['markdown_extensions'],
-            extension_configs=config['mdx_configs'] or {},
-        )
+        key = None
+        if cache is not None:
+            try:
+                key = self._render_cache_key(config)
+            except TypeError as e:
+                log.debug(f"Not caching the rendered page '{self.file.src_uri}': {e}")
+
+        if cache is None or key is None:
+            self._render(config, files)
+        else:
+            entry = cache.get(key)
+            if entry is not None and _RelativePathTreeprocessor._lookups_match(
+                entry['lookups'], files
+            ):
+                self._load_render_cache_entry(entry, files)
+            else:
+                logger = logging.getLogger('mkdocs')
+                handler = utils.CaptureHandler()
+                logger.addHandler(handler)
+                try:
+                    entry = self._render(config, files)
+                finally:
+                    logger.removeHandler(handler)
+                entry['logs'] = [(r.name, r.levelno, r.getMessage()) for r in handler.records]
+                cache.set(key, entry)
+
+        assert not self.links_to_anchors or all(anchor_link.inclusion.is_included() for anchor_link in self.links_to_anchors), 'The anchor links include an excluded link'
+        assert self.content is not None
+        assert not self.links_to_anchors or all(any(anchor in self.content for anchor, file_path in anchor_link.items()) for anchor_link in self.links_to_anchors.values()), 'Page output HTML is missing expected anchor'
+        self.__render_complete = True
 
-        raw_html_ext = _RawHTMLPreprocessor()
-        raw_html_ext._register(md)
+    def _render(self, config: MkDocsConfig, files: Files) -> dict[str, Any]:
+        """Actually run Markdown and return the results in a form that can be cached."""
+        with _markdown_converters.get(config) as md:
+            # Registering replaces the processors that were registered for the previous page.
+            raw_html_ext = _RawHTMLPreprocessor()
+            raw_html_ext._register(md)
 
-        extract_anchors_ext = _ExtractAnchorsTreeprocessor(self.file, files, config)
-        extract_anchors_ext._register(md)
+            extract_anchors_ext = _ExtractAnchorsTreeprocessor(self.file, files, config)
+            extract_anchors_ext._register(md)
 
-        relative_path_ext = _RelativePathTreeprocessor(self.file, files, config)
-        relative_path_ext._register(md)
+            relative_path_ext = _RelativePathTreeprocessor(self.file, files, config)
+            relative_path_ext._register(md)
 
-        extract_title_ext = _ExtractTitleTreeprocessor()
-        extract_title_ext._register(md)
+            extract_title_ext = _ExtractTitleTreeprocessor()
+            extract_title_ext._register(md)
 
-        self.content = md.convert(self.markdown)
+            assert self.markdown is not None
+            self.content = md.convert(self.markdown)
 
+            toc_tokens = getattr(md, 'toc_tokens', [])
 
-        self.toc = get_toc(getattr(md, 'toc_tokens', []))
+        self.toc = get_toc(toc_tokens)
         self._title_from_render = extract_title_ext.title
         self.present_anchor_ids = (
             extract_anchors_ext.present_anchor_ids | raw_html_ext.present_anchor_ids
@@ -303,9 +350,88 @@ class Page(StructureItem):
         if log.getEffectiveLevel() > logging.DEBUG:
             self.links_to_anchors = relative_path_ext.links_to_anchors
 
-        assert not self.links_to_anchors or all(anchor_link.inclusion.is_included() for anchor_link in self.links_to_anchors), 'The anchor links include an excluded link'
-        assert not self.links_to_anchors or all(any(anchor in self.content for anchor, file_path in anchor_link.items()) for anchor_link in self.links_to_anchors.values()), 'Page output HTML is missing expected anchor'
-        self.__render_complete = True
+        return {
+            'content': self.content,
+            'toc_tokens': toc_tokens,
+            'title': self._title_from_render,
+            'present_anchor_ids': sorted(self.present_anchor_ids),
+            'links_to_anchors': {
+                file.src_uri: links for file, links in relative_path_ext.links_to_anchors.items()
+            },
+            'lookups': relative_path_ext.lookups,
+        }
+
+    def _render_cache_key(self, config: MkDocsConfig) -> str:
+        """
+        Return the key of the render cache entry, covering everything the render depends on.
+
+        Raises `TypeError` if the config has values that can't be part of a stable key.
+        """
+        return hash_key(
+            mkdocs.__version__,
+            markdown.__version__,
+            _markdown_converters.get_extension_versions(config),
+            self.markdown,
+            config['markdown_extensions'],
+            config['mdx_configs'],
+            config.use_directory_urls,
+            dict(config.validation.links),
+            self.file.src_uri,
+            self.file.url,
+            self.file.inclusion.value,
+            log.getEffectiveLevel(),
+        )
+
+    def _load_render_cache_entry(self, entry: dict[str, Any], files: Files) -> None:
+        """Populate the page from a render cache entry, logging its messages again."""
+        utils.CaptureHandler.replay(
+            logging.makeLogRecord(
+                {'name': name, 'levelno': level, 'levelname': logging.getLevelName(level), 'msg': msg}
+            )
+            for name, level, msg in entry['logs']
+        )
+        self.content = entry['content']
+        self.toc = get_toc(entry['toc_tokens'])
+        self._title_from_render = entry['title']
+        self.present_anchor_ids = set(entry['present_anchor_ids'])
+        if log.getEffectiveLevel() > logging.DEBUG:
+            self.links_to_anchors = {}
+            for src_uri, links in entry['links_to_anchors'].items():
+                if (file := files.get_file_from_path(src_uri)) is not None:
+                    self.links_to_anchors[file] = links
+
+    def _get_render_state(self) -> dict[str, Any]:
+        """Return the state populated by `read_source()` and `render()`, in a picklable form."""
+        state = {
+            'markdown': self.markdown,
+            'meta': self.meta,
+            'content': self.content,
+            'toc': self.toc,
+            '_title_from_render': self._title_from_render,
+            'present_anchor_ids': self.present_anchor_ids,
+            'read_source_complete': self.__read_source_complete,
+            'render_complete': self.__render_complete,
+        }
+        if 'title' in self.__dict__:
+            state['title'] = self.__dict__['title']
+        if self.links_to_anchors is not None:
+            state['links_to_anchors'] = {
+                file.src_uri: links for file, links in self.links_to_anchors.items()
+            }
+        return state
+
+    def _set_render_state(self, state: dict[str, Any], files: Files) -> None:
+        """Restore the state obtained from `_get_render_state()`, possibly of another process."""
+        state = dict(state)
+        self.__read_source_complete = state.pop('read_source_complete')
+        self.__render_complete = state.pop('render_complete')
+        if (links_to_anchors := state.pop('links_to_anchors', None)) is not None:
+            self.links_to_anchors = {}
+            for src_uri, links in links_to_anchors.items():
+                if (file := files.get_file_from_path(src_uri)) is not None:
+                    self.links_to_anchors[file] = links
+        for key, value in state.items():
+            setattr(self, key, value)
 
     present_anchor_ids: set[str] | None = None
     """Anchor IDs that this page contains (can be linked to in this page)."""
@@ -342,6 +468,60 @@ class Page(StructureItem):
                 )
 
 
+class _MarkdownConverterPool(threading.local):
+    """
+    Markdown converters set up with the configured extensions, to be reused from page to page.
+
+    Setting up the extensions can take longer than converting a small page. A converter is
+    `reset()` after each use, which is how Python-Markdown supports converting multiple documents.
+    The pool is per thread, and all converters are discarded when the Markdown config changes.
+    """
+
+    def __init__(self) -> None:
+        self.key: str | None = None
+        self.free: list[markdown.Markdown] = []
+        self.extension_versions: dict[str, str | None] | None = None
+        """The versions of the packages that provide the extensions, by extension class."""
+
+    @contextlib.contextmanager
+    def get(self, config: MkDocsConfig) -> Iterator[markdown.Markdown]:
+        try:
+            key: str | None = hash_key(config['markdown_extensions'], config['mdx_configs'])
+        except TypeError:  # The config can't be compared to the previous one, so don't reuse.
+            key = None
+        if key is None or key != self.key:
+            self.key = key
+            self.free = []
+            self.extension_versions = None
+        if self.free:
+            md = self.free.pop()
+        else:
+            md = markdown.Markdown(
+                extensions=config['markdown_extensions'],
+                extension_configs=config['mdx_configs'] or {},
+            )
+        if self.extension_versions is None:
+            self.extension_versions = {}
+            for ext in md.registeredExtensions:
+                name = f'{type(ext).__module__}.{type(ext).__qualname__}'
+                self.extension_versions[name] = get_module_version(type(ext).__module__)
+        try:
+            yield md
+        finally:
+            md.reset()
+            if key is not None and self.key == key:
+                self.free.append(md)
+
+    def get_extension_versions(self, config: MkDocsConfig) -> dict[str, str | None]:
+        """Return the versions of the packages that provide the configured extensions."""
+        with self.get(config):
+            assert self.extension_versions is not None
+            return self.extension_versions
+
+
+_markdown_converters = _MarkdownConverterPool()
+
+
 class _ExtractAnchorsTreeprocessor(markdown.treeprocessors.Treeprocessor):
     def __init__(self, file: File, files: Files, config: MkDocsConfig) -> None:
         self.present_anchor_ids: set[str] = set()
@@ -365,6 +545,40 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
         self.files = files
         self.config = config
         self.links_to_anchors: dict[File, dict[str, str]] = {}
+        self.lookups: dict[str, tuple[str, str, int] | None] = {}
+        """All paths that were looked up among `files`, and what they resolved to."""
+
+    def _get_file_from_path(self, path: str) -> File | None:
+        """Same as `files.get_file_from_path`, but records the lookup into `lookups`."""
+        file = self.files.get_file_from_path(path)
+        self.lookups[path] = _lookup_result(file)
+        return file
+
+    def _resolve_link(self, path: str) -> tuple[str, File | None]:
+        """
+        Return the `src_uri` that the relative link `path` points to, and the file that has it.
+
+        The results are kept in `files`, so that the links shared by pages in the same directory,
+        such as cross-references, are resolved once per build.
+        """
+        key = (posixpath.dirname(self.file.src_uri), path)
+        try:
+            target_uri, file = self.files._link_targets[key]
+        except KeyError:
+            target_uri = _resolve_relative_path(*key)
+            file = self.files.get_file_from_path(target_uri)
+            self.files._link_targets[key] = (target_uri, file)
+        self.lookups[target_uri] = _lookup_result(file)
+        return target_uri, file
+
+    @classmethod
+    def _lookups_match(cls, lookups: Mapping[str, Sequence | None], files: Files) -> bool:
+        """Whether all the recorded `lookups` would still resolve the same way among `files`."""
+        for path, result in lookups.items():
+            expected = _lookup_result(files.get_file_from_path(path))
+            if (None if result is None else tuple(result)) != expected:
+                return False
+        return True
 
     def run(self, root: etree.Element) -> etree.Element:
         """
@@ -390,9 +604,7 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
 
     @classmethod
     def _target_uri(cls, src_path: str, dest_path: str) -> str:
-        return posixpath.normpath(
-            posixpath.join(posixpath.dirname(src_path), dest_path).lstrip('/')
-        )
+        return _resolve_relative_path(posixpath.dirname(src_path), dest_path)
 
     @classmethod
     def _possible_target_uris(
@@ -455,10 +667,7 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
             return url
 
         path = urlunquote(path)
-        # Determine the filepath of the target.
-        possible_target_uris = self._possible_target_uris(
-            self.file, path, self.config.use_directory_urls
-        )
+        looked_up = not warning
 
         if warning:
             # For absolute path (already has a warning), the primary lookup path should be preserved as a tip option.
@@ -466,8 +675,7 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
             target_file = None
         else:
             # Validate that the target exists in files collection.
-            target_uri = next(possible_target_uris)
-            target_file = self.files.get_file_from_path(target_uri)
+            target_uri, target_file = self._resolve_link(path)
 
         if target_file is None and not warning:
             # Primary lookup path had no match, definitely produce a warning, just choose which one.
@@ -492,9 +700,14 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
 
             # There was no match, so try to guess what other file could've been intended.
             if warning_level > logging.DEBUG:
+                possible_target_uris = self._possible_target_uris(
+                    self.file, path, self.config.use_directory_urls
+                )
+                if looked_up:
+                    next(possible_target_uris)  # The primary target, already not found.
                 suggest_url = ''
                 for path in possible_target_uris:
-                    if self.files.get_file_from_path(path) is not None:
+                    if self._get_file_from_path(path) is not None:
                         if anchor and path == self.file.src_uri:
                             path = ''
                         elif absolute_link is _AbsoluteLinksValidationValue.RELATIVE_TO_DOCS:
@@ -535,6 +748,18 @@ class _RelativePathTreeprocessor(markdown.treeprocessors.Treeprocessor):
         md.treeprocessors.register(self, "relpath", 0)
 
 
+@functools.lru_cache(maxsize=8192)
+def _resolve_relative_path(src_dir: str, path: str) -> str:
+    """Resolve a link `path` found in a file in `src_dir`. Pages in a directory share many links."""
+    return posixpath.normpath(posixpath.join(src_dir, path).lstrip('/'))
+
+
+def _lookup_result(file: File | None) -> tuple[str, str, int] | None:
+    if file is None:
+        return None
+    return (file.src_uri, file.url, file.inclusion.value)
+
+
 class _RawHTMLPreprocessor(markdown.preprocessors.Preprocessor):
     def __init__(self) -> None:
         super().__init__()
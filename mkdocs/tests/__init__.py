@@ -1,8 +1,12 @@
 import logging
+import os
 import unittest.util
 
 unittest.util._MAX_LENGTH = 100000  # type: ignore[misc]
 
+# Keep the compiled templates of the tests out of the user's cache directory.
+os.environ['MKDOCS_NO_TEMPLATE_CACHE'] = '1'
+
 
 class DisallowLogsHandler(logging.Handler):
     def __init__(self, level=logging.WARNING):
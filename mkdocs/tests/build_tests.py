@@ -15,12 +15,13 @@ import markdown.preprocessors
 
 from mkdocs.commands import build
 from mkdocs.config import base
-from mkdocs.exceptions import PluginError
+from mkdocs.exceptions import Abort, PluginError
 from mkdocs.structure.files import File, Files
 from mkdocs.structure.nav import get_navigation
 from mkdocs.structure.pages import Page
 from mkdocs.tests.base import PathAssertionMixin, load_config, tempdir
-from mkdocs.utils import meta
+from mkdocs.utils import meta, profiling
+from mkdocs.utils.cache import ContentCache
 
 if TYPE_CHECKING:
     from mkdocs.config.defaults import MkDocsConfig
@@ -213,6 +214,33 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
         self.assertEqual(context['extra_css'], ['../style.css'])
         self.assertEqual(context['extra_javascript'], ['../script.js'])
 
+    def test_context_shared_between_pages(self):
+        cfg = load_config(extra_css=['foo/style.css'], extra_javascript=['https://e.com/x.js'])
+        fs = [
+            File('foo/a.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls),
+            File('foo/b.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls),
+            File('bar/c.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls),
+        ]
+        files = Files(fs)
+        nav = get_navigation(files, cfg)
+        pages = [file.page for file in fs]
+        contexts = [build.get_context(nav, files, cfg, page) for page in pages]
+        self.assertEqual(
+            [c['extra_css'] for c in contexts],
+            [['../style.css'], ['../style.css'], ['../../foo/style.css']],
+        )
+        self.assertEqual([c['extra_javascript'] for c in contexts], [['https://e.com/x.js']] * 3)
+        self.assertEqual([c['base_url'] for c in contexts], ['../..'] * 3)
+        self.assertEqual(len({c['build_date_utc'] for c in contexts}), 1)
+
+        # Changes to the context of one page or to the config are not missed by the next pages.
+        contexts[0]['extra_css'].append('other.css')
+        cfg.extra_css.append('bar/extra.css')
+        context = build.get_context(nav, files, cfg, pages[2])
+        self.assertEqual(context['extra_css'], ['../../foo/style.css', '../extra.css'])
+        context = build.get_context(nav, files, cfg, pages[1])
+        self.assertEqual(context['extra_css'], ['../style.css', '../../bar/extra.css'])
+
     def test_extra_context(self):
         cfg = load_config(extra={'a': 1})
         context = build.get_context(mock.Mock(), mock.Mock(), cfg)
@@ -239,7 +267,10 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
         cfg = load_config(site_dir=site_dir)
         env = cfg.theme.get_env()
         build._build_theme_template('sitemap.xml', env, Files([]), cfg, mock.Mock())
-        mock_write_file.assert_called_once()
+        self.assertEqual(
+            [args[1] for args, kwargs in mock_write_file.call_args_list],
+            [os.path.join(site_dir, 'sitemap.xml'), os.path.join(site_dir, 'sitemap.xml.gz')],
+        )
         mock_build_template.assert_called_once()
         mock_gzip_gzipfile.assert_called_once()
 
@@ -922,6 +953,329 @@ class BuildTests(PathAssertionMixin, unittest.TestCase):
                 self.assertTrue(main_path.is_file())
                 self.assertIn(textwrap.dedent(expected), main_path.read_text())
 
+    # Test parallel builds
+
+    def _read_site(self, site_dir):
+        return {
+            str(p.relative_to(site_dir)): p.read_bytes()
+            for p in Path(site_dir).rglob('*')
+            if p.is_file() and p.name != 'sitemap.xml.gz'
+        }
+
+    @tempdir(
+        files={
+            'index.md': '# Home\n\n[foo](test/foo.md#page1-heading)',
+            'test/foo.md': '## page1 heading\n\n[bar](bar.md#heading)\n\n[up](../index.md)',
+            'test/bar.md': 'title: Bar\n\n## page2 heading\n\n[aaa](#a)',
+            'test/baz.md': '# Baz\n\n[missing](missing.md)',
+        }
+    )
+    @tempdir()
+    @tempdir()
+    @mock.patch.dict(os.environ, {'SOURCE_DATE_EPOCH': '123'})
+    def test_parallel_build_matches_serial(self, serial_site_dir, parallel_site_dir, docs_dir):
+        expected_logs = '''
+            WARNING:Doc file 'test/baz.md' contains a link 'missing.md', but the target 'test/missing.md' is not found among documentation files.
+            WARNING:Doc file 'test/bar.md' contains a link '#a', but there is no such anchor on this page.
+            WARNING:Doc file 'test/foo.md' contains a link 'bar.md#heading', but the doc 'test/bar.md' does not contain an anchor '#heading'.
+        '''
+        # The search plugin is the only one that MkDocs enables by default.
+        for plugins in [], ['search']:
+            for site_dir, jobs in (serial_site_dir, 1), (parallel_site_dir, 2):
+                with self.subTest(plugins=plugins, jobs=jobs):
+                    cfg = load_config(
+                        docs_dir=docs_dir,
+                        site_dir=site_dir,
+                        plugins=plugins,
+                        validation={'anchors': 'warn'},
+                    )
+                    with self._assert_build_logs(expected_logs), mock.patch.object(
+                        build, '_map_in_workers', wraps=build._map_in_workers
+                    ) as map_in_workers:
+                        build.build(cfg, jobs=jobs)
+                    # Both the reading and the templating of the pages ran in the workers.
+                    expected = [build._populate_page_in_worker, build._build_page_in_worker]
+                    self.assertEqual(
+                        [c.args[0] for c in map_in_workers.call_args_list],
+                        expected if jobs > 1 else [],
+                    )
+            self.assertEqual(self._read_site(parallel_site_dir), self._read_site(serial_site_dir))
+
+    @tempdir(files={'index.md': '# Home', 'foo.md': '# Foo'})
+    @tempdir()
+    @tempdir()
+    @tempdir()
+    def test_build_sites(self, cache_dir, other_site_dir, site_dir, docs_dir):
+        def build_site(site_dir, **kwargs):
+            cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, **kwargs)
+            build.build(cfg, render_cache=ContentCache(cache_dir))
+
+        with self.assertLogs('mkdocs') as cm:
+            build.build_sites(
+                [
+                    lambda: build_site(site_dir),
+                    lambda: build_site(other_site_dir, theme='readthedocs'),
+                ],
+                processes=1,
+            )
+        self.assertEqual(len([msg for msg in cm.output if 'Documentation built' in msg]), 2)
+        self.assertPathIsFile(site_dir, 'foo', 'index.html')
+        self.assertPathIsFile(other_site_dir, 'foo', 'index.html')
+        self.assertTrue(os.listdir(cache_dir))
+
+    def test_build_sites_error(self):
+        def fail():
+            build.log.warning("Failing")
+            raise Abort("Failed")
+
+        with self.assertLogs('mkdocs') as cm, self.assertRaisesRegex(Abort, "Failed"):
+            build.build_sites([lambda: None, fail])
+        self.assertEqual(cm.output, ['WARNING:mkdocs.commands.build:Failing'])
+
+    @tempdir(files={'index.md': '# Home', 'foo.md': '# Foo'})
+    @tempdir()
+    @tempdir()
+    def test_parallel_build_fills_render_cache(self, other_site_dir, site_dir, docs_dir):
+        render_cache = ContentCache()
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        build.build(cfg, jobs=2, render_cache=render_cache)
+
+        # Another variant of the site, with the same Markdown config, renders nothing again.
+        cfg = load_config(docs_dir=docs_dir, site_dir=other_site_dir, theme='readthedocs')
+        with mock.patch.object(Page, '_render', autospec=True) as render:
+            build.build(cfg, render_cache=render_cache)
+        render.assert_not_called()
+        html = Path(other_site_dir, 'foo', 'index.html').read_text()
+        self.assertIn('<h1 id="foo">Foo</h1>', html)
+
+    @tempdir(files={'index.md': '# Home', 'foo.md': '# Foo'})
+    @tempdir()
+    def test_build_profile(self, site_dir, docs_dir):
+        for jobs in 1, 2:
+            with self.subTest(jobs=jobs):
+                cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, plugins=['search'])
+                profile = profiling.BuildProfile(trace=True)
+                with profiling.recording(profile):
+                    build.build(cfg, jobs=jobs)
+                self.assertEqual(
+                    list(profile.phases),
+                    [
+                        'prepare',
+                        'get_files',
+                        'on_files',
+                        'nav',
+                        'read_render',
+                        'static_copy',
+                        'theme_templates',
+                        'page_templates',
+                        'anchor_validation',
+                        'post_build',
+                    ],
+                )
+                self.assertEqual(profile.phases['page_templates'].calls, 1)
+                # Only the events that have handlers are recorded, including those that ran
+                # in worker processes.
+                self.assertEqual(
+                    list(profile.events),
+                    ['on_config', 'on_pre_build', 'on_page_context', 'on_post_build'],
+                )
+                self.assertEqual(profile.plugin_events[('search', 'on_page_context')].calls, 2)
+                self.assertEqual(sorted(profile.pages), ['foo.md', 'index.md'])
+                self.assertIn('  page_templates ', profile.format_table())
+                self.assertIn('  search: on_page_context ', profile.format_table())
+                assert profile.trace_events is not None
+                page_events = [e for e in profile.trace_events if e.get('args')]
+                self.assertEqual(len(page_events), 2)
+                pids = {e['pid'] for e in page_events}
+                self.assertEqual(os.getpid() in pids, jobs == 1)
+
+    @tempdir(files={'index.md': 'page content', 'foo.md': 'page content'})
+    @tempdir()
+    def test_parallel_build_unsafe_plugin(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        pages = []
+
+        def on_page_markdown(markdown, page, **kwargs):
+            pages.append(page.file.src_uri)
+
+        cfg.plugins.events['page_markdown'].append(on_page_markdown)
+
+        expected_logs = '''
+            INFO:Some plugins aren't declared as `parallel_safe`, reading the pages serially.
+        '''
+        with self._assert_build_logs(expected_logs):
+            build.build(cfg, jobs=2)
+        self.assertEqual(sorted(pages), ['foo.md', 'index.md'])
+
+    @tempdir(files={'index.md': 'page content', 'foo.md': 'page content'})
+    @tempdir()
+    def test_parallel_build_unsafe_plugin_page_context(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        pages = []
+
+        def on_page_context(context, page, **kwargs):
+            pages.append(page.file.src_uri)
+
+        cfg.plugins.events['page_context'].append(on_page_context)
+
+        expected_logs = '''
+            INFO:Some plugins aren't declared as `parallel_safe`, building the pages serially.
+        '''
+        with self._assert_build_logs(expected_logs):
+            build.build(cfg, jobs=2)
+        self.assertEqual(sorted(pages), ['foo.md', 'index.md'])
+        self.assertPathIsFile(site_dir, 'foo', 'index.html')
+
+    @contextlib.contextmanager
+    def _record_rebuilt_pages(self):
+        built = []
+        orig_is_up_to_date = build._BuildManifest.is_up_to_date
+
+        def is_up_to_date(manifest, page, *args):
+            result = orig_is_up_to_date(manifest, page, *args)
+            if not result:
+                built.append(page.file.src_uri)
+            return result
+
+        with mock.patch.object(build._BuildManifest, 'is_up_to_date', is_up_to_date):
+            yield built
+
+    @tempdir(files={'index.md': '# Home\n\n[a](a.md)', 'a.md': '# A\n\ntext', 'b.md': '# B'})
+    @tempdir()
+    @tempdir()
+    @tempdir()
+    @mock.patch.dict(os.environ, {'SOURCE_DATE_EPOCH': '123'})
+    def test_incremental_build(self, project_dir, site_dir, clean_site_dir, docs_dir):
+        def build_pages(**kwargs):
+            cfg = load_config(
+                config_file_path=os.path.join(project_dir, 'mkdocs.yml'),
+                docs_dir=docs_dir,
+                **kwargs,
+            )
+            with self._record_rebuilt_pages() as built:
+                build.build(cfg, dirty=True)
+            return sorted(built)
+
+        self.assertEqual(build_pages(site_dir=site_dir), ['a.md', 'b.md', 'index.md'])
+        self.assertEqual(build_pages(site_dir=site_dir), [])
+        # Only the content of the page changed.
+        Path(docs_dir, 'a.md').write_text('# A\n\nother text')
+        with mock.patch.object(Page, '_render', autospec=True, side_effect=Page._render) as render:
+            self.assertEqual(build_pages(site_dir=site_dir), ['a.md'])
+        # The unchanged pages aren't converted again.
+        self.assertEqual([call.args[0].file.src_uri for call in render.call_args_list], ['a.md'])
+        # The navigation changed.
+        Path(docs_dir, 'b.md').rename(Path(docs_dir, 'c.md'))
+        self.assertEqual(build_pages(site_dir=site_dir), ['a.md', 'c.md', 'index.md'])
+        self.assertPathNotExists(site_dir, 'b')
+        # The config changed.
+        self.assertEqual(
+            build_pages(site_dir=site_dir, site_name='Other'), ['a.md', 'c.md', 'index.md']
+        )
+
+        # Dirty builds use the persistent render cache by default.
+        self.assertPathIsDir(project_dir, '.cache', 'mkdocs', 'render')
+
+        build.build(load_config(docs_dir=docs_dir, site_dir=clean_site_dir, site_name='Other'))
+        self.assertEqual(self._read_site(site_dir), self._read_site(clean_site_dir))
+
+    @tempdir(files={'index.md': '# Home', 'a.md': '# A'})
+    @tempdir()
+    @tempdir()
+    def test_incremental_build_with_given_caches(self, project_dir, site_dir, docs_dir):
+        render_cache = ContentCache()
+        build_cache = ContentCache()
+
+        def build_pages(jobs=1):
+            cfg = load_config(
+                config_file_path=os.path.join(project_dir, 'mkdocs.yml'),
+                docs_dir=docs_dir,
+                site_dir=site_dir,
+            )
+            with self._record_rebuilt_pages() as built:
+                build.build(
+                    cfg,
+                    dirty=True,
+                    jobs=jobs,
+                    render_cache=render_cache,
+                    build_cache=build_cache,
+                )
+            return sorted(built)
+
+        self.assertEqual(build_pages(), ['a.md', 'index.md'])
+        Path(docs_dir, 'a.md').write_text('# A\n\nother text')
+        # The fingerprints of the pages rebuilt by the workers get recorded too.
+        build_pages(jobs=2)
+        self.assertEqual(build_pages(), [])
+        Path(docs_dir, 'a.md').write_text('# A\n\nmore text')
+        self.assertEqual(build_pages(), ['a.md'])
+        self.assertPathNotExists(project_dir, '.cache')
+
+    @tempdir(files={'index.md': '# Home', 'a.md': '# A'})
+    @tempdir()
+    def test_incremental_build_page_context(self, site_dir, docs_dir):
+        build_cache = ContentCache()
+        extra = {'index.md': 'foo'}
+
+        def on_page_context(context, page, **kwargs):
+            context['extra_info'] = extra.get(page.file.src_uri)
+
+        def build_pages(**kwargs):
+            cfg = load_config(docs_dir=docs_dir, site_dir=site_dir, **kwargs)
+            cfg.plugins.events['page_context'].append(on_page_context)
+            with self._record_rebuilt_pages() as built:
+                build.build(cfg, dirty=True, build_cache=build_cache)
+            return sorted(built)
+
+        self.assertEqual(build_pages(), ['a.md', 'index.md'])
+        self.assertEqual(build_pages(), [])
+        # What a plugin added to the context changed.
+        extra['index.md'] = 'bar'
+        self.assertEqual(build_pages(), ['index.md'])
+        # An object can't be compared to what it was in the previous build.
+        extra['a.md'] = object()
+        self.assertEqual(build_pages(), ['a.md'])
+        self.assertEqual(build_pages(), ['a.md'])
+
+        # Neither can an object in the config.
+        with self.assertLogs('mkdocs', level='WARNING') as cm:
+            self.assertEqual(build_pages(extra={'obj': object()}), ['a.md', 'index.md'])
+        self.assertEqual(
+            cm.output,
+            [
+                (
+                    "WARNING:mkdocs.commands.build:Rebuilding all pages, as the config 'extra' "
+                    "can't be compared to the previous build: "
+                    "Object of type object is not JSON serializable"
+                )
+            ],
+        )
+
+    @tempdir(files={'index.md': '# Home', 'a.md': '# A', 'img.png': 'image'})
+    @tempdir(files={'.nojekyll': ''})
+    @mock.patch.dict(os.environ, {'SOURCE_DATE_EPOCH': '123'})
+    def test_sync_build(self, site_dir, docs_dir):
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        build.build(cfg)
+        Path(site_dir, 'stale.html').touch()
+        Path(site_dir, 'stale').mkdir()
+        Path(site_dir, 'stale', 'index.html').touch()
+        for path in Path(site_dir).rglob('*'):
+            os.utime(path, (0, 0))
+        Path(docs_dir, 'a.md').write_text('# A\n\nchanged')
+
+        cfg = load_config(docs_dir=docs_dir, site_dir=site_dir)
+        build.build(cfg, sync=True)
+        self.assertPathNotExists(site_dir, 'stale.html')
+        self.assertPathNotExists(site_dir, 'stale')
+        self.assertPathIsFile(site_dir, '.nojekyll')
+        changed = sorted(
+            str(p.relative_to(site_dir).as_posix())
+            for p in Path(site_dir).rglob('*')
+            if p.is_file() and p.stat().st_mtime != 0
+        )
+        self.assertEqual(changed, ['a/index.html'])
+
     # Test build.site_directory_contains_stale_files
 
     @tempdir(files=['index.html'])
@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import io
+import json
 import logging
 import unittest
 from unittest import mock
@@ -8,6 +9,8 @@ from unittest import mock
 from click.testing import CliRunner
 
 from mkdocs import __main__ as cli
+from mkdocs.tests import base
+from mkdocs.utils.cache import ContentCache
 
 
 class CLITests(unittest.TestCase):
@@ -29,9 +32,25 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             watch_theme=False,
+            watch_polling=False,
             watch=(),
         )
 
+    @mock.patch('mkdocs.commands.serve.serve', autospec=True)
+    def test_serve_profile(self, mock_serve):
+        with self.runner.isolated_filesystem():
+            result = self.runner.invoke(
+                cli.cli, ["serve", "--profile-trace", "trace.json"], catch_exceptions=False
+            )
+            with open('trace.json', encoding='utf-8') as f:
+                trace = json.load(f)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_serve.call_count, 1)
+        args, kwargs = mock_serve.call_args
+        self.assertNotIn('profile', kwargs)
+        self.assertEqual(trace, {'traceEvents': [], 'displayTimeUnit': 'ms'})
+
     @mock.patch('mkdocs.commands.serve.serve', autospec=True)
     def test_serve_config_file(self, mock_serve):
         result = self.runner.invoke(
@@ -62,6 +81,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             watch_theme=False,
+            watch_polling=False,
             watch=(),
         )
 
@@ -80,6 +100,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             watch_theme=False,
+            watch_polling=False,
             watch=(),
         )
 
@@ -100,6 +121,7 @@ class CLITests(unittest.TestCase):
             theme='readthedocs',
             use_directory_urls=None,
             watch_theme=False,
+            watch_polling=False,
             watch=(),
         )
 
@@ -120,6 +142,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=True,
             watch_theme=False,
+            watch_polling=False,
             watch=(),
         )
 
@@ -140,6 +163,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=False,
             watch_theme=False,
+            watch_polling=False,
             watch=(),
         )
 
@@ -158,6 +182,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             watch_theme=False,
+            watch_polling=False,
             watch=(),
         )
 
@@ -176,6 +201,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             watch_theme=False,
+            watch_polling=False,
             watch=(),
         )
 
@@ -194,6 +220,7 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             watch_theme=False,
+            watch_polling=False,
             watch=(),
         )
 
@@ -212,6 +239,26 @@ class CLITests(unittest.TestCase):
             theme=None,
             use_directory_urls=None,
             watch_theme=True,
+            watch_polling=False,
+            watch=(),
+        )
+
+    @mock.patch('mkdocs.commands.serve.serve', autospec=True)
+    def test_serve_watch_polling(self, mock_serve):
+        result = self.runner.invoke(cli.cli, ["serve", '--watch-polling'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        mock_serve.assert_called_once_with(
+            dev_addr=None,
+            open_in_browser=False,
+            livereload=True,
+            build_type=None,
+            config_file=None,
+            strict=None,
+            theme=None,
+            use_directory_urls=None,
+            watch_theme=False,
+            watch_polling=True,
             watch=(),
         )
 
@@ -257,6 +304,93 @@ class CLITests(unittest.TestCase):
         self.assertTrue('dirty' in kwargs)
         self.assertTrue(kwargs['dirty'])
 
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_jobs(self, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build', '--jobs', '4'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertEqual(kwargs['jobs'], 4)
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    @mock.patch('os.cpu_count', return_value=3)
+    def test_build_jobs_auto(self, mock_cpu_count, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build', '-j', '0'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertEqual(kwargs['jobs'], 3)
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.get_render_cache', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_render_cache(self, mock_build, mock_get_render_cache, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build'], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0)
+        args, kwargs = mock_build.call_args
+        self.assertIsNone(kwargs['render_cache'])
+
+        result = self.runner.invoke(cli.cli, ['build', '--render-cache'], catch_exceptions=False)
+        self.assertEqual(result.exit_code, 0)
+        mock_get_render_cache.assert_called_once_with(mock_load_config.return_value)
+        args, kwargs = mock_build.call_args
+        self.assertIs(kwargs['render_cache'], mock_get_render_cache.return_value)
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_sync(self, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build', '--sync'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        args, kwargs = mock_build.call_args
+        self.assertTrue(kwargs['sync'])
+        self.assertFalse(kwargs['dirty'])
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_sync_dirty(self, mock_build, mock_load_config):
+        result = self.runner.invoke(cli.cli, ['build', '--sync', '--dirty'], catch_exceptions=False)
+
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("--sync can't be combined with --dirty.", result.output)
+        self.assertEqual(mock_build.call_count, 0)
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.daemon.build_via_daemon', autospec=True)
+    def test_build_daemon(self, mock_build_via_daemon, mock_load_config):
+        result = self.runner.invoke(
+            cli.cli, ['build', '--daemon', 'mkdocs.sock', '--strict'], catch_exceptions=False
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_load_config.call_count, 0)
+        mock_build_via_daemon.assert_called_once_with(
+            'mkdocs.sock',
+            clean=True,
+            jobs=1,
+            render_cache=False,
+            sync=False,
+            config_file=None,
+            strict=True,
+            theme=None,
+            use_directory_urls=None,
+            site_dir=None,
+        )
+
+    @mock.patch('mkdocs.commands.daemon.daemon', autospec=True)
+    def test_daemon(self, mock_daemon):
+        result = self.runner.invoke(
+            cli.cli, ['daemon', '--socket', 'mkdocs.sock'], catch_exceptions=False
+        )
+
+        self.assertEqual(result.exit_code, 0)
+        mock_daemon.assert_called_once_with('mkdocs.sock')
+
     @mock.patch('mkdocs.config.load_config', autospec=True)
     @mock.patch('mkdocs.commands.build.build', autospec=True)
     def test_build_config_file(self, mock_build, mock_load_config):
@@ -272,6 +406,91 @@ class CLITests(unittest.TestCase):
         self.assertIsInstance(kwargs['config_file'], io.BufferedReader)
         self.assertEqual(kwargs['config_file'].name, 'mkdocs.yml')
 
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_multiple_config_files(self, mock_build, mock_load_config):
+        def build_sites(builders, processes):
+            for builder in builders:
+                builder()
+
+        def load_config(config_file, **kwargs):
+            kwargs = {key: value for key, value in kwargs.items() if value is not None}
+            if config_file.name == 'b.yml':
+                kwargs['markdown_extensions'] = [{'toc': {'permalink': True}}]
+            return base.load_config(config_file_path=config_file.name, **kwargs)
+
+        mock_load_config.side_effect = load_config
+        with self.runner.isolated_filesystem(), mock.patch(
+            'mkdocs.commands.build.build_sites', side_effect=build_sites
+        ) as m:
+            for name in 'a.yml', 'b.yml', 'c.yml':
+                with open(name, 'w') as f:
+                    f.write('site_name: x')
+            result = self.runner.invoke(
+                cli.cli,
+                ['build', '-f', 'a.yml', '-f', 'b.yml', '-f', 'c.yml', '-j', '4'],
+                catch_exceptions=False,
+            )
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(m.call_count, 1)
+        self.assertEqual(m.call_args.kwargs['processes'], 2)
+        self.assertEqual(mock_build.call_count, 3)
+        # The sites with the same Markdown config are built together, sharing the render cache.
+        calls = {args[0].config_file_path: kwargs for args, kwargs in mock_build.call_args_list}
+        self.assertEqual(list(calls), ['a.yml', 'c.yml', 'b.yml'])
+        self.assertIsInstance(calls['a.yml']['render_cache'], ContentCache)
+        self.assertIs(calls['a.yml']['render_cache'], calls['c.yml']['render_cache'])
+        self.assertIsNone(calls['b.yml']['render_cache'])
+        # The jobs are divided between the concurrent builds.
+        self.assertEqual({kwargs['jobs'] for kwargs in calls.values()}, {2})
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_multiple_config_files_profiled(self, mock_build, mock_load_config):
+        with self.runner.isolated_filesystem(), mock.patch(
+            'mkdocs.commands.build.build_sites', autospec=True
+        ) as mock_build_sites:
+            for name in 'a.yml', 'b.yml':
+                with open(name, 'w') as f:
+                    f.write('site_name: x')
+            result = self.runner.invoke(
+                cli.cli,
+                ['build', '-f', 'a.yml', '-f', 'b.yml', '--profile-json', 'profile.json'],
+                catch_exceptions=False,
+            )
+
+        self.assertEqual(result.exit_code, 0)
+        # A profile covers one process, so the sites are built in turn, sharing the cache.
+        self.assertEqual(mock_build_sites.call_count, 0)
+        self.assertEqual(mock_build.call_count, 2)
+        caches = [kwargs['render_cache'] for args, kwargs in mock_build.call_args_list]
+        self.assertIsInstance(caches[0], ContentCache)
+        self.assertIs(caches[0], caches[1])
+
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    def test_build_profile(self, mock_build, mock_load_config):
+        with self.runner.isolated_filesystem():
+            result = self.runner.invoke(
+                cli.cli, ['build', '--profile-json', 'profile.json'], catch_exceptions=False
+            )
+            with open('profile.json', encoding='utf-8') as f:
+                profile = json.load(f)
+
+        self.assertEqual(result.exit_code, 0)
+        self.assertEqual(mock_build.call_count, 1)
+        self.assertEqual(list(profile['phases']), ['config'])
+        self.assertEqual(profile['phases']['config']['calls'], 1)
+
+    @mock.patch('mkdocs.commands.daemon.build_via_daemon', autospec=True)
+    def test_build_profile_daemon(self, mock_build_via_daemon):
+        result = self.runner.invoke(cli.cli, ['build', '--daemon', 'mkdocs.sock', '--profile'])
+
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn("Profiling isn't supported with --daemon.", result.output)
+        self.assertEqual(mock_build_via_daemon.call_count, 0)
+
     @mock.patch('mkdocs.config.load_config', autospec=True)
     @mock.patch('mkdocs.commands.build.build', autospec=True)
     def test_build_strict(self, mock_build, mock_load_config):
@@ -437,6 +656,18 @@ class CLITests(unittest.TestCase):
         self.assertTrue('dirty' in kwargs)
         self.assertTrue(kwargs['dirty'])
 
+    @mock.patch('mkdocs.config.load_config', autospec=True)
+    @mock.patch('mkdocs.commands.build.build', autospec=True)
+    @mock.patch('mkdocs.commands.gh_deploy.gh_deploy', autospec=True)
+    def test_gh_deploy_sync_dirty(self, mock_gh_deploy, mock_build, mock_load_config):
+        result = self.runner.invoke(
+            cli.cli, ['gh-deploy', '--sync', '--dirty'], catch_exceptions=False
+        )
+
+        self.assertEqual(result.exit_code, 2)
+        self.assertEqual(mock_build.call_count, 0)
+        self.assertEqual(mock_gh_deploy.call_count, 0)
+
     @mock.patch('mkdocs.config.load_config', autospec=True)
     @mock.patch('mkdocs.commands.build.build', autospec=True)
     @mock.patch('mkdocs.commands.gh_deploy.gh_deploy', autospec=True)
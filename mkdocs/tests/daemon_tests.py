@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+import contextlib
+import os
+import socket
+import stat
+import threading
+import unittest
+from unittest import mock
+
+from mkdocs.commands import daemon
+from mkdocs.exceptions import Abort
+from mkdocs.tests.base import tempdir
+
+
+@contextlib.contextmanager
+def running_daemon(socket_path):
+    server = daemon._DaemonServer(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        thread.join()
+        server.server_close()
+
+
+@unittest.skipUnless(hasattr(socket, 'AF_UNIX'), "Unix domain sockets are not available")
+class DaemonTests(unittest.TestCase):
+    @tempdir(
+        files={
+            'mkdocs.yml': 'site_name: Test\nstrict: !ENV [STRICT, false]\n',
+            'docs/index.md': '# Hello\n',
+        }
+    )
+    def test_build_via_daemon(self, tdir):
+        socket_path = os.path.join(tdir, 'mkdocs.sock')
+        config_path = os.path.join(tdir, 'mkdocs.yml')
+        index_path = os.path.join(tdir, 'site', 'index.html')
+
+        with running_daemon(socket_path) as server:
+            # Only the user running the daemon can connect to it.
+            self.assertEqual(stat.S_IMODE(os.stat(socket_path).st_mode) & 0o077, 0)
+
+            with self.assertLogs('mkdocs') as cm:
+                daemon.build_via_daemon(socket_path, config_file=open(config_path, 'rb'))
+            self.assertIn(
+                "INFO:mkdocs.commands.build:Building documentation to directory: ",
+                '\n'.join(cm.output),
+            )
+            with open(index_path, encoding='utf-8') as f:
+                self.assertIn('<h1 id="hello">Hello</h1>', f.read())
+
+            # A second build of the same site reuses its config and render cache.
+            with open(os.path.join(tdir, 'docs', 'index.md'), 'w', encoding='utf-8') as f:
+                f.write('# Hello\n\n[Missing](missing.md)\n')
+            with mock.patch.object(daemon.config, 'load_config') as load_config:
+                with self.assertLogs('mkdocs') as cm:
+                    daemon.build_via_daemon(socket_path, config_file=open(config_path, 'rb'))
+            load_config.assert_not_called()
+            self.assertIn("'missing.md'", '\n'.join(cm.output))
+            self.assertEqual(len(server.render_caches), 1)
+            self.assertEqual(list(server.configs), [config_path])
+            # The changes of the `config` events were undone, so they aren't applied twice.
+            theme_dirs = server.configs[config_path].config.theme.dirs
+            self.assertEqual(len(theme_dirs), len(set(theme_dirs)))
+
+            # The environment of the client is used, so this build becomes strict and fails.
+            os.environ['STRICT'] = 'true'
+            try:
+                # The client is in the same process here, so the count may include its own copies.
+                with self.assertLogs('mkdocs'):
+                    with self.assertRaisesRegex(Abort, r'Aborted with \d+ warnings in strict mode'):
+                        daemon.build_via_daemon(socket_path, config_file=open(config_path, 'rb'))
+            finally:
+                del os.environ['STRICT']
+
+    @tempdir(
+        files={
+            'a/mkdocs.yml': 'site_name: A\ndocs_dir: ../docs\n',
+            'b/mkdocs.yml': 'site_name: B\ndocs_dir: ../docs\n',
+            'docs/index.md': '# Hello\n',
+        }
+    )
+    def test_daemon_keeps_recent_sites(self, tdir):
+        socket_path = os.path.join(tdir, 'mkdocs.sock')
+        config_paths = [os.path.join(tdir, name, 'mkdocs.yml') for name in ('a', 'b')]
+
+        with running_daemon(socket_path) as server, mock.patch.object(daemon, 'MAX_KEPT_SITES', 1):
+            for config_path in config_paths:
+                with self.assertLogs('mkdocs'):
+                    daemon.build_via_daemon(
+                        socket_path, config_file=open(config_path, 'rb'), render_cache=True
+                    )
+            self.assertEqual(list(server.configs), [config_paths[1]])
+            self.assertEqual(
+                [cache.directory for cache in server.render_caches.values()],
+                [os.path.join(tdir, 'b', '.cache', 'mkdocs', 'render')],
+            )
+
+    @tempdir(
+        files={
+            'base.yml': 'site_name: Base\n',
+            'mkdocs.yml': 'INHERIT: base.yml\n',
+            'docs/index.md': '# Hello\n',
+        }
+    )
+    def test_daemon_reloads_changed_inherited_config(self, tdir):
+        socket_path = os.path.join(tdir, 'mkdocs.sock')
+        config_path = os.path.join(tdir, 'mkdocs.yml')
+
+        with running_daemon(socket_path) as server:
+            with self.assertLogs('mkdocs'):
+                daemon.build_via_daemon(socket_path, config_file=open(config_path, 'rb'))
+            sources = server.configs[config_path].sources
+            self.assertEqual(sources, [config_path, os.path.join(tdir, 'base.yml')])
+
+            with open(os.path.join(tdir, 'base.yml'), 'w', encoding='utf-8') as f:
+                f.write('site_name: Other base\n')
+            with self.assertLogs('mkdocs'):
+                daemon.build_via_daemon(socket_path, config_file=open(config_path, 'rb'))
+            self.assertEqual(server.configs[config_path].config.site_name, 'Other base')
+
+    @tempdir(files={'mkdocs.yml': 'site_name: Test\n', 'docs/index.md': '# Hello\n'})
+    def test_daemon_doesnt_keep_uncopyable_config(self, tdir):
+        socket_path = os.path.join(tdir, 'mkdocs.sock')
+        config_path = os.path.join(tdir, 'mkdocs.yml')
+
+        with running_daemon(socket_path) as server:
+            with mock.patch.object(daemon, '_copy_values', side_effect=TypeError('uncopyable')):
+                with self.assertLogs('mkdocs'):
+                    daemon.build_via_daemon(socket_path, config_file=open(config_path, 'rb'))
+            self.assertEqual(server.configs, {})
+
+    @tempdir()
+    def test_daemon_not_running(self, tdir):
+        with self.assertRaisesRegex(Abort, r'Could not connect to the build daemon'):
+            daemon.build_via_daemon(os.path.join(tdir, 'mkdocs.sock'))
+
+    @tempdir()
+    def test_daemon_already_running(self, tdir):
+        socket_path = os.path.join(tdir, 'mkdocs.sock')
+        with running_daemon(socket_path):
+            with self.assertRaisesRegex(Abort, r'already listening'):
+                daemon.daemon(socket_path)
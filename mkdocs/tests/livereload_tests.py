@@ -2,7 +2,11 @@
 
 import contextlib
 import email
+import errno
+import gzip
 import io
+import os
+import socket
 import sys
 import threading
 import time
@@ -10,8 +14,13 @@ import unittest
 from pathlib import Path
 from unittest import mock
 
-from mkdocs.livereload import LiveReloadServer
+import watchdog.events
+from watchdog.observers.polling import PollingObserver
+
+from mkdocs import utils
+from mkdocs.livereload import LiveReloadServer, _Watch
 from mkdocs.tests.base import change_dir, tempdir
+from mkdocs.utils import MemorySite
 
 
 class FakeRequest:
@@ -28,7 +37,7 @@ class FakeRequest:
 
 
 @contextlib.contextmanager
-def testing_server(root, builder=lambda: None, mount_path="/"):
+def testing_server(root, builder=lambda: None, mount_path="/", site=None):
     """Create the server and start most of its parts, but don't listen on a socket."""
     with mock.patch("socket.socket"):
         server = LiveReloadServer(
@@ -38,6 +47,7 @@ def testing_server(root, builder=lambda: None, mount_path="/"):
             root=root,
             mount_path=mount_path,
             polling_interval=0.2,
+            site=site,
         )
         server.server_name = "localhost"
         server.server_port = 0
@@ -50,8 +60,9 @@ def testing_server(root, builder=lambda: None, mount_path="/"):
     thread.join()
 
 
-def do_request(server, content):
-    request = FakeRequest(content + " HTTP/1.1")
+def do_request(server, content, headers=None):
+    request_headers = "".join(f"\r\n{name}: {value}" for name, value in (headers or {}).items())
+    request = FakeRequest(content + " HTTP/1.1" + request_headers + "\r\n\r\n")
     server.RequestHandlerClass(request, ("127.0.0.1", 0), server)
     response = request.out_file.getvalue()
 
@@ -61,10 +72,13 @@ def do_request(server, content):
 
     headers = email.message_from_bytes(headers)
     headers["_status"] = status
+    if headers.get("content-encoding") == "gzip":
+        headers["_raw_length"] = str(len(content))
+        content = gzip.decompress(content)
     return headers, content.decode()
 
 
-SCRIPT_REGEX = r'<script>[\S\s]+?livereload\([0-9]+, [0-9]+\);\s*</script>'
+SCRIPT_REGEX = r'<script>[\S\s]+?livereload\([0-9]+, [0-9]+, "[^"]*"\);\s*</script>'
 
 
 class BuildTests(unittest.TestCase):
@@ -143,6 +157,31 @@ class BuildTests(unittest.TestCase):
             Path(site_dir, "aaa").rename(Path(site_dir, "bbb"))
             self.assertTrue(started_building.wait(timeout=10))
 
+    @tempdir({"sub/foo.docs": "a", "other/bar.docs": "b"})
+    def test_rebuild_after_directory_change(self, docs_dir):
+        started_building = threading.Event()
+
+        with testing_server(docs_dir, started_building.set) as server:
+            server.watch(docs_dir)
+            time.sleep(0.01)
+
+            Path(docs_dir, "sub").rename(Path(docs_dir, "renamed"))
+            self.assertTrue(started_building.wait(timeout=10))
+            self.assertTrue(server.changed_paths)
+
+    def test_directory_events(self):
+        callback = mock.Mock()
+        watch = _Watch(os.path.abspath("nonexistent"), True, callback)
+        events = [
+            watchdog.events.DirModifiedEvent("docs"),
+            watchdog.events.DirMovedEvent("docs/sub", "docs/renamed"),
+            watchdog.events.DirDeletedEvent("docs/other"),
+            watchdog.events.DirCreatedEvent("docs/new"),
+        ]
+        for event in events:
+            watch._on_event(event)
+        self.assertEqual([c.args[0] for c in callback.call_args_list], events[1:])
+
     @tempdir()
     def test_rebuild_on_edit(self, site_dir):
         started_building = threading.Event()
@@ -183,6 +222,67 @@ class BuildTests(unittest.TestCase):
             with self.assertRaises(KeyError):
                 server.unwatch(site_dir)
 
+    @tempdir({"foo.docs": "a", "bar.docs": "b", "baz.docs": "c"})
+    def test_changed_paths(self, docs_dir):
+        started_building = threading.Event()
+        changed_paths = []
+
+        def rebuild():
+            changed_paths.append(server.changed_paths)
+            started_building.set()
+
+        with testing_server(docs_dir, rebuild) as server:
+            server.watch(docs_dir)
+            time.sleep(0.01)
+
+            Path(docs_dir, "foo.docs").write_text("edited")
+            Path(docs_dir, "bar.docs").rename(Path(docs_dir, "qux.docs"))
+            self.assertTrue(started_building.wait(timeout=10))
+            started_building.clear()
+            self.assertEqual(
+                changed_paths.pop(),
+                {str(Path(docs_dir, name)) for name in ("foo.docs", "bar.docs", "qux.docs")},
+            )
+
+            Path(docs_dir, "baz.docs").write_text("edited")
+            self.assertTrue(started_building.wait(timeout=10))
+            self.assertEqual(changed_paths.pop(), {str(Path(docs_dir, "baz.docs"))})
+
+    @tempdir({"mkdocs.yml": "original", "other.md": "other"})
+    def test_rebuild_after_file_replaced(self, origin_dir):
+        started_building = threading.Event()
+
+        with testing_server(origin_dir, started_building.set) as server:
+            server.watch(Path(origin_dir, "mkdocs.yml"))
+            time.sleep(0.01)
+
+            Path(origin_dir, "mkdocs.yml").read_text()
+            Path(origin_dir, "other.md").write_text("edited")
+            self.assertFalse(started_building.wait(timeout=0.5))
+
+            for content in "edited", "edited again":
+                Path(origin_dir, "mkdocs.yml.tmp").write_text(content)
+                Path(origin_dir, "mkdocs.yml.tmp").replace(Path(origin_dir, "mkdocs.yml"))
+                self.assertTrue(started_building.wait(timeout=10))
+                started_building.clear()
+
+    @tempdir()
+    def test_falls_back_to_polling(self, site_dir):
+        started_building = threading.Event()
+
+        with testing_server(site_dir, started_building.set) as server:
+            error = OSError(errno.ENOSPC, "inotify watch limit reached")
+            with mock.patch.object(server.observer, "schedule", side_effect=error):
+                with self.assertLogs("mkdocs.livereload") as cm:
+                    server.watch(site_dir)
+            self.assertRegex(cm.output[0], "falling back to polling")
+            self.assertIsInstance(server.observer, PollingObserver)
+            self.assertTrue(server.observer.is_alive())
+            time.sleep(0.01)
+
+            Path(site_dir, "foo").write_text("foo")
+            self.assertTrue(started_building.wait(timeout=10))
+
     @tempdir({"foo.docs": "docs1"})
     @tempdir({"foo.extra": "extra1"})
     @tempdir({"foo.site": "original"})
@@ -332,6 +432,145 @@ class BuildTests(unittest.TestCase):
             _, output = do_request(server, "GET /multi_body.html")
             self.assertRegex(output, fr"^<body>foo</body><body>bar{SCRIPT_REGEX}</body>$")
 
+    @tempdir({"on_disk.txt": "disk"})
+    def test_serves_from_memory(self, site_dir):
+        site = MemorySite(site_dir)
+        site.write(os.path.join(site_dir, "foo", "index.html"), b"<html><body>hi</body></html>")
+        site.write(os.path.join(site_dir, "no_body.html"), b"<p>hi")
+        site.write(os.path.join(site_dir, "test.css"), b"div { color: red; }")
+        with testing_server(site_dir, site=site) as server:
+            server.watch(site_dir)
+
+            headers, output = do_request(server, "GET /foo/")
+            self.assertRegex(output, fr"^<html><body>hi{SCRIPT_REGEX}</body></html>$")
+            self.assertEqual(headers.get("content-type"), "text/html")
+            self.assertEqual(headers.get("content-length"), str(len(output)))
+
+            _, output = do_request(server, "GET /no_body.html")
+            self.assertRegex(output, fr"^<p>hi{SCRIPT_REGEX}$")
+
+            headers, output = do_request(server, "GET /test.css")
+            self.assertEqual(output, "div { color: red; }")
+            self.assertEqual(headers.get("content-length"), str(len(output)))
+
+            _, output = do_request(server, "GET /on_disk.txt")
+            self.assertEqual(output, "disk")
+
+            with self.assertLogs("mkdocs.livereload"):
+                headers, _ = do_request(server, "GET /foo")
+            self.assertEqual(headers["_status"], "302 Found")
+            self.assertEqual(headers.get("location"), "/foo/")
+
+    @tempdir({"test.css": "div { color: red; }"})
+    def test_serves_not_modified(self, site_dir):
+        with testing_server(site_dir) as server:
+            headers, output = do_request(server, "GET /test.css")
+            self.assertEqual(headers["_status"], "200 OK")
+            self.assertEqual(headers.get("cache-control"), "no-cache")
+            etag, last_modified = headers.get("etag"), headers.get("last-modified")
+            self.assertRegex(etag, r'^"[0-9a-f-]+"$')
+
+            for request_headers in (
+                {"If-None-Match": etag},
+                {"If-None-Match": f'"foo", W/{etag}'},
+                {"If-Modified-Since": last_modified},
+            ):
+                with self.subTest(request_headers):
+                    headers, output = do_request(server, "GET /test.css", request_headers)
+                    self.assertEqual(headers["_status"], "304 Not Modified")
+                    self.assertEqual(headers.get("etag"), etag)
+                    self.assertEqual(output, "")
+
+            for request_headers in (
+                {"If-None-Match": '"foo"'},
+                {"If-None-Match": '"foo"', "If-Modified-Since": last_modified},
+                {"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"},
+            ):
+                with self.subTest(request_headers):
+                    headers, output = do_request(server, "GET /test.css", request_headers)
+                    self.assertEqual(headers["_status"], "200 OK")
+                    self.assertEqual(output, "div { color: red; }")
+
+    @tempdir()
+    @tempdir()
+    def test_serves_html_not_modified_within_epoch(self, site_dir, docs_dir):
+        site = MemorySite(site_dir)
+        site.write(os.path.join(site_dir, "index.html"), b"<body>aaa</body>")
+        with testing_server(site_dir, site=site) as server:
+            server.watch(docs_dir)
+            headers, _ = do_request(server, "GET /")
+            etag = headers.get("etag")
+            self.assertIsNone(headers.get("last-modified"))
+
+            headers, _ = do_request(server, "GET /", {"If-None-Match": etag})
+            self.assertEqual(headers["_status"], "304 Not Modified")
+
+            # The page embeds the epoch, so it has to be served again after a rebuild.
+            initial_epoch = server._visible_epoch
+            Path(docs_dir, "foo.docs").write_text("b")
+            do_request(server, f"GET /livereload/{initial_epoch}/0")
+            headers, output = do_request(server, "GET /", {"If-None-Match": etag})
+            self.assertEqual(headers["_status"], "200 OK")
+            self.assertNotEqual(headers.get("etag"), etag)
+            self.assertRegex(output, fr"^<body>aaa{SCRIPT_REGEX}</body>$")
+
+    @tempdir({"disk.js": "var a = 1;\n" * 200, "small.css": "div {}", "image.png": "x" * 2000})
+    def test_serves_gzip(self, site_dir):
+        site = MemorySite(site_dir)
+        site.write(os.path.join(site_dir, "memory.css"), b"div { color: red; }\n" * 200)
+        site.write(os.path.join(site_dir, "page.html"), b"<body>" + b"<p>a</p>" * 200 + b"</body>")
+        with testing_server(site_dir, site=site) as server:
+            server.watch(site_dir)
+            for path, expected in (
+                ("/disk.js", "var a = 1;\n" * 200),
+                ("/memory.css", "div { color: red; }\n" * 200),
+            ):
+                with self.subTest(path):
+                    plain_headers, _ = do_request(server, f"GET {path}")
+                    self.assertIsNone(plain_headers.get("content-encoding"))
+                    self.assertEqual(plain_headers.get("vary"), "Accept-Encoding")
+
+                    headers, output = do_request(
+                        server, f"GET {path}", {"Accept-Encoding": "deflate, gzip"}
+                    )
+                    self.assertEqual(headers.get("content-encoding"), "gzip")
+                    self.assertEqual(output, expected)
+                    self.assertEqual(headers.get("content-length"), headers["_raw_length"])
+                    self.assertLess(int(headers["_raw_length"]), len(expected))
+                    self.assertNotEqual(headers.get("etag"), plain_headers.get("etag"))
+
+            headers, output = do_request(server, "GET /page.html", {"Accept-Encoding": "gzip"})
+            self.assertEqual(headers.get("content-encoding"), "gzip")
+            self.assertRegex(output, fr"^<body>(<p>a</p>)+{SCRIPT_REGEX}</body>$")
+
+            for path, accept in (
+                ("/small.css", "gzip"),
+                ("/image.png", "gzip"),
+                ("/disk.js", "gzip;q=0, deflate"),
+            ):
+                with self.subTest(path=path, accept=accept):
+                    headers, _ = do_request(server, f"GET {path}", {"Accept-Encoding": accept})
+                    self.assertIsNone(headers.get("content-encoding"))
+
+    @tempdir({"a.js": "var a = 1;\n" * 200, "b.js": "var b = 2;\n" * 200})
+    def test_gzip_cache_is_bounded(self, site_dir):
+        with testing_server(site_dir) as server:
+            sizes = {}
+            for name in "a.js", "b.js":
+                headers, _ = do_request(server, f"GET /{name}", {"Accept-Encoding": "gzip"})
+                sizes[name] = int(headers["_raw_length"])
+            self.assertEqual(server._gzip_cache_size, sum(sizes.values()))
+
+            limit = sum(sizes.values()) - 1
+            with mock.patch("mkdocs.livereload._GZIP_CACHE_SIZE", limit):
+                Path(site_dir, "a.js").write_text("var a = 33;\n" * 200)
+                do_request(server, "GET /a.js", {"Accept-Encoding": "gzip"})
+            # The old version of the changed file was replaced, and the least recently served
+            # file was dropped to make room.
+            a_path = os.path.join(site_dir, "a.js")
+            self.assertEqual(list(server._gzip_cache), [a_path])
+            self.assertEqual(server._gzip_cache_size, len(server._gzip_cache[a_path][1]))
+
     @tempdir({"index.html": "<body>aaa</body>", "foo/index.html": "<body>bbb</body>"})
     def test_serves_directory_index(self, site_dir):
         with testing_server(site_dir) as server:
@@ -417,6 +656,93 @@ class BuildTests(unittest.TestCase):
             self.assertNotEqual(server._visible_epoch, initial_epoch)
             self.assertEqual(output, str(server._visible_epoch))
 
+    @tempdir()
+    @tempdir()
+    def test_event_stream(self, site_dir, docs_dir):
+        def connect(epoch, request_id):
+            client, conn = socket.socketpair()
+            client.settimeout(10)
+            client.sendall(f"GET /livereload/events/{epoch}/{request_id} HTTP/1.1\r\n\r\n".encode())
+            with self.assertLogs("mkdocs.livereload") as cm:
+                server.RequestHandlerClass(conn, ("127.0.0.1", 0), server)
+                server.shutdown_request(conn)
+            self.assertRegex(cm.output[0], r"Browser connected")
+            return client
+
+        def read_until(client, end):
+            data = b""
+            while not data.endswith(end):
+                data += client.recv(1024)
+            return data.decode()
+
+        with testing_server(site_dir) as server:
+            initial_epoch = server._visible_epoch
+            server.watch(docs_dir)
+
+            with connect(initial_epoch, 1) as client, connect(0, 2) as outdated_client:
+                output = read_until(client, b"retry: 3000\n\n")
+                self.assertRegex(output, r"^HTTP/1.1 200 OK\r\n")
+                self.assertIn("Content-Type: text/event-stream\r\n", output)
+                # A browser that has an older version of the site is notified right away.
+                output = read_until(outdated_client, f"data: {initial_epoch}\n\n".encode())
+                self.assertIn("\r\n\r\nretry: 3000\n\ndata: ", output)
+                self.assertEqual(len(server._event_stream), 2)
+
+                Path(docs_dir, "foo.docs").write_text("b")
+
+                for c in client, outdated_client:
+                    output = read_until(c, b"\n\n")
+                    self.assertNotEqual(server._visible_epoch, initial_epoch)
+                    self.assertEqual(output, f"data: {server._visible_epoch}\n\n")
+
+            for _ in range(100):
+                if not len(server._event_stream):
+                    break
+                server._event_stream.publish()
+                time.sleep(0.01)
+            self.assertEqual(len(server._event_stream), 0)
+
+    @tempdir()
+    @tempdir()
+    def test_reloads_only_changed_pages(self, site_dir, docs_dir):
+        site = MemorySite(site_dir)
+        outputs = {"a.html": b"<body>a</body>", "b/index.html": b"<body>b</body>", "s.css": b""}
+
+        def rebuild():
+            utils.write_to_memory(site)
+            try:
+                for name, content in outputs.items():
+                    utils.write_file(content, os.path.join(site_dir, name))
+            finally:
+                utils.write_to_memory(None)
+
+        rebuild()
+        with testing_server(site_dir, rebuild, site=site) as server:
+            server.poll_response_timeout = 0.2
+            server.watch(docs_dir)
+
+            def poll(epoch, page):
+                _, output = do_request(server, f"GET /livereload/{epoch}/0?page={page}")
+                return int(output)
+
+            initial_epoch = server._visible_epoch
+            _, output = do_request(server, "GET /b/")
+            self.assertIn(', "b/index.html");', output)
+
+            outputs["a.html"] = b"<body>a2</body>"
+            Path(docs_dir, "foo.docs").write_text("a")
+            self.assertGreater(poll(initial_epoch, "a.html"), initial_epoch)
+            self.assertEqual(poll(initial_epoch, "b/index.html"), initial_epoch)
+            # Browsers that don't tell their page reload anyway.
+            self.assertEqual(poll(initial_epoch, ""), server._visible_epoch)
+
+            # Other files may affect all pages.
+            outputs["s.css"] = b"div {}"
+            second_epoch = server._visible_epoch
+            Path(docs_dir, "foo.docs").write_text("b")
+            self.assertGreater(poll(second_epoch, "a.html"), second_epoch)
+            self.assertGreater(poll(initial_epoch, "b/index.html"), second_epoch)
+
     @tempdir()
     def test_serves_polling_with_timeout(self, site_dir):
         with testing_server(site_dir) as server:
@@ -603,6 +929,33 @@ class BuildTests(unittest.TestCase):
             Path(origin_dir, "README.md").write_text("edited")
             self.assertTrue(started_building.wait(timeout=10))
 
+    @tempdir(["file_dest.md"], prefix="tmp_dir")
+    @tempdir(["a/sub/foo.md", "b/sub/bar.md"])
+    def test_rescans_only_changed_paths_for_symlinks(self, docs_dir, tmp_dir):
+        with mock.patch("socket.socket"):
+            # The observer isn't started, so the rescans are only the ones made here.
+            server = LiveReloadServer(lambda: None, host="localhost", port=0, root=docs_dir)
+        server.watch(docs_dir)
+        if server._polling:
+            self.skipTest("Native file change notifications are not available")
+        try:
+            Path(docs_dir, "a", "sub", "link.md").symlink_to(Path(tmp_dir, "file_dest.md"))
+        except NotImplementedError:  # PyPy on Windows
+            self.skipTest("Creating symlinks not supported")
+
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            server._refresh_symlink_watches([os.path.join(docs_dir, "a")])
+        scanned = [call.args[0] for call in scandir.call_args_list]
+        self.assertIn(os.path.join(docs_dir, "a", "sub"), scanned)
+        self.assertTrue(all(path.startswith(os.path.join(docs_dir, "a")) for path in scanned))
+        self.assertEqual(
+            list(server._symlink_watches), [os.path.realpath(Path(tmp_dir, "file_dest.md"))]
+        )
+
+        Path(docs_dir, "a", "sub", "link.md").unlink()
+        server._refresh_symlink_watches([os.path.join(docs_dir, "a", "sub", "link.md")])
+        self.assertEqual(server._symlink_watches, {})
+
     @tempdir()
     def test_watch_with_broken_symlinks(self, docs_dir):
         Path(docs_dir, "subdir").mkdir()
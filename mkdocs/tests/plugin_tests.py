@@ -21,7 +21,10 @@ from mkdocs.config import base
 from mkdocs.config import config_options as c
 from mkdocs.config.base import ValidationError
 from mkdocs.exceptions import Abort, BuildError, PluginError
+from mkdocs.structure.files import File
+from mkdocs.structure.pages import Page
 from mkdocs.tests.base import load_config, tempdir
+from mkdocs.utils import profiling
 
 
 class _DummyPluginConfig(base.Config):
@@ -202,6 +205,24 @@ class TestPluginCollection(unittest.TestCase):
         )
         self.assertEqual(list(collection.items()), [('foo', plugin1), ('bar', plugin2)])
 
+    def test_memory_safe(self):
+        class PostBuildPlugin(plugins.BasePlugin):
+            def on_post_build(self, **kwargs) -> None:
+                pass
+
+        class MemorySafePlugin(PostBuildPlugin):
+            memory_safe = True
+
+        collection = plugins.PluginCollection()
+        self.assertTrue(collection._memory_safe())
+        # Plugins that don't handle `post_build` can't read the built site.
+        collection['dummy'] = DummyPlugin()
+        self.assertTrue(collection._memory_safe())
+        collection['safe'] = MemorySafePlugin()
+        self.assertTrue(collection._memory_safe())
+        collection['unsafe'] = PostBuildPlugin()
+        self.assertFalse(collection._memory_safe())
+
     def test_run_event_on_collection(self):
         collection = plugins.PluginCollection()
         plugin = DummyPlugin()
@@ -230,6 +251,71 @@ class TestPluginCollection(unittest.TestCase):
             'second new page content',
         )
 
+    def test_run_event_profiled(self):
+        collection = plugins.PluginCollection()
+        plugin1 = DummyPlugin()
+        plugin1.load_config({'foo': 'new'})
+        collection['foo'] = plugin1
+        plugin2 = DummyPlugin()
+        plugin2.load_config({'foo': 'second'})
+        with self.assertLogs('mkdocs', level='WARNING'):
+            collection['bar'] = plugin2
+        page = Page('Foo', File('foo.md', '/docs', '/site', True), load_config())
+
+        profile = profiling.BuildProfile(trace=True)
+        with profiling.recording(profile):
+            for _ in range(2):
+                collection.on_page_content('page content', page=page, config={}, files=[])
+            collection.on_pre_build(config={})
+
+        self.assertEqual(profile.events['on_page_content'].calls, 2)
+        self.assertEqual(
+            {key: timing.calls for key, timing in profile.plugin_events.items()},
+            {
+                ('foo', 'on_page_content'): 2,
+                ('bar', 'on_page_content'): 2,
+                ('foo', 'on_pre_build'): 1,
+                ('bar', 'on_pre_build'): 1,
+            },
+        )
+        trace = profile.to_chrome_trace()['traceEvents']
+        self.assertEqual(
+            [(e['cat'], e['name'], e.get('args')) for e in trace[:3]],
+            [
+                ('plugin', 'foo: on_page_content', {'page': 'foo.md'}),
+                ('plugin', 'bar: on_page_content', {'page': 'foo.md'}),
+                ('event', 'on_page_content', None),
+            ],
+        )
+        self.assertIn('  foo: on_page_content ', profile.format_table())
+
+        # Only the latest trace events are kept.
+        profile = profiling.BuildProfile(trace=True, max_trace_events=2)
+        with profiling.recording(profile):
+            collection.on_pre_build(config={})
+        self.assertEqual(
+            [e['name'] for e in profile.to_chrome_trace()['traceEvents']],
+            ['bar: on_pre_build', 'on_pre_build'],
+        )
+
+    def test_merge_profile(self):
+        collection = plugins.PluginCollection()
+        collection['foo'] = DummyPlugin()
+        profile = profiling.BuildProfile(trace=True)
+        with profiling.recording(profile):
+            collection.on_pre_build(config={})
+            with profiling.recording_in_worker() as worker_profile:
+                collection.on_pre_build(config={})
+            self.assertIsNotNone(worker_profile)
+            self.assertEqual(profile.plugin_events[('foo', 'on_pre_build')].calls, 1)
+            profiling.merge(worker_profile)
+
+        self.assertEqual(profile.events['on_pre_build'].calls, 2)
+        self.assertEqual(profile.plugin_events[('foo', 'on_pre_build')].calls, 2)
+        self.assertEqual(len(profile.to_chrome_trace()['traceEvents']), 4)
+        with profiling.recording_in_worker() as worker_profile:
+            self.assertIsNone(worker_profile)
+
     def test_event_returns_None(self):
         collection = plugins.PluginCollection()
         plugin = DummyPlugin()
@@ -3,7 +3,14 @@ import sys
 import unittest
 from unittest import mock
 
-from mkdocs.structure.files import File, Files, _sort_files, file_sort_key, get_files
+from mkdocs.structure.files import (
+    File,
+    Files,
+    InclusionLevel,
+    _sort_files,
+    file_sort_key,
+    get_files,
+)
 from mkdocs.tests.base import PathAssertionMixin, load_config, tempdir
 
 
@@ -340,6 +347,7 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         self.assertEqual(files.get_file_from_path('foo/bar.jpg'), fs[3])
         self.assertEqual(files.get_file_from_path('foo/bar.jpg'), fs[3])
         self.assertEqual(files.get_file_from_path('missing.jpg'), None)
+        self.assertEqual(files.get_file_from_path('foo/./bar.jpg'), fs[3])
         self.assertTrue(fs[2].src_uri in files.src_uris)
         extra_file = File('extra.md', '/path/to/docs', '/path/to/site', use_directory_urls=True)
         self.assertFalse(extra_file.src_uri in files.src_uris)
@@ -602,6 +610,57 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
             ['.dotfile', 'templates/foo.html'],
         )
 
+    @tempdir(
+        files=[
+            'index.md',
+            'a/index.md',
+            'a/b.md',
+            'a/c/d.md',
+            'drafts/a.md',
+            'drafts/b/c.md',
+            'drafts/keep.md',
+            'z.md',
+        ]
+    )
+    def test_get_files_excluded_dir(self, tdir):
+        for exclude_docs, expected_excluded in (
+            ('drafts/', ['drafts/a.md', 'drafts/keep.md', 'drafts/b/c.md']),
+            ('drafts/\n!drafts/keep.md', ['drafts/a.md', 'drafts/b/c.md']),
+            ('/a/c/\nb/', ['a/c/d.md', 'drafts/b/c.md']),
+        ):
+            with self.subTest(exclude_docs=exclude_docs):
+                config = load_config(docs_dir=tdir, exclude_docs=exclude_docs)
+                files = get_files(config)
+                self.assertEqual(
+                    [f.src_uri for f in files],
+                    [
+                        'index.md',
+                        'z.md',
+                        'a/index.md',
+                        'a/b.md',
+                        'a/c/d.md',
+                        'drafts/a.md',
+                        'drafts/keep.md',
+                        'drafts/b/c.md',
+                    ],
+                )
+                self.assertEqual(
+                    [f.src_uri for f in files if f.inclusion.is_excluded()], expected_excluded
+                )
+
+    def test_src_path_normalization(self):
+        for path, expected in (
+            ('foo/bar.md', 'foo/bar.md'),
+            ('./foo/bar.md', 'foo/bar.md'),
+            ('foo//bar.md', 'foo/bar.md'),
+            ('foo/./bar.md', 'foo/bar.md'),
+            ('.foo/bar.md', '.foo/bar.md'),
+            (os.path.join('foo', 'bar.md'), 'foo/bar.md'),
+        ):
+            with self.subTest(path):
+                file = File(path, '/path/to/docs', '/path/to/site', use_directory_urls=False)
+                self.assertEqual(file.src_uri, expected)
+
     @tempdir(
         files=[
             'README.md',
@@ -744,3 +803,89 @@ class TestFiles(PathAssertionMixin, unittest.TestCase):
         self.assertEqual(len(files), 2)
         self.assertEqual(list(files)[0].src_uri, 'b.jpg')
         self.assertEqual(list(files)[1].src_uri, 'a.md')
+
+    def test_files_kinds_follow_append_remove(self):
+        fs = [
+            File('a.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+            File('b.js', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+            File('c.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+        ]
+        files = Files(fs)
+        with self.assertWarns(DeprecationWarning):
+            files.append(fs[0])
+        self.assertEqual(files.documentation_pages(), [fs[2], fs[0]])
+        files.remove(fs[1])
+        self.assertEqual(files.media_files(), [])
+        self.assertEqual(files.javascript_files(), [])
+        fs[2].inclusion = InclusionLevel.EXCLUDED
+        self.assertEqual(files.documentation_pages(), [fs[0]])
+        self.assertEqual(files.documentation_pages(inclusion=InclusionLevel.all), [fs[2], fs[0]])
+
+    def test_files_kinds_from_file_subclass(self):
+        class NotebookFile(File):
+            def is_documentation_page(self):
+                return self.src_uri.endswith('.ipynb') or super().is_documentation_page()
+
+        f = NotebookFile('a.ipynb', '/path/to/docs', '/path/to/site', use_directory_urls=True)
+        self.assertFalse(f.is_media_file())
+        files = Files([f])
+        self.assertEqual(files.documentation_pages(inclusion=InclusionLevel.all), [f])
+        self.assertEqual(files.media_files(), [])
+
+    def test_file_is_compact(self):
+        f = File('foo/bar.md', '/path/to/docs', '/path/to/site', use_directory_urls=True)
+        self.assertEqual(f.abs_dest_path, os.path.normpath('/path/to/site/foo/bar/index.html'))
+        self.assertEqual(vars(f), {})
+        f.edit_uri = None
+        self.assertEqual(vars(f), {'edit_uri': None})
+
+    def test_file_attribute_defaults(self):
+        self.assertIs(File.inclusion, InclusionLevel.UNDEFINED)
+        self.assertIsNone(File.generated_by)
+        self.assertIsNone(File.page)
+        self.assertIsNone(File._content)
+
+        class LazyFile(File):
+            def __init__(self, path):
+                self.src_uri = path
+
+        f = LazyFile('foo.md')
+        self.assertIs(f.inclusion, InclusionLevel.UNDEFINED)
+        self.assertIsNone(f.generated_by)
+        self.assertIsNone(f.page)
+        self.assertEqual(f._collections, 0)
+        files = Files([f])
+        self.assertEqual(f._collections, 1)
+        f.inclusion = InclusionLevel.EXCLUDED
+        self.assertEqual(files.documentation_pages(), [])
+        self.assertEqual(vars(f), {})
+
+    def test_files_documentation_pages_reused(self):
+        fs = [
+            File('a.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+            File('b.md', '/path/to/docs', '/path/to/site', use_directory_urls=True),
+        ]
+        files = Files(fs)
+        pages = files.documentation_pages()
+        self.assertEqual(pages, fs)
+        view = files._views[InclusionLevel.is_included]
+        # Each call returns a list of its own.
+        pages.clear()
+        self.assertEqual(files.documentation_pages(), fs)
+        self.assertIs(files._views[InclusionLevel.is_included], view)
+        self.assertEqual(files.documentation_pages(inclusion=InclusionLevel.is_in_nav), fs)
+
+        File('c.md', '/path/to/docs', '/path/to/site', use_directory_urls=True)
+        fs[0].inclusion = fs[0].inclusion
+        self.assertEqual(files.documentation_pages(), fs)
+        self.assertIs(files._views[InclusionLevel.is_included], view)
+
+        fs[0].inclusion = InclusionLevel.DRAFT
+        self.assertEqual(files.documentation_pages(), [fs[1]])
+        self.assertEqual(files.documentation_pages(inclusion=InclusionLevel.is_in_serve), fs)
+
+        extra_file = File('c.md', '/path/to/docs', '/path/to/site', use_directory_urls=True)
+        files.append(extra_file)
+        self.assertEqual(files.documentation_pages(), [fs[1], extra_file])
+        files.remove(fs[1])
+        self.assertEqual(files.documentation_pages(), [extra_file])
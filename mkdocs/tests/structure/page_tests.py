@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+import logging
 import os
 import sys
 import textwrap
@@ -7,11 +9,21 @@ import unittest
 from unittest import mock
 
 import markdown
+import markdown.extensions.toc
 
 from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.structure.files import File, Files
-from mkdocs.structure.pages import Page, _ExtractTitleTreeprocessor, _RelativePathTreeprocessor
+from mkdocs.structure.pages import (
+    Page,
+    _ExtractTitleTreeprocessor,
+    _lookup_result,
+    _MarkdownConverterPool,
+    _RelativePathTreeprocessor,
+    _resolve_relative_path,
+)
 from mkdocs.tests.base import dedent, tempdir
+from mkdocs.utils import CaptureHandler
+from mkdocs.utils.cache import ContentCache
 
 DOCS_DIR = os.path.join(
     os.path.abspath(os.path.dirname(__file__)), '..', 'integration', 'subpages', 'docs'
@@ -739,6 +751,133 @@ class PageTests(unittest.TestCase):
             ),
         )
 
+    def test_page_render_reuses_converter(self):
+        cfg = load_config(docs_dir=DOCS_DIR, markdown_extensions=['footnotes', 'abbr', 'toc'])
+        fs = [
+            File(f, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+            for f in ('index.md', 'other.md', 'sub/third.md')
+        ]
+        sources = {
+            'index.md': '# A\n\nA[^1] HTML\n\n[^1]: Note A\n\n*[HTML]: Hyper Text',
+            'other.md': '# B\n\nB[^1] HTML\n\n[^1]: Note B',
+            'sub/third.md': '# C\n\nC[^1] HTML\n\n[^1]: Note C',
+        }
+
+        def render_all():
+            contents = []
+            for fl in fs:
+                pg = Page(None, fl, cfg)
+                with mock.patch(
+                    'mkdocs.structure.files.open', mock.mock_open(read_data=sources[fl.src_uri])
+                ):
+                    pg.read_source(cfg)
+                pg.render(cfg, Files(fs))
+                contents.append(pg.content)
+            return contents
+
+        with mock.patch('mkdocs.structure.pages._markdown_converters', _MarkdownConverterPool()):
+            with mock.patch('markdown.Markdown', wraps=markdown.Markdown) as md:
+                contents = render_all()
+            md.assert_called_once()
+            self.assertIn('<abbr title="Hyper Text">HTML</abbr>', contents[0])
+            self.assertNotIn('abbr', contents[1])
+            self.assertIn('Note B', contents[1])
+            self.assertNotIn('Note A', contents[1])
+            self.assertEqual(contents, render_all())
+
+            # A different Markdown config gets a different converter.
+            cfg.mdx_configs['toc'] = {'permalink': True}
+            with mock.patch('markdown.Markdown', wraps=markdown.Markdown) as md:
+                contents = render_all()
+            md.assert_called_once()
+            self.assertIn('headerlink', contents[0])
+
+    def _render_with_cache(self, cfg, cache, content, src_uri, *other_src_uris):
+        fs = [
+            File(f, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+            for f in (src_uri, *other_src_uris)
+        ]
+        pg = Page(None, fs[0], cfg)
+        with mock.patch('mkdocs.structure.files.open', mock.mock_open(read_data=content)):
+            pg.read_source(cfg)
+        handler = CaptureHandler()
+        logger = logging.getLogger('mkdocs')
+        logger.addHandler(handler)
+        try:
+            pg.render(cfg, Files(fs), cache=cache)
+        finally:
+            logger.removeHandler(handler)
+        return pg, [f'{r.levelname}:{r.getMessage()}' for r in handler.records]
+
+    def test_page_render_cache(self):
+        cfg = load_config(docs_dir=DOCS_DIR)
+        cache = ContentCache()
+        content = '# Hi\n\n[a](a.md#x) [b](b.md) [self](#hi)'
+        expected_logs = [
+            "WARNING:Doc file 'index.md' contains a link 'b.md', but the target is not found among documentation files."
+        ]
+
+        pg1, logs1 = self._render_with_cache(cfg, cache, content, 'index.md', 'a.md')
+        self.assertEqual(logs1, expected_logs)
+        with mock.patch('markdown.Markdown', side_effect=AssertionError) as md:
+            pg2, logs2 = self._render_with_cache(cfg, cache, content, 'index.md', 'a.md')
+        self.assertEqual(logs2, expected_logs)
+        for attr in 'content', 'title', 'present_anchor_ids':
+            self.assertEqual(getattr(pg2, attr), getattr(pg1, attr))
+        self.assertEqual(str(pg2.toc), str(pg1.toc))
+        self.assertEqual(
+            {f.src_uri: links for f, links in pg2.links_to_anchors.items()},
+            {'a.md': {'x': 'a.md#x'}, 'index.md': {'hi': '#hi'}},
+        )
+        md.assert_not_called()
+
+    def test_page_render_cache_link_target_changed(self):
+        cfg = load_config(docs_dir=DOCS_DIR)
+        cache = ContentCache()
+        content = '[a](a.md) [b](b.md)'
+
+        pg1, _ = self._render_with_cache(cfg, cache, content, 'index.md', 'a.md')
+        self.assertIn('href="a/"', pg1.content)
+        self.assertIn('href="b.md"', pg1.content)
+        # A file that a link pointed to appeared.
+        pg2, logs = self._render_with_cache(cfg, cache, content, 'index.md', 'a.md', 'b.md')
+        self.assertEqual(logs, [])
+        self.assertIn('href="b/"', pg2.content)
+        # A file that a link pointed to was renamed.
+        pg3, _ = self._render_with_cache(cfg, cache, content, 'index.md', 'c.md', 'b.md')
+        self.assertIn('href="a.md"', pg3.content)
+
+    def test_page_render_cache_extension_upgraded(self):
+        cfg = load_config(docs_dir=DOCS_DIR, markdown_extensions=['toc', 'admonition'])
+        cache = ContentCache()
+        content = '# Hi'
+
+        def render(toc_version):
+            versions = {'markdown.extensions.toc': toc_version}
+            with mock.patch('mkdocs.structure.pages._markdown_converters', _MarkdownConverterPool()):
+                with mock.patch(
+                    'mkdocs.structure.pages.get_module_version', side_effect=versions.get
+                ):
+                    with mock.patch('markdown.Markdown', wraps=markdown.Markdown) as md:
+                        self._render_with_cache(cfg, cache, content, 'index.md')
+            return md.call_count
+
+        self.assertEqual(render('1.0'), 1)
+        self.assertEqual(render('1.0'), 1)  # Only to know the extensions' versions.
+        self.assertEqual(len(cache.take_new_entries()), 1)
+        render('2.0')
+        self.assertEqual(len(cache.take_new_entries()), 1)
+
+    def test_page_render_cache_unstable_config(self):
+        cfg = load_config(docs_dir=DOCS_DIR)
+        # An object whose `repr()` contains its address, which differs from process to process.
+        slugify = functools.partial(markdown.extensions.toc.slugify_unicode)
+        cfg.mdx_configs['toc'] = {'slugify': slugify}
+        cache = ContentCache()
+        pg, _ = self._render_with_cache(cfg, cache, '# Hi', 'index.md')
+        self.assertEqual(pg.content, '<h1 id="hi">Hi</h1>')
+        self.assertEqual(cache.take_new_entries(), {})
+
     def test_missing_page(self):
         cfg = load_config()
         fl = File('missing.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
@@ -1380,3 +1519,29 @@ class RelativePathExtensionTests(unittest.TestCase):
             exp_true='test.png, test.png.md, foo/test.png, foo/test.png.md',
             exp_false='test.png, test.png.md',
         )
+
+    def test_target_uri_resolution_is_memoized(self):
+        _resolve_relative_path.cache_clear()
+        for src_path in 'foo/bar.md', 'foo/baz.md', 'foo/bar.md':
+            self.assertEqual(
+                _RelativePathTreeprocessor._target_uri(src_path, '../img/a.png'), 'img/a.png'
+            )
+        self.assertEqual(_RelativePathTreeprocessor._target_uri('index.md', '/a/./b.md'), 'a/b.md')
+        info = _resolve_relative_path.cache_info()
+        self.assertEqual((info.hits, info.misses), (2, 2))
+
+    def test_link_targets_are_shared_by_directory(self):
+        cfg = load_config(docs_dir=DOCS_DIR)
+        fs = [
+            File(f, cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls)
+            for f in ['foo/bar.md', 'foo/baz.md', 'img.png']
+        ]
+        files = Files(fs)
+        for file in fs[:2]:
+            processor = _RelativePathTreeprocessor(file, files, cfg)
+            self.assertEqual(processor.path_to_url('../img.png'), '../../img.png')
+            self.assertEqual(processor.lookups, {'img.png': _lookup_result(fs[2])})
+        self.assertEqual(files._link_targets, {('foo', '../img.png'): ('img.png', fs[2])})
+
+        files.append(File('foo/qux.md', cfg.docs_dir, cfg.site_dir, cfg.use_directory_urls))
+        self.assertEqual(files._link_targets, {})
@@ -4,8 +4,8 @@ from unittest import mock
 
 import mkdocs
 from mkdocs.localization import parse_locale
-from mkdocs.tests.base import tempdir
-from mkdocs.theme import Theme
+from mkdocs.tests.base import load_config, tempdir
+from mkdocs.theme import Theme, _TemplateBytecodeCache
 
 abs_path = os.path.abspath(os.path.dirname(__file__))
 mkdocs_dir = os.path.abspath(os.path.dirname(mkdocs.__file__))
@@ -123,3 +123,55 @@ class ThemeTests(unittest.TestCase):
                     'locale': parse_locale('en'),
                 },
             )
+
+    def test_nav_cache_default(self):
+        env = Theme(name='mkdocs').get_env()
+        template = env.from_string('{% call nav_cache(1) %}{{ page.title }}{% endcall %}')
+        # Without `nav_cache` in the context, the blocks are rendered as if they weren't wrapped.
+        self.assertEqual(template.render(page={'title': 'A'}), 'A')
+        self.assertEqual(template.render(page={'title': 'B'}), 'B')
+
+    @tempdir()
+    @tempdir(files={'main.html': '{% trans %}Hello{% endtrans %} {{ 1 + 1 }}'})
+    def test_template_bytecode_cache(self, custom, cache_dir):
+        theme = Theme(name=None, custom_dir=custom)
+
+        def render(bytecode_cache, compiles=True):
+            with mock.patch('mkdocs.theme._get_bytecode_cache', return_value=bytecode_cache):
+                env = theme.get_env()
+            with mock.patch.object(env, 'compile', wraps=env.compile) as compile:
+                result = env.get_template('main.html').render()
+            self.assertEqual(compile.called, compiles)
+            return result
+
+        bytecode_cache = _TemplateBytecodeCache(cache_dir)
+        self.assertEqual(render(bytecode_cache), 'Hello 2')
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        # Reused from memory by the next environment, such as on a rebuild.
+        self.assertEqual(render(bytecode_cache, compiles=False), 'Hello 2')
+        # Reused from disk by a new process.
+        self.assertEqual(render(_TemplateBytecodeCache(cache_dir), compiles=False), 'Hello 2')
+
+        with open(os.path.join(custom, 'main.html'), 'w') as f:
+            f.write('{{ 1 + 2 }}')
+        self.assertEqual(render(bytecode_cache), '3')
+
+        memory_cache = _TemplateBytecodeCache(os.path.join(cache_dir, 'new'), persistent=False)
+        self.assertEqual(render(memory_cache), '3')
+        self.assertEqual(render(memory_cache, compiles=False), '3')
+        self.assertFalse(os.path.exists(os.path.join(cache_dir, 'new')))
+
+    @tempdir()
+    def test_template_bytecode_cache_dir(self, project_dir):
+        cfg = load_config(config_file_path=os.path.join(project_dir, 'mkdocs.yml'))
+        theme = cfg.theme
+        self.assertEqual(
+            theme._cache_dir, os.path.join(project_dir, '.cache', 'mkdocs', 'templates')
+        )
+        with mock.patch.dict(os.environ, {'MKDOCS_NO_TEMPLATE_CACHE': ''}):
+            self.assertTrue(theme.get_env().bytecode_cache.persistent)
+            self.assertEqual(theme.get_env().bytecode_cache.directory, theme._cache_dir)
+            # Themes that don't belong to a project only keep the templates in memory.
+            self.assertFalse(Theme(name='mkdocs').get_env().bytecode_cache.persistent)
+        with mock.patch.dict(os.environ, {'MKDOCS_NO_TEMPLATE_CACHE': '1'}):
+            self.assertFalse(theme.get_env().bytecode_cache.persistent)
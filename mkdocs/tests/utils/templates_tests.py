@@ -1,9 +1,11 @@
 import unittest
 from textwrap import dedent
+from types import SimpleNamespace
 
+import jinja2
 import yaml
 
-from mkdocs.tests.base import load_config
+from mkdocs.tests.base import load_config, tempdir
 from mkdocs.utils import templates
 
 
@@ -47,3 +49,67 @@ class UtilsTemplatesTests(unittest.TestCase):
                 '<script src="here/plain_string.mjs"></script>',
             ],
         )
+
+    def test_nav_cache(self):
+        env = jinja2.Environment()
+        env.filters['url'] = templates.url_filter
+        renders = []
+        env.globals['count'] = lambda item: renders.append(item.title) or ''
+        template = env.from_string(
+            '{% for item in items %}'
+            '{% call nav_cache(item) %}{{ count(item) }}'
+            '<a href="{{ item.url|url }}"{% if item.active %} class="active"{% endif %}>'
+            '{{ item.title }}</a>'
+            '{% endcall %}'
+            '{% endfor %}'
+        )
+        items = [
+            SimpleNamespace(title='A', url='a/', active=False),
+            SimpleNamespace(title='B', url='b/c/', active=False),
+        ]
+        nav_cache = templates.NavFragmentCache()
+
+        def render(page_url, active=None):
+            for item in items:
+                item.active = item.title == active
+            page = SimpleNamespace(url=page_url)
+            return template.render(items=items, page=page, base_url='', nav_cache=nav_cache)
+
+        self.assertEqual(
+            render('a/', active='A'), '<a href="./" class="active">A</a><a href="../b/c/">B</a>'
+        )
+        self.assertEqual(renders, ['A', 'B'])
+        self.assertEqual(
+            render('b/c/', active='B'), '<a href="../../a/">A</a><a href="./" class="active">B</a>'
+        )
+        self.assertEqual(renders, ['A', 'B', 'A', 'B'])
+        self.assertEqual(render('d/e.html'), '<a href="../a/">A</a><a href="../b/c/">B</a>')
+        self.assertEqual(renders, ['A', 'B', 'A', 'B'])
+
+        nav_cache = templates.NavFragmentCache(enabled=False)
+        self.assertEqual(render('d/e.html'), '<a href="../a/">A</a><a href="../b/c/">B</a>')
+        self.assertEqual(render('d/e.html'), '<a href="../a/">A</a><a href="../b/c/">B</a>')
+        self.assertEqual(renders, ['A', 'B', 'A', 'B', 'A', 'B', 'A', 'B'])
+
+    @tempdir(files=['nav-sub.html'])
+    def test_nav_cache_disabled_for_custom_nav_templates(self, custom_dir):
+        self.assertTrue(templates.SharedContext(load_config()).nav_cache.enabled)
+        config = load_config(theme={'name': 'mkdocs', 'custom_dir': custom_dir})
+        # The overridden template may depend on the current page.
+        self.assertFalse(templates.SharedContext(config).nav_cache.enabled)
+
+    def test_nav_cache_autoescape(self):
+        env = jinja2.Environment(autoescape=True)
+        env.filters['url'] = templates.url_filter
+        template = env.from_string(
+            '{% macro link() %}<a href="{{ item.url|url }}">{{ item.title }}</a>{% endmacro %}'
+            '{{ nav_cache(item, caller=link) }}'
+        )
+        item = SimpleNamespace(title='A & B', url='a/?x=1&y=2', active=False)
+        nav_cache = templates.NavFragmentCache()
+        for page_url in 'a/', 'c/d/':
+            output = template.render(
+                item=item, page=SimpleNamespace(url=page_url), base_url='', nav_cache=nav_cache
+            )
+        # The fragment is markup, so it isn't escaped again, and the URL is escaped once.
+        self.assertEqual(output, '<a href="../../a/?x=1&amp;y=2">A &amp; B</a>')
@@ -1,5 +1,7 @@
 #!/usr/bin/env python
 
+from __future__ import annotations
+
 import dataclasses
 import datetime
 import logging
@@ -7,11 +9,15 @@ import os
 import posixpath
 import stat
 import unittest
+from pathlib import Path
 from unittest import mock
 
+import markdown
+
 from mkdocs import exceptions, utils
 from mkdocs.tests.base import dedent, tempdir
 from mkdocs.utils import meta
+from mkdocs.utils.cache import ContentCache, get_module_version, hash_key
 
 BASEYML = """
 INHERIT: parent.yml
@@ -329,6 +335,159 @@ class UtilsTests(unittest.TestCase):
                 utils.copy_file(src, dst)
                 self.assertTrue(os.path.isfile(os.path.join(dst_dir, expected)))
 
+    @tempdir(files={'foo.txt': 'content', 'bar.txt': 'other'})
+    @tempdir(files={'foo.txt': 'content', 'bar.txt': 'content'})
+    def test_copy_files_unchanged(self, src_dir, dst_dir):
+        utils.skip_unchanged_copies(True)
+        try:
+            for name in 'foo.txt', 'bar.txt':
+                os.utime(os.path.join(dst_dir, name), (0, 0))
+                utils.copy_file(os.path.join(src_dir, name), os.path.join(dst_dir, name))
+        finally:
+            utils.skip_unchanged_copies(False)
+        self.assertEqual(os.path.getmtime(os.path.join(dst_dir, 'foo.txt')), 0)
+        self.assertNotEqual(os.path.getmtime(os.path.join(dst_dir, 'bar.txt')), 0)
+        with open(os.path.join(dst_dir, 'bar.txt')) as f:
+            self.assertEqual(f.read(), 'content')
+
+        # Without it, the files are copied without comparing them.
+        os.utime(os.path.join(dst_dir, 'foo.txt'), (0, 0))
+        with mock.patch('filecmp.cmp') as cmp:
+            utils.copy_file(os.path.join(src_dir, 'foo.txt'), os.path.join(dst_dir, 'foo.txt'))
+        cmp.assert_not_called()
+        self.assertNotEqual(os.path.getmtime(os.path.join(dst_dir, 'foo.txt')), 0)
+
+    @tempdir(files={'foo.txt': 'content'})
+    @tempdir(files={'foo.txt': 'changed'})
+    def test_copy_files_changed_older_source(self, src_dir, dst_dir):
+        # Such as after checking out an older commit: the source changed, but its time is older.
+        os.utime(os.path.join(src_dir, 'foo.txt'), (0, 0))
+        utils.skip_unchanged_copies(True)
+        try:
+            utils.copy_file(os.path.join(src_dir, 'foo.txt'), os.path.join(dst_dir, 'foo.txt'))
+        finally:
+            utils.skip_unchanged_copies(False)
+        with open(os.path.join(dst_dir, 'foo.txt')) as f:
+            self.assertEqual(f.read(), 'changed')
+
+    @tempdir(files={'foo.txt': 'content', 'bar.txt': 'other'})
+    def test_write_file_unchanged(self, dst_dir):
+        for name in 'foo.txt', 'bar.txt':
+            os.utime(os.path.join(dst_dir, name), (0, 0))
+            utils.write_file(b'content', os.path.join(dst_dir, name))
+        self.assertEqual(os.path.getmtime(os.path.join(dst_dir, 'foo.txt')), 0)
+        self.assertNotEqual(os.path.getmtime(os.path.join(dst_dir, 'bar.txt')), 0)
+        with open(os.path.join(dst_dir, 'bar.txt')) as f:
+            self.assertEqual(f.read(), 'content')
+
+    @tempdir(files={'foo.txt': 'content', 'bar.txt': 'content'})
+    @tempdir(files={'foo.txt': 'content'})
+    def test_record_changed_outputs(self, src_dir, dst_dir):
+        paths: set[str] = set()
+        utils.record_changed_outputs(paths)
+        try:
+            utils.write_file(b'content', os.path.join(dst_dir, 'foo.txt'))
+            utils.write_file(b'other', os.path.join(dst_dir, 'bar.txt'))
+            utils.remove_output(os.path.join(dst_dir, 'baz.txt'))
+            site = utils.MemorySite(os.path.join(dst_dir, 'site'))
+            utils.write_to_memory(site)
+            try:
+                for _ in range(2):
+                    utils.write_file(b'content', os.path.join(site.root, 'a.txt'))
+                    utils.copy_file(
+                        os.path.join(src_dir, 'foo.txt'), os.path.join(site.root, 'foo.txt')
+                    )
+            finally:
+                utils.write_to_memory(None)
+        finally:
+            utils.record_changed_outputs(None)
+        # Only the files whose content changed are included.
+        self.assertEqual(
+            paths,
+            {
+                os.path.join(dst_dir, 'bar.txt'),
+                os.path.join(dst_dir, 'site', 'a.txt'),
+                os.path.join(dst_dir, 'site', 'foo.txt'),
+            },
+        )
+
+    @tempdir(files={'foo.txt': 'content'})
+    @tempdir(files={'foo.txt': 'content'})
+    def test_record_output_paths(self, src_dir, dst_dir):
+        paths: set[str] = set()
+        utils.record_output_paths(paths)
+        try:
+            utils.copy_file(os.path.join(src_dir, 'foo.txt'), dst_dir)
+            utils.write_file(b'content', os.path.join(dst_dir, 'sub', 'bar.txt'))
+        finally:
+            utils.record_output_paths(None)
+        utils.write_file(b'content', os.path.join(dst_dir, 'baz.txt'))
+        self.assertEqual(
+            paths,
+            {os.path.join(dst_dir, 'foo.txt'), os.path.join(dst_dir, 'sub', 'bar.txt')},
+        )
+
+    @tempdir(
+        files={
+            'keep.txt': '',
+            'new.txt': '',
+            'stale.txt': '',
+            'sub/stale.txt': '',
+            '.hidden': '',
+            '.git/stale.txt': '',
+        }
+    )
+    def test_remove_stale_files(self, site_dir):
+        for path in 'keep.txt', 'stale.txt', 'sub/stale.txt', '.hidden', '.git/stale.txt':
+            os.utime(os.path.join(site_dir, path), (0, 0))
+        keep = {os.path.join(site_dir, 'keep.txt')}
+        utils.remove_stale_files(site_dir, keep=keep, before=1)
+        self.assertEqual(
+            sorted(
+                os.path.relpath(os.path.join(root, name), site_dir).replace(os.sep, '/')
+                for root, dirs, names in os.walk(site_dir)
+                for name in names
+            ),
+            ['.git/stale.txt', '.hidden', 'keep.txt', 'new.txt'],
+        )
+
+    @tempdir()
+    @tempdir(files={'foo.txt': 'content'})
+    def test_write_to_memory(self, src_dir, dst_dir):
+        site_dir = os.path.join(dst_dir, 'site')
+        site = utils.MemorySite(site_dir)
+        utils.write_to_memory(site)
+        try:
+            utils.copy_file(os.path.join(src_dir, 'foo.txt'), os.path.join(site_dir, 'foo.txt'))
+            utils.write_file(b'<p>a</body>', os.path.join(site_dir, 'sub', 'a.html'))
+            utils.write_file(b'outside', os.path.join(dst_dir, 'outside.txt'))
+            mtime = utils.get_output_mtime(os.path.join(site_dir, 'sub', 'a.html'))
+            self.assertIsNotNone(mtime)
+            self.assertIsNone(utils.get_output_mtime(os.path.join(site_dir, 'missing.txt')))
+
+            self.assertFalse(os.path.exists(site_dir))
+            self.assertEqual(len(site), 2)
+            self.assertEqual(site.read(os.path.join(site_dir, 'foo.txt')), b'content')
+            # Copied files are read from their source when they are requested.
+            with open(os.path.join(src_dir, 'foo.txt'), 'w') as f:
+                f.write('changed')
+            self.assertEqual(site.read(os.path.join(site_dir, 'foo.txt')), b'changed')
+            self.assertEqual(
+                site.get_chunks(os.path.join(site_dir, 'sub', 'a.html')), (b'<p>a', b'</body>')
+            )
+            # Writing the same content leaves the file untouched.
+            utils.write_file(b'<p>a</body>', os.path.join(site_dir, 'sub', 'a.html'))
+            self.assertEqual(site.getmtime(os.path.join(site_dir, 'sub', 'a.html')), mtime)
+
+            self.assertTrue(utils.remove_output(os.path.join(site_dir, 'foo.txt')))
+            self.assertFalse(utils.remove_output(os.path.join(site_dir, 'foo.txt')))
+            utils.clean_directory(site_dir)
+            self.assertEqual(len(site), 0)
+        finally:
+            utils.write_to_memory(None)
+        with open(os.path.join(dst_dir, 'outside.txt')) as f:
+            self.assertEqual(f.read(), 'outside')
+
     @tempdir()
     @tempdir()
     def test_copy_files_without_permissions(self, src_dir, dst_dir):
@@ -597,6 +756,108 @@ class LogCounterTests(unittest.TestCase):
         self.assertEqual(self.counter.get_counts(), [('ERROR', 2), ('WARNING', 1)])
 
 
+class ContentCacheTests(unittest.TestCase):
+    def test_hash_key(self):
+        self.assertEqual(hash_key('a', {'b': 1, 'c': {2, 1}}), hash_key('a', {'c': {1, 2}, 'b': 1}))
+        self.assertNotEqual(hash_key('a', 1), hash_key('a', '1'))
+        with self.assertRaises(TypeError):
+            hash_key('a', object())
+
+    def test_hash_key_functions(self):
+        def local_function():
+            pass
+
+        self.assertEqual(hash_key(os.path.join), hash_key(os.path.join))
+        self.assertNotEqual(hash_key(os.path.join), hash_key(os.path.split))
+        with self.assertRaises(TypeError):
+            hash_key(lambda: None)
+        with self.assertRaises(TypeError):
+            hash_key(local_function)
+
+    def test_module_version(self):
+        self.assertEqual(
+            get_module_version('markdown.extensions.toc'), f'Markdown=={markdown.__version__}'
+        )
+        self.assertIsNone(get_module_version('mkdocs_no_such_module'))
+
+    @tempdir(files={'ab/cdef.json': '1', 'ab/old.json': '2', '12/old.json': '3'})
+    def test_prune(self, tdir):
+        for path in 'ab/old.json', '12/old.json':
+            os.utime(os.path.join(tdir, path), (0, 0))
+        ContentCache(tdir).prune(datetime.timedelta(days=1))
+        self.assertEqual(
+            sorted(p.relative_to(tdir).as_posix() for p in Path(tdir).rglob('*.json')),
+            ['ab/cdef.json'],
+        )
+
+    @tempdir(files={'ab/cdef.json': '1'})
+    def test_prune_keeps_used(self, tdir):
+        path = os.path.join(tdir, 'ab', 'cdef.json')
+        os.utime(path, (0, 0))
+        cache = ContentCache(tdir)
+        self.assertEqual(cache.get('abcdef'), 1)
+        cache.prune(datetime.timedelta(days=1))
+        self.assertTrue(os.path.isfile(path))
+
+    @tempdir()
+    def test_persisted(self, tdir):
+        key = hash_key('foo')
+        cache = ContentCache(tdir)
+        self.assertIsNone(cache.get(key))
+        cache.set(key, {'content': '<p>foo</p>'})
+        self.assertEqual(cache.get(key), {'content': '<p>foo</p>'})
+
+        cache = ContentCache(tdir)
+        self.assertEqual(cache.get(key), {'content': '<p>foo</p>'})
+        cache.clear()
+        self.assertEqual(cache.get(key), {'content': '<p>foo</p>'})
+
+    def test_in_memory(self):
+        cache = ContentCache()
+        cache.set('abcdef', [1])
+        self.assertEqual(cache.get('abcdef'), [1])
+        cache.clear()
+        self.assertIsNone(cache.get('abcdef'))
+
+    def test_new_entries(self):
+        cache = ContentCache()
+        cache.set('abcdef', [1])
+        worker_cache = ContentCache()
+        worker_cache.set('123456', [2])
+        worker_cache.set('7890ab', [3])
+        entries = worker_cache.take_new_entries()
+        self.assertEqual(entries, {'123456': [2], '7890ab': [3]})
+        self.assertEqual(worker_cache.take_new_entries(), {})
+
+        cache.add_entries(entries)
+        self.assertEqual(cache.get('7890ab'), [3])
+        self.assertEqual(cache.take_new_entries(), {'abcdef': [1]})
+
+    def test_max_entries(self):
+        cache = ContentCache(max_entries=2)
+        cache.set('aaaa', [1])
+        cache.set('bbbb', [2])
+        self.assertEqual(cache.get('aaaa'), [1])
+        cache.set('cccc', [3])
+        # The least recently used entry is forgotten, and no longer reported as new.
+        self.assertIsNone(cache.get('bbbb'))
+        self.assertEqual(cache.take_new_entries(), {'aaaa': [1], 'cccc': [3]})
+        cache.add_entries({'dddd': [4]})
+        self.assertIsNone(cache.get('aaaa'))
+        self.assertEqual(cache.get('cccc'), [3])
+
+    @tempdir()
+    def test_max_entries_persisted(self, tdir):
+        cache = ContentCache(tdir, max_entries=1)
+        cache.set('aaaa', [1])
+        cache.set('bbbb', [2])
+        self.assertEqual(cache.get('aaaa'), [1])
+
+    @tempdir(files={'ab/cdef.json': '{not json'})
+    def test_corrupt_entry(self, tdir):
+        self.assertIsNone(ContentCache(tdir).get('abcdef'))
+
+
 @dataclasses.dataclass
 class _Page:
     url: str
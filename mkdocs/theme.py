@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import functools
 import logging
 import os
 import warnings
-from typing import Any, Collection, MutableMapping
+from typing import TYPE_CHECKING, Any, Collection, MutableMapping
 
 import jinja2
+import jinja2.bccache
 import yaml
 
 try:
@@ -16,6 +18,10 @@ except ImportError:  # pragma: no cover
 from mkdocs import localization, utils
 from mkdocs.config.base import ValidationError
 from mkdocs.utils import templates
+from mkdocs.utils.cache import hash_key
+
+if TYPE_CHECKING:
+    from types import CodeType
 
 log = logging.getLogger(__name__)
 
@@ -43,6 +49,8 @@ class Theme(MutableMapping[str, Any]):
     ) -> None:
         self.name = name
         self._custom_dir = custom_dir
+        self._cache_dir: str | None = None
+        """Where the compiled templates are kept across runs, `.cache/mkdocs/` of the project."""
         _vars: dict[str, Any] = {'name': name, 'locale': 'en'}
         self.__vars = _vars
 
@@ -158,9 +166,93 @@ class Theme(MutableMapping[str, Any]):
     def get_env(self) -> jinja2.Environment:
         """Return a Jinja environment for the theme."""
         loader = jinja2.FileSystemLoader(self.dirs)
+        cache_dir = None if os.environ.get('MKDOCS_NO_TEMPLATE_CACHE') else self._cache_dir
         # No autoreload because editing a template in the middle of a build is not useful.
-        env = jinja2.Environment(loader=loader, auto_reload=False)
+        env = jinja2.Environment(
+            loader=loader, auto_reload=False, bytecode_cache=_get_bytecode_cache(cache_dir)
+        )
         env.filters['url'] = templates.url_filter
         env.filters['script_tag'] = templates.script_tag_filter
+        # For templates rendered with a context that doesn't provide `nav_cache`.
+        env.globals['nav_cache'] = templates.NavFragmentCache(enabled=False)
         localization.install_translations(env, self.locale, self.dirs)
         return env
+
+
+# Environment options which affect how templates get compiled.
+_ENVIRONMENT_OPTIONS = (
+    'block_start_string',
+    'block_end_string',
+    'variable_start_string',
+    'variable_end_string',
+    'comment_start_string',
+    'comment_end_string',
+    'line_statement_prefix',
+    'line_comment_prefix',
+    'trim_blocks',
+    'lstrip_blocks',
+    'newline_sequence',
+    'keep_trailing_newline',
+    'optimized',
+    'autoescape',
+    'finalize',
+    'is_async',
+    'newstyle_gettext',
+)
+
+
+class _TemplateBytecodeCache(jinja2.FileSystemBytecodeCache):
+    """
+    Keeps compiled templates in memory, so that they are reused across the rebuilds of
+    `mkdocs serve`, and on disk, so that they are reused across runs of the same project.
+
+    Jinja already discards the bytecode if the source of the template changed; the key also
+    covers the extensions and options of the environment, which affect the compiled code.
+
+    If `persistent` is false, the templates are only kept in memory.
+    """
+
+    def __init__(self, directory: str, *, persistent: bool = True) -> None:
+        super().__init__(directory, '%s.cache')
+        self.persistent = persistent
+        self._memory: dict[str, tuple[str, CodeType]] = {}
+
+    def get_bucket(
+        self, environment: jinja2.Environment, name: str, filename: str | None, source: str
+    ) -> jinja2.bccache.Bucket:
+        key = hash_key(
+            self.get_cache_key(name, filename),
+            sorted(environment.extensions),
+            [getattr(environment, option, None) for option in _ENVIRONMENT_OPTIONS],
+        )
+        checksum = self.get_source_checksum(source)
+        bucket = jinja2.bccache.Bucket(environment, key, checksum)
+        cached_checksum, code = self._memory.get(key, (None, None))
+        if cached_checksum == checksum:
+            bucket.code = code
+        elif self.persistent:
+            self.load_bytecode(bucket)
+            if bucket.code is not None:
+                self._memory[key] = (checksum, bucket.code)
+        return bucket
+
+    def set_bucket(self, bucket: jinja2.bccache.Bucket) -> None:
+        assert bucket.code is not None
+        self._memory[bucket.key] = (bucket.checksum, bucket.code)
+        if not self.persistent:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            self.dump_bytecode(bucket)
+        except OSError as e:
+            log.debug(f"Could not write the template cache '{self.directory}': {e}")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_bytecode_cache(directory: str | None) -> _TemplateBytecodeCache:
+    """
+    Return the cache of compiled templates of this process that stores them in `directory`.
+
+    Without a `directory`, the templates are only kept in memory.
+    """
+    return _TemplateBytecodeCache(directory or '', persistent=directory is not None)
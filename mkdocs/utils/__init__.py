@@ -6,13 +6,16 @@ and structure of the site and pages in the site.
 """
 from __future__ import annotations
 
+import filecmp
 import functools
+import hashlib
 import logging
 import os
 import posixpath
 import re
 import shutil
 import sys
+import time
 import warnings
 from collections import defaultdict
 from datetime import datetime, timezone
@@ -110,29 +113,314 @@ else:
         a.insert(i, x)
 
 
+class _Output:
+    """Where `copy_file` and `write_file` output to, and what they record."""
+
+    memory_site: MemorySite | None = None
+    """Where the files are stored instead of the disk, see `write_to_memory`."""
+
+    paths: set[str] | None = None
+    """The paths that were output, see `record_output_paths`."""
+
+    changed_paths: set[str] | None = None
+    """The paths that were changed or removed, see `record_changed_outputs`."""
+
+    skip_unchanged_copies: bool = False
+    """Whether `copy_file` leaves outputs that already have the right content untouched."""
+
+
+_output = _Output()
+
+
+def record_output_paths(paths: set[str] | None) -> None:
+    """
+    Add the absolute paths of all files that `copy_file` and `write_file` output to `paths`.
+
+    Files that were left untouched because they already had the right content are included.
+    Pass None to stop recording.
+    """
+    _output.paths = paths
+
+
+def record_changed_outputs(paths: set[str] | None) -> None:
+    """
+    Add the absolute paths of the files that `copy_file` and `write_file` changed, and that
+    `remove_output` removed, to `paths`. A directory that `clean_directory` emptied is added
+    as a whole.
+
+    Unlike with `record_output_paths`, files that were left untouched because they already had
+    the right content are not included. Pass None to stop recording.
+    """
+    _output.changed_paths = paths
+
+
+def _record_change(path: str) -> None:
+    if _output.changed_paths is not None:
+        _output.changed_paths.add(os.path.abspath(path))
+
+
+def skip_unchanged_copies(enabled: bool) -> None:
+    """
+    Make `copy_file` check whether the output file already has the right content, and leave
+    it untouched if so. Meant for builds that keep the existing site directory.
+    """
+    _output.skip_unchanged_copies = enabled
+
+
+class MemorySite:
+    """
+    An in-memory stand-in for a site directory, used by `mkdocs serve`.
+
+    While it is active (see `write_to_memory`), the files that `copy_file` and `write_file` would
+    output under `root` are kept here instead of being written to the disk. Copied files aren't
+    held in memory, only the path of their source, which is read when they are requested.
+    HTML files are split right before their closing `</body>` tag, so a script can be served in
+    that spot without copying the page. Each file's hash is kept too, to be used as its ETag.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = os.path.abspath(root)
+        # The content (as chunks, or the path of the file to read it from), the time when it was
+        # written and its hash, by path.
+        self._files: dict[str, tuple[tuple[bytes, ...] | str, float, str]] = {}
+
+    def _key(self, path: str) -> str | None:
+        path = os.path.abspath(path)
+        if path == self.root or not path.startswith(os.path.join(self.root, '')):
+            return None
+        return path[len(self.root) + 1 :].replace(os.sep, '/')
+
+    def __contains__(self, path: str) -> bool:
+        return self._key(path) in self._files
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def owns(self, path: str) -> bool:
+        """Whether `path` is under `root`, i.e. it is written here rather than to the disk."""
+        return self._key(path) is not None
+
+    def _store(self, path: str, content: tuple[bytes, ...] | str, digest: str) -> None:
+        key = self._key(path)
+        assert key is not None, f"{path!r} is not under {self.root!r}"
+        if (entry := self._files.get(key)) is not None and entry[2] == digest:
+            return
+        if not isinstance(content, str):
+            content = self._split(key, content[0])
+        self._files[key] = (content, time.time(), digest)
+
+    @staticmethod
+    def _split(key: str, content: bytes) -> tuple[bytes, ...]:
+        if key.endswith('.html') and (body_end := content.rfind(b'</body>')) != -1:
+            return (content[:body_end], content[body_end:])
+        return (content,)
+
+    def write(self, path: str, content: bytes) -> None:
+        """Store `content` for `path`, unless it already has exactly this content."""
+        self._store(path, (content,), hashlib.blake2b(content, digest_size=16).hexdigest())
+
+    def link(self, path: str, source_path: str) -> None:
+        """
+        Make `path` have the content of the file `source_path`, without reading it now.
+
+        The file is considered unchanged as long as its size and modification time are the same.
+        """
+        source_path = os.path.abspath(source_path)
+        stat = os.stat(source_path)
+        stamp = f'{source_path}\0{stat.st_size}\0{stat.st_mtime_ns}'.encode()
+        self._store(path, source_path, hashlib.blake2b(stamp, digest_size=16).hexdigest())
+
+    def get_chunks(self, path: str) -> tuple[bytes, ...] | None:
+        """
+        Return the content of `path` as a tuple of chunks, or None if there is no such file.
+
+        HTML files that have a `</body>` tag consist of two chunks, the second one starting with it.
+        """
+        key = self._key(path) or ''
+        entry = self._files.get(key)
+        if entry is None:
+            return None
+        if not isinstance(entry[0], str):
+            return entry[0]
+        try:
+            with open(entry[0], 'rb') as f:
+                return self._split(key, f.read())
+        except OSError:
+            return None
+
+    def read(self, path: str) -> bytes | None:
+        """Return the content of `path`, or None if there is no such file."""
+        chunks = self.get_chunks(path)
+        return b''.join(chunks) if chunks is not None else None
+
+    def getmtime(self, path: str) -> float | None:
+        """Return the time when `path` was last written, or None if there is no such file."""
+        entry = self._files.get(self._key(path) or '')
+        return entry[1] if entry is not None else None
+
+    def get_hash(self, path: str) -> str | None:
+        """Return a hash of the content of `path`, or None if there is no such file."""
+        entry = self._files.get(self._key(path) or '')
+        return entry[2] if entry is not None else None
+
+    def get_hashes(self) -> dict[str, str]:
+        """Return the content hashes of all files, by their path relative to `root`."""
+        return {key: entry[2] for key, entry in self._files.items()}
+
+    def remove(self, path: str) -> bool:
+        """Remove `path`, returning whether there was such a file."""
+        return self._files.pop(self._key(path) or '', None) is not None
+
+    def clear(self, directory: str | None = None) -> None:
+        """Remove all files, or only the ones under `directory`."""
+        if directory is None or os.path.join(self.root, '').startswith(
+            os.path.join(os.path.abspath(directory), '')
+        ):
+            self._files.clear()
+            return
+        if (prefix := self._key(directory)) is not None:
+            prefix += '/'
+            for key in [key for key in self._files if key.startswith(prefix)]:
+                del self._files[key]
+
+
+def write_to_memory(site: MemorySite | None) -> None:
+    """
+    Make `copy_file` and `write_file` store the files that they output under `site.root` in `site`.
+
+    `clean_directory`, `get_output_mtime` and `remove_output` then also act on `site`.
+    Pass None to write to the disk again.
+    """
+    _output.memory_site = site
+
+
+def get_output_mtime(path: str) -> float | None:
+    """Return the modification time of the output file `path`, or None if it doesn't exist."""
+    if (site := _output.memory_site) is not None and site.owns(path):
+        return site.getmtime(path)
+    try:
+        return os.path.getmtime(path) if os.path.isfile(path) else None
+    except OSError:
+        return None
+
+
+def remove_output(path: str) -> bool:
+    """Remove the output file `path`, returning whether there was such a file."""
+    if (site := _output.memory_site) is not None and site.owns(path):
+        removed = site.remove(path)
+    elif os.path.isfile(path):
+        os.unlink(path)
+        removed = True
+    else:
+        removed = False
+    if removed:
+        _record_change(path)
+    return removed
+
+
+def _is_same_content(content: bytes, path: str) -> bool:
+    try:
+        if os.path.getsize(path) != len(content):
+            return False
+        with open(path, 'rb') as f:
+            return f.read() == content
+    except OSError:
+        return False
+
+
 def copy_file(source_path: str, output_path: str) -> None:
     """
     Copy source_path to output_path, making sure any parent directories exist.
 
-    The output_path may be a directory.
+    The output_path may be a directory. With `skip_unchanged_copies`, if it already has the
+    same content, it is left untouched.
     """
+    if (site := _output.memory_site) is not None and site.owns(output_path):
+        if _output.paths is not None:
+            _output.paths.add(os.path.abspath(output_path))
+        digest = site.get_hash(output_path)
+        site.link(output_path, source_path)
+        if site.get_hash(output_path) != digest:
+            _record_change(output_path)
+        return
     output_dir = os.path.dirname(output_path)
     os.makedirs(output_dir, exist_ok=True)
     if os.path.isdir(output_path):
         output_path = os.path.join(output_path, os.path.basename(source_path))
+    if _output.paths is not None:
+        _output.paths.add(os.path.abspath(output_path))
+    if _output.skip_unchanged_copies and _is_same_file(source_path, output_path):
+        return
     shutil.copyfile(source_path, output_path)
+    _record_change(output_path)
+
+
+def _is_same_file(source_path: str, output_path: str) -> bool:
+    """
+    Whether the output file has the same content as the source file.
+
+    Files of different sizes differ, otherwise the contents are compared. The modification times
+    aren't trusted, as checking out, extracting or copying files can give a changed source an
+    older time than its output.
+    """
+    try:
+        if os.path.getsize(source_path) != os.path.getsize(output_path):
+            return False
+        return filecmp.cmp(source_path, output_path, shallow=False)
+    except OSError:
+        return False
 
 
 def write_file(content: bytes, output_path: str) -> None:
-    """Write content to output_path, making sure any parent directories exist."""
+    """
+    Write content to output_path, making sure any parent directories exist.
+
+    If the file already has exactly this content, it is left untouched.
+    """
+    if _output.paths is not None:
+        _output.paths.add(os.path.abspath(output_path))
+    if (site := _output.memory_site) is not None and site.owns(output_path):
+        digest = site.get_hash(output_path)
+        site.write(output_path, content)
+        if site.get_hash(output_path) != digest:
+            _record_change(output_path)
+        return
+    if _is_same_content(content, output_path):
+        return
     output_dir = os.path.dirname(output_path)
     os.makedirs(output_dir, exist_ok=True)
     with open(output_path, 'wb') as f:
         f.write(content)
+    _record_change(output_path)
+
+
+def remove_stale_files(directory: str, keep: Collection[str], before: float) -> None:
+    """
+    Remove the files under `directory` that aren't in `keep` and were last modified before `before`.
+
+    `keep` contains absolute paths. Directories that become empty are removed as well. Like in
+    `clean_directory`, hidden files and directories are not touched.
+    """
+    for root, _dirs, filenames in os.walk(directory, topdown=False):
+        rel_root = os.path.relpath(root, directory)
+        if rel_root != os.curdir and any(part.startswith('.') for part in rel_root.split(os.sep)):
+            continue
+        for name in filenames:
+            path = os.path.abspath(os.path.join(root, name))
+            if name.startswith('.') or path in keep:
+                continue
+            if os.path.getmtime(path) < before:
+                log.debug(f"Removing stale file: {path}")
+                os.unlink(path)
+        if root != directory and not os.listdir(root):
+            os.rmdir(root)
 
 
 def clean_directory(directory: str) -> None:
     """Remove the content of a directory recursively but not the directory itself."""
+    _record_change(directory)
+    if _output.memory_site is not None:
+        _output.memory_site.clear(directory)
     if not os.path.exists(directory):
         return
 
@@ -166,12 +454,13 @@ def is_error_template(path: str) -> bool:
     return bool(_ERROR_TEMPLATE_RE.match(path))
 
 
-@functools.lru_cache(maxsize=None)
-def _norm_parts(path: str) -> list[str]:
+# Cached results are shared between callers, so they are immutable.
+@functools.lru_cache(maxsize=65536)
+def _norm_parts(path: str) -> tuple[str, ...]:
     if not path.startswith('/'):
         path = '/' + path
     path = posixpath.normpath(path)[1:]
-    return path.split('/') if path else []
+    return tuple(path.split('/')) if path else ()
 
 
 def get_relative_url(url: str, other: str) -> str:
@@ -197,7 +486,15 @@ def get_relative_url(url: str, other: str) -> str:
             break
         common += 1
 
-    rel_parts = ['..'] * (len(other_parts) - common) + dest_parts[common:]
+    return _join_relative_url(url, len(other_parts) - common, common)
+
+
+# The result only depends on how many levels up it goes and on how much of `url` it keeps, so
+# the same one serves a link from all the pages that are equally deep and share as much of
+# their directory with `url`, even when every page has a directory of its own.
+@functools.lru_cache(maxsize=65536)
+def _join_relative_url(url: str, up: int, common: int) -> str:
+    rel_parts = ('..',) * up + _norm_parts(url)[common:]
     relurl = '/'.join(rel_parts) or '.'
     return relurl + '/' if url.endswith('/') else relurl
 
@@ -385,6 +682,35 @@ class CountHandler(logging.NullHandler):
         return [(logging.getLevelName(k), v) for k, v in sorted(self.counts.items(), reverse=True)]
 
 
+class CaptureHandler(logging.Handler):
+    """
+    Collects logged messages so that they can be re-emitted later, possibly in another process.
+
+    The records are flattened (the message is formatted and the arguments dropped)
+    so that they can be pickled.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        self.records: list[logging.LogRecord] = []
+        super().__init__(**kwargs)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        self.records.append(record)
+
+    @staticmethod
+    def replay(records: Iterable[logging.LogRecord]) -> None:
+        """Send the records to the handlers of the loggers they were originally logged to."""
+        for record in records:
+            logger = logging.getLogger(record.name)
+            if logger.isEnabledFor(record.levelno):
+                logger.handle(record)
+
+
 class weak_property:
     """Same as a read-only property, but allows overwriting the field for good."""
 
@@ -1,11 +1,29 @@
-import datetime
+from __future__ import annotations
+
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
 import urllib.request
-from typing import Callable
+from typing import TYPE_CHECKING, Any, Callable, Mapping
+
+if sys.version_info >= (3, 10):
+    from importlib.metadata import PackageNotFoundError, packages_distributions, version
+else:
+    from importlib_metadata import PackageNotFoundError, packages_distributions, version
 
 import mkdocs_get_deps.cache
+import pathspec
 
 import mkdocs
 
+if TYPE_CHECKING:
+    import datetime
+
 
 def download_url(url: str) -> bytes:
     req = urllib.request.Request(url, headers={"User-Agent": f"mkdocs/{mkdocs.__version__}"})
@@ -34,3 +52,158 @@ def download_and_cache_url(
     return mkdocs_get_deps.cache.download_and_cache_url(
         url=url, cache_duration=cache_duration, download=download, comment=comment
     )
+
+
+def hash_key(*parts: Any) -> str:
+    """
+    Return a stable hex digest of JSON-serializable `parts`, to be used as a cache key.
+
+    Raises `TypeError` for values that can't be represented the same way in every process, such
+    as arbitrary objects, whose `repr()` would contain their address.
+    """
+    data = json.dumps(parts, sort_keys=True, separators=(',', ':'), default=_json_default)
+    return hashlib.sha256(data.encode()).hexdigest()
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    if callable(obj) and hasattr(obj, '__qualname__'):
+        # Lambdas and local functions don't have a name that tells them apart from one another.
+        if '<lambda>' in obj.__qualname__ or '<locals>' in obj.__qualname__:
+            raise TypeError(f'{obj.__qualname__} has no stable name to identify it by')
+        return f'{obj.__module__}.{obj.__qualname__}'
+    if hasattr(obj, 'getConfigs'):  # A Markdown extension instance.
+        return [_json_default(type(obj)), obj.getConfigs()]
+    if isinstance(obj, Mapping):  # Such as config sections.
+        return dict(obj)
+    if isinstance(obj, pathspec.PathSpec):  # Such as `exclude_docs`.
+        return [str(getattr(pattern, 'pattern', pattern)) for pattern in obj.patterns]
+    if isinstance(obj, os.PathLike):  # Such as the `!relative` placeholders.
+        try:
+            return os.fspath(obj)
+        except Exception:
+            pass
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+@functools.lru_cache(maxsize=None)
+def get_module_version(module: str) -> str | None:
+    """
+    Return the version of the installed distribution that provides the module, to be part of
+    the keys of results that depend on what the module does. None if it isn't known.
+    """
+    package = module.partition('.')[0]
+    versions = []
+    for dist in sorted(_get_packages_distributions().get(package, [])):
+        with contextlib.suppress(PackageNotFoundError):
+            versions.append(f'{dist}=={version(dist)}')
+    if not versions:
+        return getattr(sys.modules.get(package), '__version__', None)
+    return ','.join(versions)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_packages_distributions() -> Mapping[str, list[str]]:
+    return packages_distributions()
+
+
+class ContentCache:
+    """
+    A content-addressed store of JSON-serializable values.
+
+    Values are kept in memory and, if `directory` is given, also persisted as one file per key,
+    so they can be reused by later builds. Keys are expected to be produced by `hash_key`.
+    Only the `max_entries` most recently used values are kept in memory.
+    """
+
+    def __init__(self, directory: str | None = None, *, max_entries: int = 10_000) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries: dict[str, Any] = {}  # In the order of use, the most recent last.
+        self._new_keys: dict[str, None] = {}
+
+    def _path(self, key: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, key[:2], key[2:] + '.json')
+
+    def get(self, key: str) -> Any | None:
+        """Return the value stored for `key`, or None if there isn't one."""
+        try:
+            value = self._entries.pop(key)
+        except KeyError:
+            pass
+        else:
+            self._entries[key] = value
+            return value
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, encoding='utf-8') as f:
+                value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        with contextlib.suppress(OSError):
+            os.utime(path)  # So that `prune` keeps the entries that are in use.
+        self._keep(key, value)
+        return value
+
+    def _keep(self, key: str, value: Any) -> None:
+        self._entries.pop(key, None)
+        self._entries[key] = value
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            del self._entries[oldest]
+            self._new_keys.pop(oldest, None)
+
+    def set(self, key: str, value: Any) -> None:
+        """Store `value` for `key`. Failures to persist the value are ignored."""
+        self._new_keys[key] = None
+        self._keep(key, value)
+        if self.directory is None:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f, separators=(',', ':'))
+            os.replace(tmp_path, path)
+        except OSError:
+            with contextlib.suppress(OSError):
+                os.unlink(tmp_path)
+
+    def take_new_entries(self) -> dict[str, Any]:
+        """Return the entries stored with `set` since the last call, such as in a worker process."""
+        entries = {key: self._entries[key] for key in self._new_keys if key in self._entries}
+        self._new_keys.clear()
+        return entries
+
+    def add_entries(self, entries: dict[str, Any]) -> None:
+        """Keep entries obtained from `take_new_entries` of another cache in memory, as is."""
+        for key, value in entries.items():
+            self._keep(key, value)
+
+    def clear(self) -> None:
+        """Forget the values kept in memory. Persisted values are not affected."""
+        self._entries.clear()
+        self._new_keys.clear()
+
+    def prune(self, max_age: datetime.timedelta) -> None:
+        """Remove the persisted values that weren't stored or read for longer than `max_age`."""
+        if self.directory is None:
+            return
+        cutoff = time.time() - max_age.total_seconds()
+        try:
+            subdirs = [e.path for e in os.scandir(self.directory) if e.is_dir()]
+        except OSError:
+            return
+        for subdir in subdirs:
+            with contextlib.suppress(OSError):
+                for entry in os.scandir(subdir):
+                    if entry.stat().st_mtime < cutoff:
+                        os.unlink(entry.path)
@@ -0,0 +1,252 @@
+"""
+Timing of the phases of a build and of the plugin events, for `mkdocs build --profile`.
+
+A profile is only recorded while `recording` is active, otherwise all the functions here do
+next to nothing, so the build code can call them unconditionally. Worker processes record
+their own profile with `recording_in_worker`, which the main process adds with `merge`.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import logging
+import os
+import sys
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from mkdocs.structure.pages import Page
+
+log = logging.getLogger(__name__)
+
+
+class _Current:
+    """Holds the profile being recorded, if any."""
+
+    profile: BuildProfile | None = None
+
+
+_current = _Current()
+
+
+class Timing:
+    """The accumulated cost of all the runs of one phase or event."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.wall = 0.0
+        """Elapsed time, in seconds."""
+        self.cpu = 0.0
+        """CPU time of this process, in seconds."""
+        self.blocks = 0
+        """Change in the number of memory blocks allocated by Python, which approximates the
+        allocations that were kept."""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'calls': self.calls,
+            'wall': round(self.wall, 6),
+            'cpu': round(self.cpu, 6),
+            'blocks': self.blocks,
+        }
+
+    def add(self, other: Timing) -> None:
+        self.calls += other.calls
+        self.wall += other.wall
+        self.cpu += other.cpu
+        self.blocks += other.blocks
+
+
+class BuildProfile:
+    """The time spent in each phase of a build, in each plugin event and on each page."""
+
+    def __init__(self, *, trace: bool = False, max_trace_events: int = 100_000) -> None:
+        self.phases: dict[str, Timing] = {}
+        """The build phases, in the order they first ran."""
+        self.events: dict[str, Timing] = {}
+        """The plugin events (which run within the phases)."""
+        self.plugin_events: dict[tuple[str, str], Timing] = {}
+        """The plugin events, by plugin and event name."""
+        self.pages: dict[str, float] = {}
+        """Wall time spent reading, rendering and templating each page, by `src_uri`."""
+        self.trace_events: collections.deque[dict[str, Any]] | None = (
+            collections.deque(maxlen=max_trace_events) if trace else None
+        )
+        """With `trace`, each run of a phase or of a plugin's event, see `to_chrome_trace`.
+
+        Only the latest `max_trace_events` are kept, as `mkdocs serve` records all its rebuilds."""
+        self._start = time.perf_counter()
+
+    @contextlib.contextmanager
+    def _measure(
+        self, timing: Timing, name: str, category: str, args: dict[str, str] | None = None
+    ) -> Iterator[None]:
+        wall, cpu, blocks = time.perf_counter(), time.process_time(), sys.getallocatedblocks()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            timing.calls += 1
+            timing.wall += end - wall
+            timing.cpu += time.process_time() - cpu
+            timing.blocks += sys.getallocatedblocks() - blocks
+            if self.trace_events is not None:
+                event = {
+                    'name': name,
+                    'cat': category,
+                    'ph': 'X',
+                    'ts': round((wall - self._start) * 1e6, 3),
+                    'dur': round((end - wall) * 1e6, 3),
+                    'pid': os.getpid(),
+                    'tid': threading.get_ident(),
+                }
+                if args:
+                    event['args'] = args
+                self.trace_events.append(event)
+
+    def merge(self, other: BuildProfile) -> None:
+        """Add the timings and trace events of `other` to this profile."""
+        for timings, other_timings in (
+            (self.phases, other.phases),
+            (self.events, other.events),
+            (self.plugin_events, other.plugin_events),
+        ):
+            for key, timing in other_timings.items():
+                _get_timing(timings, key).add(timing)
+        for src_uri, wall in other.pages.items():
+            self.pages[src_uri] = self.pages.get(src_uri, 0.0) + wall
+        if self.trace_events is not None and other.trace_events is not None:
+            self.trace_events.extend(other.trace_events)
+
+    def slowest_pages(self, count: int) -> list[tuple[str, float]]:
+        return sorted(self.pages.items(), key=lambda item: item[1], reverse=True)[:count]
+
+    def slowest_plugin_events(self) -> list[tuple[tuple[str, str], Timing]]:
+        return sorted(self.plugin_events.items(), key=lambda item: item[1].wall, reverse=True)
+
+    def to_dict(self, top: int = 10) -> dict[str, Any]:
+        return {
+            'phases': {name: timing.to_dict() for name, timing in self.phases.items()},
+            'events': {name: timing.to_dict() for name, timing in self.events.items()},
+            'plugin_events': [
+                {'plugin': plugin, 'event': event, **timing.to_dict()}
+                for (plugin, event), timing in self.slowest_plugin_events()
+            ],
+            'slowest_pages': [
+                {'src_uri': src_uri, 'wall': round(wall, 6)}
+                for src_uri, wall in self.slowest_pages(top)
+            ],
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """
+        Return the recorded runs in the Trace Event Format, which can be opened
+        in `chrome://tracing` or https://ui.perfetto.dev. Requires `trace`.
+        """
+        assert self.trace_events is not None
+        return {'traceEvents': list(self.trace_events), 'displayTimeUnit': 'ms'}
+
+    def format_table(self, top: int = 10) -> str:
+        """Return the profile as a plain text table, with the `top` slowest pages."""
+        lines = [f"{'':<34} {'calls':>7} {'wall (s)':>9} {'cpu (s)':>9} {'blocks':>10}"]
+        sections = (
+            ('Phase', self.phases.items()),
+            ('Plugin event', self.events.items()),
+            ('Plugin', [(f'{p}: {e}', t) for (p, e), t in self.slowest_plugin_events()]),
+        )
+        for title, timings in sections:
+            if not timings:
+                continue
+            lines.append(title)
+            for name, t in timings:
+                lines.append(
+                    f"  {name:<32} {t.calls:>7} {t.wall:>9.3f} {t.cpu:>9.3f} {t.blocks:>10}"
+                )
+        if self.pages:
+            lines.append(f"Slowest pages (of {len(self.pages)})")
+            for src_uri, wall in self.slowest_pages(top):
+                lines.append(f"  {src_uri:<40} {wall:>9.3f}")
+        return '\n'.join(lines)
+
+
+def _get_timing(timings: dict, key: Any) -> Timing:
+    timing = timings.get(key)
+    if timing is None:
+        timing = timings[key] = Timing()
+    return timing
+
+
+@contextlib.contextmanager
+def recording(profile: BuildProfile | None) -> Iterator[None]:
+    """Record into `profile` what runs in this context. With None, nothing is recorded."""
+    previous, _current.profile = _current.profile, profile
+    try:
+        yield
+    finally:
+        _current.profile = previous
+
+
+@contextlib.contextmanager
+def recording_in_worker() -> Iterator[BuildProfile | None]:
+    """
+    In a forked worker process, record into a new profile rather than the inherited one, so
+    it can be sent to the main process and added to its profile with `merge`.
+
+    Yields None if the main process isn't recording a profile.
+    """
+    current = _current.profile
+    if current is None:
+        yield None
+        return
+    profile = BuildProfile(trace=current.trace_events is not None)
+    profile._start = current._start  # The clock is shared with the main process.
+    with recording(profile):
+        yield profile
+
+
+def merge(profile: BuildProfile | None) -> None:
+    """Add a profile recorded in a worker process (see `recording_in_worker`) to the current one."""
+    current = _current.profile
+    if current is not None and profile is not None:
+        current.merge(profile)
+
+
+def is_recording() -> bool:
+    return _current.profile is not None
+
+
+def phase(name: str) -> contextlib.AbstractContextManager:
+    """Measure the code in this context as the build phase `name`."""
+    profile = _current.profile
+    if profile is None:
+        return contextlib.nullcontext()
+    return profile._measure(_get_timing(profile.phases, name), name, 'phase')
+
+
+def event(name: str) -> contextlib.AbstractContextManager:
+    """Measure the code in this context as the plugin event `name`, for all plugins."""
+    profile = _current.profile
+    if profile is None:
+        return contextlib.nullcontext()
+    return profile._measure(_get_timing(profile.events, name), name, 'event')
+
+
+def plugin_event(
+    plugin: str, name: str, page: Page | None = None
+) -> contextlib.AbstractContextManager:
+    """Measure the code in this context as the plugin's handler of the event `name`."""
+    profile = _current.profile
+    if profile is None:
+        return contextlib.nullcontext()
+    timing = _get_timing(profile.plugin_events, (plugin, name))
+    args = {'page': page.file.src_uri} if page is not None else None
+    return profile._measure(timing, f'{plugin}: {name}', 'plugin', args)
+
+
+def add_page_time(src_uri: str, wall: float) -> None:
+    profile = _current.profile
+    if profile is not None:
+        profile.pages[src_uri] = profile.pages.get(src_uri, 0.0) + wall
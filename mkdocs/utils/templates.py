@@ -1,18 +1,27 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Sequence, TypedDict
+import fnmatch
+import os
+import re
+from typing import TYPE_CHECKING, Any, Callable, Sequence, TypedDict
 
 if TYPE_CHECKING:
     import datetime
 
-from markupsafe import Markup
+from markupsafe import Markup, escape
 
 try:
     from jinja2 import pass_context as contextfilter  # type: ignore
 except ImportError:
     from jinja2 import contextfilter  # type: ignore
 
-from mkdocs.utils import normalize_url
+from mkdocs.utils import (
+    _get_norm_url,
+    _norm_parts,
+    get_build_datetime,
+    get_relative_url,
+    normalize_url,
+)
 
 if TYPE_CHECKING:
     from mkdocs.config.config_options import ExtraScriptValue
@@ -32,11 +41,156 @@ class TemplateContext(TypedDict):
     build_date_utc: datetime.datetime
     config: MkDocsConfig
     page: Page | None
+    nav_cache: NavFragmentCache
+
+
+# Stands in for the output of the `url` filter within a cached fragment.
+_URL_PLACEHOLDER = '\x00{}\x00'
+_URL_PLACEHOLDER_RE = re.compile('\x00([^\x00]*)\x00')
+
+
+class NavFragmentCache:
+    """
+    Reuses rendered parts of the navigation across all pages of a build.
+
+    Themes opt into it by wrapping a part of their navigation template in a call block:
+
+        {% call nav_cache(nav_item, navlevel) %}{% include 'nav.html' %}{% endcall %}
+
+    The output of the block is cached while `nav_item` is not active, keyed by the
+    arguments. Links produced with the `url` filter inside the block are stored as
+    placeholders and are made relative to the current page whenever the fragment is
+    reused. The block must not depend on anything else that differs between pages.
+
+    If `enabled` is false, the blocks are rendered for every page, as if they weren't wrapped.
+
+    New in MkDocs 1.7.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self._fragments: dict[tuple, Markup] = {}
+        self._recording = 0
+
+    @property
+    def recording(self) -> bool:
+        """Whether the output of a block is being captured for the cache."""
+        return self._recording > 0
+
+    @contextfilter
+    def __call__(
+        self,
+        context: TemplateContext,
+        *args: Any,
+        caller: Callable[[], str],
+        enabled: bool = True,
+    ) -> Markup:
+        if not (self.enabled and enabled) or any(getattr(arg, 'active', False) for arg in args):
+            return Markup(caller())
+        key = tuple(arg if isinstance(arg, (str, int, float)) else id(arg) for arg in args)
+        try:
+            fragment = self._fragments[key]
+        except KeyError:
+            self._recording += 1
+            try:
+                fragment = self._fragments[key] = Markup(caller())
+            finally:
+                self._recording -= 1
+        if self.recording:
+            return fragment
+        # With autoescaping, the URLs in the placeholders were escaped along with the rest.
+        if context.eval_ctx.autoescape:  # type: ignore[attr-defined]
+            return Markup(
+                _URL_PLACEHOLDER_RE.sub(
+                    lambda m: escape(url_filter(context, Markup(m[1]).unescape())), fragment
+                )
+            )
+        return Markup(_URL_PLACEHOLDER_RE.sub(lambda m: url_filter(context, m[1]), fragment))
+
+
+class SharedContext:
+    """
+    The parts of the template context that all pages of a build share.
+
+    The build date is taken once, and `base_url` and the URLs of the extra assets are
+    computed once for all the pages that they are the same for. Which pages those are depends
+    on the depth of a page's directory and on how much of the directory the asset paths share.
+    The rendered parts of the navigation are kept in `nav_cache`.
+
+    New in MkDocs 1.7.
+    """
+
+    def __init__(self, config: MkDocsConfig) -> None:
+        self.config = config
+        self.build_date_utc: datetime.datetime = get_build_datetime()
+        self.nav_cache = NavFragmentCache(
+            enabled=not _overrides_nav_templates(config.theme.custom_dir)
+        )
+        self._assets: tuple[tuple[str, ...], tuple[str, ...]] | None = None
+        self._asset_dirs: set[str] = set()
+        """Every leading part of the relative asset paths, such as 'a' and 'a/b' for 'a/b/c'."""
+        self._page_urls: dict[tuple[int, str], tuple[str, list[str], list[str]]] = {}
+
+    def page_urls(self, page: Page) -> tuple[str, list[str], list[str]]:
+        """Return the `base_url`, `extra_javascript` and `extra_css` of the page's context."""
+        # Plugins may still change the assets during the build.
+        assets = (
+            tuple(str(script) for script in self.config.extra_javascript),
+            tuple(self.config.extra_css),
+        )
+        if assets != self._assets:
+            self._assets = assets
+            self._asset_dirs.clear()
+            self._page_urls.clear()
+            for path in assets[0] + assets[1]:
+                path, relative_level = _get_norm_url(path)
+                if relative_level != -1:
+                    parts = _norm_parts(path)
+                    self._asset_dirs.update('/'.join(parts[:i]) for i in range(1, len(parts) + 1))
+
+        # The same as what `get_relative_url` would use as the page's directory. Only as much of
+        # it as some asset path shares affects the relative URLs, the rest only adds '../'.
+        url = page.url
+        dirname, _, basename = url.rpartition('/')
+        if '.' in basename:
+            url = dirname
+        parts = _norm_parts(url)
+        shared = 0
+        while shared < len(parts) and '/'.join(parts[: shared + 1]) in self._asset_dirs:
+            shared += 1
+        key = (len(parts), '/'.join(parts[:shared]))
+
+        try:
+            return self._page_urls[key]
+        except KeyError:
+            result = self._page_urls[key] = (
+                get_relative_url('.', page.url),
+                [normalize_url(path, page) for path in assets[0]],
+                [normalize_url(path, page) for path in assets[1]],
+            )
+            return result
+
+
+def _overrides_nav_templates(custom_dir: str | None) -> bool:
+    """
+    Whether the `custom_dir` of the theme overrides the templates of the navigation, which the
+    theme's `nav_cache` blocks include. They may depend on the current page.
+    """
+    if custom_dir is None:
+        return False
+    try:
+        names = os.listdir(custom_dir)
+    except OSError:
+        return False
+    return any(fnmatch.fnmatch(name, 'nav*.html') for name in names)
 
 
 @contextfilter
 def url_filter(context: TemplateContext, value: str) -> str:
     """A Template filter to normalize URLs."""
+    nav_cache = context.get('nav_cache')
+    if nav_cache is not None and nav_cache.recording:
+        return _URL_PLACEHOLDER.format(value)
     return normalize_url(str(value), page=context['page'], base=context['base_url'])
 
 